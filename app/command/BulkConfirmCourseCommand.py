@@ -0,0 +1,18 @@
+import uuid
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+
+from app.command.BulkCreateCourseCommand import BULK_MAX_ITEMS
+
+
+class BulkConfirmCourseCommand(BaseModel):
+    course_ids: list[uuid.UUID] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+    userConnected: Optional[dict] = None
+
+    @field_validator("course_ids")
+    @classmethod
+    def _checkUnique(cls, course_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        # Un résultat par identifiant: un doublon rendrait le rapport (succeeded / failed) incohérent
+        if len(set(course_ids)) != len(course_ids):
+            raise ValueError("course_ids ne doit pas contenir de doublons")
+        return course_ids
@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+# Nombre maximal d'éléments par appel bulk
+BULK_MAX_ITEMS = 1000
+
+
+class BulkCreateCourseCommand(BaseModel):
+    # Chaque élément est validé individuellement avec CreateCourseCommand (erreurs rapportées par élément)
+    courses: list[dict] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+    userConnected: Optional[dict] = None
@@ -0,0 +1,8 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class ClaimNextCourseCommand(BaseModel):
+    userConnected: Optional[dict] = None
+    # Course attribuée: la plus ancienne en attente (file d'attente) ou la plus récente
+    order: Literal["oldest", "newest"] = "oldest"
@@ -1,8 +1,21 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class CreateCourseCommand(BaseModel):
     point_depart: str
     point_arrivee: str
-    userConnected: Optional[dict] = None
\ No newline at end of file
+    # Coordonnées GPS optionnelles (degrés WGS84), renseignées par paires
+    depart_lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    depart_lon: Optional[float] = Field(default=None, ge=-180, le=180)
+    arrivee_lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    arrivee_lon: Optional[float] = Field(default=None, ge=-180, le=180)
+    userConnected: Optional[dict] = None
+
+    @model_validator(mode="after")
+    def _checkCoordinates(self):
+        if (self.depart_lat is None) != (self.depart_lon is None):
+            raise ValueError("depart_lat et depart_lon doivent être renseignées ensemble")
+        if (self.arrivee_lat is None) != (self.arrivee_lon is None):
+            raise ValueError("arrivee_lat et arrivee_lon doivent être renseignées ensemble")
+        return self
@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+from app.out.CourseOut import CourseStatus
+
+
+class ExportCoursesCommand(BaseModel):
+    userConnected: Optional[dict] = None
+    format: Literal["ndjson", "csv"] = "ndjson"
+    # Dernière modification dans [since, until[ (UTC), statuts exportés (tous par défaut)
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    status: Optional[list[CourseStatus]] = None
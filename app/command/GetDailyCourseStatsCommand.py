@@ -0,0 +1,10 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel
+
+
+class GetDailyCourseStatsCommand(BaseModel):
+    userConnected: Optional[dict] = None
+    # Période [since, until[ (par défaut: les 30 derniers jours, aujourd'hui compris)
+    since: Optional[date] = None
+    until: Optional[date] = None
@@ -0,0 +1,16 @@
+import uuid
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.service.Pagination import Pagination
+
+
+class GetDriverCourseStatsCommand(BaseModel):
+    userConnected: Optional[dict] = None
+    # Période [since, until[ (par défaut: les 30 derniers jours, aujourd'hui compris)
+    since: Optional[date] = None
+    until: Optional[date] = None
+    chauffeur_id: Optional[uuid.UUID] = None
+    limit: int = Field(default=Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT)
+    cursor: Optional[str] = None
@@ -1,6 +1,10 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.service.Pagination import Pagination
 
 
 class GetMyCoursesCommand(BaseModel):
-    userConnected: Optional[dict] = None
\ No newline at end of file
+    userConnected: Optional[dict] = None
+    limit: int = Field(default=Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT)
+    cursor: Optional[str] = None
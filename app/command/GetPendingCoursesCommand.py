@@ -1,6 +1,18 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.service.Pagination import Pagination
+
+# Rayon de recherche des courses proches (km)
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 50.0
 
 
 class GetPendingCoursesCommand(BaseModel):
-    userConnected: Optional[dict] = None
\ No newline at end of file
+    userConnected: Optional[dict] = None
+    limit: int = Field(default=Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT)
+    cursor: Optional[str] = None
+    # Position du driver: si renseignée, les `limit` courses les plus proches dans le rayon
+    lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    lon: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius_km: float = Field(default=DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM)
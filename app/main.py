@@ -1,67 +1,399 @@
+import asyncio
+import logging
 import uuid
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import Literal, Optional
 
-from fastapi import FastAPI, Depends
+from fastapi import APIRouter, FastAPI, Depends, Header, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import app.models  # Assure le chargement des modèles
 
+from app.middleware.RateLimitMiddleware import RateLimitMiddleware
+from app.middleware.RequestMetricsMiddleware import RequestMetricsMiddleware
 from app.service.Auth import Auth
+from app.service.CourseEvents import CourseEvents
+from app.service.Database import Database
+from app.service.FareEngine import FareEngine
+from app.service.Logging import Logging
+from app.service.Metrics import registry
+from app.service.Pagination import Pagination
+from app.service.PendingCourseIndex import PENDING_INDEX_ENABLED, pendingCourseIndex
+from app.service.RateLimiter import RateLimiter
+from app.repository.CourseRepository import CourseRepository
+from app.repository.IdempotencyRepository import IdempotencyRepository
+from app.repository.OutboxRepository import OUTBOX_ENABLED
+from app.service.OutboxDispatcher import create_dispatcher
+from app.out.CourseOut import CourseStatus
+from app.out.CoursePageJson import CoursePageJson
 
+from app.command.BulkCancelCourseCommand import BulkCancelCourseCommand
+from app.command.BulkConfirmCourseCommand import BulkConfirmCourseCommand
+from app.command.BulkCreateCourseCommand import BulkCreateCourseCommand
 from app.command.CancelCourseCommand import CancelCourseCommand
+from app.command.ClaimNextCourseCommand import ClaimNextCourseCommand
 from app.command.ConfirmCourseCommand import ConfirmCourseCommand
 from app.command.CreateCourseCommand import CreateCourseCommand
 from app.command.EndCourseCommand import EndCourseCommand
+from app.command.ExportCoursesCommand import ExportCoursesCommand
+from app.command.GetDailyCourseStatsCommand import GetDailyCourseStatsCommand
+from app.command.GetDriverCourseStatsCommand import GetDriverCourseStatsCommand
 from app.command.GetMyCoursesCommand import GetMyCoursesCommand
-from app.command.GetPendingCoursesCommand import GetPendingCoursesCommand
+from app.command.GetPendingCoursesCommand import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, GetPendingCoursesCommand
 from app.command.StartCourseCommand import StartCourseCommand
 
+from app.usecase.BulkCancelCourseUseCase import BulkCancelCourseUseCase
+from app.usecase.CachedReadUseCase import CACHE_CONTROL, CachedReadUseCase, responseCache
+from app.usecase.BulkConfirmCourseUseCase import BulkConfirmCourseUseCase
+from app.usecase.BulkCreateCourseUseCase import BulkCreateCourseUseCase
 from app.usecase.CancelCourseUseCase import CancelCourseUseCase
+from app.usecase.ClaimNextCourseUseCase import ClaimNextCourseUseCase
 from app.usecase.ConfirmCourseUseCase import ConfirmCourseUseCase
 from app.usecase.CreateCourseUseCase import CreateCourseUseCase
 from app.usecase.EndCourseUseCase import EndCourseUseCase
+from app.usecase.ExportCoursesUseCase import EXPORT_MEDIA_TYPES, ExportCoursesUseCase
+from app.usecase.GetDailyCourseStatsUseCase import GetDailyCourseStatsUseCase
+from app.usecase.GetDriverCourseStatsUseCase import GetDriverCourseStatsUseCase
 from app.usecase.GetMyCoursesUseCase import GetMyCoursesUseCase
 from app.usecase.GetPendingCoursesUseCase import GetPendingCoursesUseCase
+from app.usecase.IdempotentUseCase import IDEMPOTENCY_PURGE_INTERVAL_SECONDS, IdempotentUseCase
 from app.usecase.StartCourseUseCase import StartCourseUseCase
+from app.usecase.StreamPendingCoursesUseCase import StreamPendingCoursesUseCase
 
-app = FastAPI(title="Course Microservice")
+logger = logging.getLogger(__name__)
+
+
+async def purge_idempotency_keys() -> None:
+    while True:
+        await asyncio.sleep(IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(IdempotencyRepository().purgeExpired)
+        except Exception:
+            logger.exception("Purge des Idempotency-Key expirées impossible")
+
+
+def preload() -> None:
+    """
+    Initialisations sans connexion ni thread: clé publique JWT analysée, grilles tarifaires.
+    Une erreur de configuration (clé absente, grille invalide) arrête le démarrage.
+    Appelée au démarrage de l'application, et par app.server avant fork() pour que les workers la partagent.
+    """
+    auth.load()
+    FareEngine.default()
+
+
+async def warm_up() -> None:
+    """
+    Préchauffage en arrière-plan (le serveur accepte déjà les connexions, /ready répond 503 jusqu'à la fin):
+    connexions du pool ouvertes puis index des courses en attente chargé depuis la base.
+    """
+    try:
+        if Database.is_async():
+            opened = await Database.warm_up_async()
+        else:
+            opened = await run_in_threadpool(Database.warm_up)
+        logger.info("Pool de connexions préchauffé (%d connexions)", opened)
+    except Exception:
+        logger.exception("Préchauffage du pool de connexions impossible")
+    if PENDING_INDEX_ENABLED:
+        try:
+            await run_in_threadpool(CourseRepository().rebuildPendingIndex)
+        except Exception:
+            # Les lectures suivantes retentent le chargement (index périmé)
+            logger.exception("Chargement initial de l'index des courses en attente impossible")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(preload)
+    if PENDING_INDEX_ENABLED:
+        # Index des courses en attente: branché sur les événements avant son chargement (warm_up)
+        pendingCourseIndex.start()
+    app.state.warmUp = asyncio.create_task(warm_up())
+    purgeTask = asyncio.create_task(purge_idempotency_keys())
+    # Publication de l'outbox des événements de course vers OUTBOX_SINK
+    dispatcher = create_dispatcher() if OUTBOX_ENABLED else None
+    if dispatcher is not None:
+        dispatcher.start()
+    yield
+    app.state.warmUp.cancel()
+    purgeTask.cancel()
+    if dispatcher is not None:
+        await run_in_threadpool(dispatcher.stop)
+
+
+# Clé publique lue par preload() (ou au premier token), pas à l'import
 auth = Auth()
+router = APIRouter()
+
+JWT_CACHE = registry.gauge("jwt_cache", "Cache des JWT vérifiés (hits, misses, size)", ("stat",))
+PENDING_INDEX_COURSES = registry.gauge("pending_index_courses", "Courses dans l'index en mémoire des courses en attente")
+PENDING_STREAM_SUBSCRIBERS = registry.gauge("pending_stream_subscribers", "Abonnés au flux /course/pending/stream")
+RESPONSE_CACHE = registry.gauge("response_cache", "Cache des pages de lecture (hits, misses, size)", ("stat",))
+
+
+def collect_runtime_metrics() -> None:
+    for stat, value in auth.tokenCache.stats().items():
+        JWT_CACHE.set(value, stat=stat)
+    for stat, value in responseCache.stats().items():
+        RESPONSE_CACHE.set(value, stat=stat)
+    PENDING_INDEX_COURSES.set(len(pendingCourseIndex))
+    PENDING_STREAM_SUBSCRIBERS.set(CourseEvents.bus.subscriberCount())
+
+
+registry.addCollector(collect_runtime_metrics)
+
+
+# Use cases sans état, créés une fois: chaque requête ne construit que sa commande
+createCourseUseCase = IdempotentUseCase(CreateCourseUseCase(), "create")
+bulkCreateCourseUseCase = BulkCreateCourseUseCase()
+bulkConfirmCourseUseCase = BulkConfirmCourseUseCase()
+bulkCancelCourseUseCase = BulkCancelCourseUseCase()
+claimNextCourseUseCase = IdempotentUseCase(ClaimNextCourseUseCase(), "claim-next")
+confirmCourseUseCase = IdempotentUseCase(ConfirmCourseUseCase(), "confirm")
+cancelCourseUseCase = IdempotentUseCase(CancelCourseUseCase(), "cancel")
+startCourseUseCase = IdempotentUseCase(StartCourseUseCase(), "start")
+endCourseUseCase = IdempotentUseCase(EndCourseUseCase(), "end")
+getMyCoursesUseCase = CachedReadUseCase(GetMyCoursesUseCase(), "my")
+getPendingCoursesUseCase = CachedReadUseCase(GetPendingCoursesUseCase(), "pending")
+streamPendingCoursesUseCase = StreamPendingCoursesUseCase()
+exportCoursesUseCase = ExportCoursesUseCase()
+getDailyCourseStatsUseCase = GetDailyCourseStatsUseCase()
+getDriverCourseStatsUseCase = GetDriverCourseStatsUseCase()
+
+
+async def execute(useCase, *args):
+    """
+    Exécute un use case selon DATABASE_MODE:
+    - "async": executeAsync() directement dans la boucle d'événements,
+    - "sync": execute() dans le threadpool (comportement historique).
+    """
+    if Database.is_async() and hasattr(useCase, "executeAsync"):
+        return await useCase.executeAsync(*args)
+    return await run_in_threadpool(execute_sync, useCase, *args)
+
+def execute_sync(useCase, *args):
+    try:
+        return useCase.execute(*args)
+    finally:
+        # Connexion de la requête rendue au pool avant de libérer la place dans le threadpool
+        Database.release_unit_of_work()
+
+IDEMPOTENCY_KEY = Header(None, alias="Idempotency-Key", max_length=255)
 
-@app.post("/course/create")
-def create_course(command: CreateCourseCommand, currentUser = Depends(auth.getCurrentUser)):
+@router.post("/course/create")
+async def create_course(
+    command: CreateCourseCommand,
+    currentUser = Depends(auth.getCurrentUser),
+    idempotencyKey: Optional[str] = IDEMPOTENCY_KEY,
+):
     command.userConnected = currentUser
-    useCase = CreateCourseUseCase(command)
-    return useCase.execute()
+    return await execute(createCourseUseCase, idempotencyKey, command)
 
-@app.post("/course/{course_id}/confirm")
-def confirm_course(course_id: uuid.UUID, command: ConfirmCourseCommand, currentUser = Depends(auth.getCurrentUser)):
+# Routes bulk déclarées avant /course/{course_id}/... pour ne pas être capturées par ces dernières
+@router.post("/course/bulk/create")
+async def bulk_create_courses(command: BulkCreateCourseCommand, currentUser = Depends(auth.getCurrentUser)):
     command.userConnected = currentUser
-    useCase = ConfirmCourseUseCase(course_id, command)
-    return useCase.execute()
+    return await execute(bulkCreateCourseUseCase, command)
 
-@app.post("/course/{course_id}/cancel")
-def cancel_course(course_id: uuid.UUID, command: CancelCourseCommand, currentUser = Depends(auth.getCurrentUser)):
+@router.post("/course/bulk/confirm")
+async def bulk_confirm_courses(command: BulkConfirmCourseCommand, currentUser = Depends(auth.getCurrentUser)):
     command.userConnected = currentUser
-    useCase = CancelCourseUseCase(course_id, command)
-    return useCase.execute()
+    return await execute(bulkConfirmCourseUseCase, command)
 
-@app.post("/course/{course_id}/start")
-def start_course(course_id: uuid.UUID, command: StartCourseCommand, currentUser = Depends(auth.getCurrentUser)):
+@router.post("/course/bulk/cancel")
+async def bulk_cancel_courses(command: BulkCancelCourseCommand, currentUser = Depends(auth.getCurrentUser)):
     command.userConnected = currentUser
-    useCase = StartCourseUseCase(course_id, command)
-    return useCase.execute()
+    return await execute(bulkCancelCourseUseCase, command)
 
-@app.post("/course/{course_id}/end")
-def end_course(course_id: uuid.UUID, command: EndCourseCommand, currentUser = Depends(auth.getCurrentUser)):
+@router.post("/course/claim-next")
+async def claim_next_course(
+    command: ClaimNextCourseCommand,
+    currentUser = Depends(auth.getCurrentUser),
+    idempotencyKey: Optional[str] = IDEMPOTENCY_KEY,
+):
     command.userConnected = currentUser
-    useCase = EndCourseUseCase(course_id, command)
-    return useCase.execute()
+    return await execute(claimNextCourseUseCase, idempotencyKey, command)
 
-@app.get("/course/my")
-def get_my_courses(currentUser = Depends(auth.getCurrentUser)):
-    command = GetMyCoursesCommand(userConnected=currentUser)
-    useCase = GetMyCoursesUseCase(command)
-    return useCase.execute()
+@router.post("/course/{course_id}/confirm")
+async def confirm_course(
+    course_id: uuid.UUID,
+    command: ConfirmCourseCommand,
+    currentUser = Depends(auth.getCurrentUser),
+    idempotencyKey: Optional[str] = IDEMPOTENCY_KEY,
+):
+    command.userConnected = currentUser
+    return await execute(confirmCourseUseCase, idempotencyKey, course_id, command)
+
+@router.post("/course/{course_id}/cancel")
+async def cancel_course(
+    course_id: uuid.UUID,
+    command: CancelCourseCommand,
+    currentUser = Depends(auth.getCurrentUser),
+    idempotencyKey: Optional[str] = IDEMPOTENCY_KEY,
+):
+    command.userConnected = currentUser
+    return await execute(cancelCourseUseCase, idempotencyKey, course_id, command)
+
+@router.post("/course/{course_id}/start")
+async def start_course(
+    course_id: uuid.UUID,
+    command: StartCourseCommand,
+    currentUser = Depends(auth.getCurrentUser),
+    idempotencyKey: Optional[str] = IDEMPOTENCY_KEY,
+):
+    command.userConnected = currentUser
+    return await execute(startCourseUseCase, idempotencyKey, course_id, command)
+
+@router.post("/course/{course_id}/end")
+async def end_course(
+    course_id: uuid.UUID,
+    command: EndCourseCommand,
+    currentUser = Depends(auth.getCurrentUser),
+    idempotencyKey: Optional[str] = IDEMPOTENCY_KEY,
+):
+    command.userConnected = currentUser
+    return await execute(endCourseUseCase, idempotencyKey, course_id, command)
+
+def paginate(response: Response, page):
+    # Le corps reste une liste (compatibilité clients), le curseur suivant et l'ETag passent en en-tête
+    headers = {}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if page.etag:
+        headers["ETag"] = page.etag
+        headers["Cache-Control"] = CACHE_CONTROL
+    if isinstance(page, CoursePageJson):
+        return Response(page.content, media_type="application/json", headers=headers)
+    response.headers.update(headers)
+    return page.items
+
+IF_NONE_MATCH = Header(None, alias="If-None-Match")
+
+@router.get("/course/my")
+async def get_my_courses(
+    response: Response,
+    limit: int = Query(Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    currentUser = Depends(auth.getCurrentUser),
+    ifNoneMatch: Optional[str] = IF_NONE_MATCH,
+):
+    command = GetMyCoursesCommand(userConnected=currentUser, limit=limit, cursor=cursor)
+    return paginate(response, await execute(getMyCoursesUseCase, command, ifNoneMatch))
 
-@app.get("/course/pending")
-def get_pending_courses(currentUser = Depends(auth.getCurrentUser)):
+@router.get("/course/pending")
+async def get_pending_courses(
+    response: Response,
+    limit: int = Query(Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM),
+    currentUser = Depends(auth.getCurrentUser),
+    ifNoneMatch: Optional[str] = IF_NONE_MATCH,
+):
+    command = GetPendingCoursesCommand(
+        userConnected=currentUser, limit=limit, cursor=cursor, lat=lat, lon=lon, radius_km=radius_km,
+    )
+    return paginate(response, await execute(getPendingCoursesUseCase, command, ifNoneMatch))
+
+@router.get("/course/pending/stream")
+async def stream_pending_courses(currentUser = Depends(auth.getCurrentUser)):
     command = GetPendingCoursesCommand(userConnected=currentUser)
-    useCase = GetPendingCoursesUseCase(command)
-    return useCase.execute()
+    return StreamingResponse(
+        await streamPendingCoursesUseCase.executeAsync(command),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/course/export")
+async def export_courses(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status: Optional[list[CourseStatus]] = Query(None),
+    currentUser = Depends(auth.getCurrentUser),
+):
+    command = ExportCoursesCommand(userConnected=currentUser, format=format, since=since, until=until, status=status)
+    return StreamingResponse(
+        await execute(exportCoursesUseCase, command),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="courses.{format}"'},
+    )
+
+@router.get("/course/stats/daily")
+async def get_daily_course_stats(
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    currentUser = Depends(auth.getCurrentUser),
+):
+    command = GetDailyCourseStatsCommand(userConnected=currentUser, since=since, until=until)
+    return await execute(getDailyCourseStatsUseCase, command)
+
+@router.get("/course/stats/drivers")
+async def get_driver_course_stats(
+    response: Response,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    chauffeur_id: Optional[uuid.UUID] = None,
+    limit: int = Query(Pagination.DEFAULT_LIMIT, ge=1, le=Pagination.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    currentUser = Depends(auth.getCurrentUser),
+):
+    command = GetDriverCourseStatsCommand(
+        userConnected=currentUser, since=since, until=until, chauffeur_id=chauffeur_id, limit=limit, cursor=cursor,
+    )
+    page = await execute(getDriverCourseStatsUseCase, command)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/ready")
+async def ready(request: Request):
+    """
+    Sonde de disponibilité: 200 une fois le préchauffage terminé (pool, index des courses en attente),
+    la clé publique chargée et la base joignable; 503 sinon, avec le détail des vérifications.
+    """
+    warmUp = getattr(request.app.state, "warmUp", None)
+    checks = {
+        "startup": warmUp is not None and warmUp.done(),
+        "auth": auth.isLoaded(),
+        "pending_index": not PENDING_INDEX_ENABLED or pendingCourseIndex.isLoaded(),
+        "database": True,
+    }
+    try:
+        if Database.is_async():
+            await Database.ping_async()
+        else:
+            await run_in_threadpool(Database.ping)
+    except Exception as e:
+        # Sonde appelée en boucle: une ligne par échec, sans trace
+        logger.warning("Sonde /ready: base de données injoignable (%s)", e)
+        checks["database"] = False
+    isReady = all(checks.values())
+    return JSONResponse({"status": "ready" if isReady else "unavailable", "checks": checks}, status_code=200 if isReady else 503)
+
+
+def create_app() -> FastAPI:
+    """
+    Fabrique de l'application (uvicorn app.main:create_app --factory, ou `app` ci-dessous).
+    Rien n'est ouvert ici: clé publique, grilles tarifaires, connexions et index sont initialisés
+    au démarrage (lifespan), pas à l'import.
+    """
+    Logging.configure()
+    # Une unité de travail (sessions partagées, fermées en fin de requête) par requête HTTP
+    app = FastAPI(title="Course Microservice", lifespan=lifespan, dependencies=[Depends(Database.unit_of_work)])
+    # Limitation de débit avant toute autre étape (les 429 sont comptés par RequestMetricsMiddleware).
+    # Seaux créés ici: avec RATE_LIMIT_BACKEND=shared, avant le fork des workers (app.server)
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter.fromEnv(), auth=auth)
+    app.add_middleware(RequestMetricsMiddleware)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,71 @@
+import json
+import math
+
+from fastapi import HTTPException
+
+from app.service.Metrics import registry
+
+HTTP_RATE_LIMITED = registry.counter(
+    "http_rate_limited_total", "Requêtes refusées par la limitation de débit (429)", ("rule",),
+)
+
+_BODY = json.dumps({"detail": "Trop de requêtes, réessayez plus tard"}, ensure_ascii=False).encode()
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI: refuse avec un 429 (Retry-After) les requêtes au-delà du budget de l'utilisateur,
+    avant le routage et toute connexion à la base.
+
+    L'utilisateur est lu dans le JWT par Auth.decodeTokenAsync: un token en cache est servi sur la
+    boucle, un token inconnu est vérifié dans le threadpool (puis mis en cache: la dépendance
+    getCurrentUser de la route ne le vérifie pas une seconde fois). Un token absent ou invalide
+    est compté par adresse IP; la route répond ensuite 401 comme d'habitude.
+    """
+
+    def __init__(self, app, limiter, auth) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.auth = auth
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.limiter.rule(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        identity, roles = await self._identity(scope)
+        retryAfter = self.limiter.take(rule, identity, roles)
+        if not retryAfter:
+            await self.app(scope, receive, send)
+            return
+
+        HTTP_RATE_LIMITED.inc(rule=rule.name)
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_BODY)).encode()),
+                (b"retry-after", str(math.ceil(retryAfter)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _BODY})
+
+    async def _identity(self, scope) -> tuple[str, list]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    try:
+                        payload = await self.auth.decodeTokenAsync(token)
+                        return f"user:{payload['id']}", payload.get("roles") or []
+                    except HTTPException:
+                        pass
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}", []
@@ -0,0 +1,49 @@
+import time
+
+from app.service.Database import QueryStats, current_query_stats
+from app.service.Metrics import registry, DURATION_BUCKETS
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route", "status"), DURATION_BUCKETS,
+)
+HTTP_REQUEST_SQL_STATEMENTS = registry.histogram(
+    "http_request_sql_statements", "Requêtes SQL par requête HTTP", ("route",), (0, 1, 2, 3, 4, 5, 10, 20, 50, 100),
+)
+HTTP_REQUEST_SQL_DURATION = registry.histogram(
+    "http_request_sql_duration_seconds", "Temps SQL cumulé par requête HTTP", ("route",), DURATION_BUCKETS,
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI: ouvre un QueryStats par requête HTTP (lu par les hooks SQL de Database)
+    et alimente, par route FastAPI, les histogrammes de durée et de requêtes SQL.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = current_query_stats.set(stats)
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            current_query_stats.reset(token)
+            route = stats.route()
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=scope["method"], route=route, status=status)
+            HTTP_REQUEST_SQL_STATEMENTS.observe(stats.count, route=route)
+            HTTP_REQUEST_SQL_DURATION.observe(stats.duration, route=route)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Numeric
+from sqlalchemy import Column, String, DateTime, Float, Numeric, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.service.Database import Base
@@ -17,12 +17,24 @@ class CourseStatus(PyEnum):
 
 class Course(Base):
     __tablename__ = "course"
+    # Index composites alignés sur la pagination keyset (updatedAt, id) décroissante
+    __table_args__ = (
+        Index("ix_course_client_updated", "client_id", "updatedAt", "id"),
+        Index("ix_course_chauffeur_updated", "chauffeur_id", "updatedAt", "id"),
+        Index("ix_course_status_updated", "status", "updatedAt", "id"),
+        # Recherche des courses en attente autour d'une position (rectangle lat / lon)
+        Index("ix_course_status_depart_geo", "status", "depart_lat", "depart_lon"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     client_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     chauffeur_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
     point_depart = Column(String, nullable=False)
     point_arrivee = Column(String, nullable=False)
+    depart_lat = Column(Float, nullable=True)
+    depart_lon = Column(Float, nullable=True)
+    arrivee_lat = Column(Float, nullable=True)
+    arrivee_lon = Column(Float, nullable=True)
     date_heure_depart = Column(DateTime(timezone=True), nullable=True)
     date_heure_arrivee = Column(DateTime(timezone=True), nullable=True)
     status = Column(Enum(CourseStatus), nullable=False, default=CourseStatus.DEMANDEE)
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, DateTime, Float, Numeric, Index, Enum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.Course import CourseStatus
+from app.service.Database import Base
+import uuid
+from datetime import datetime
+
+
+class CourseArchive(Base):
+    """
+    Courses terminées / annulées déplacées hors de la table course par app.scripts.archive_courses.
+
+    Mêmes colonnes que Course. Sous Postgres la table est partitionnée par mois sur updatedAt
+    (partitions course_archive_AAAA_MM, créées par create_tables et par le job d'archivage):
+    la clé de partition fait donc partie de la clé primaire.
+    """
+    __tablename__ = "course_archive"
+    __table_args__ = (
+        Index("ix_course_archive_client_updated", "client_id", "updatedAt", "id"),
+        Index("ix_course_archive_chauffeur_updated", "chauffeur_id", "updatedAt", "id"),
+        {"postgresql_partition_by": 'RANGE ("updatedAt")'},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    client_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    chauffeur_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    point_depart = Column(String, nullable=False)
+    point_arrivee = Column(String, nullable=False)
+    depart_lat = Column(Float, nullable=True)
+    depart_lon = Column(Float, nullable=True)
+    arrivee_lat = Column(Float, nullable=True)
+    arrivee_lon = Column(Float, nullable=True)
+    date_heure_depart = Column(DateTime(timezone=True), nullable=True)
+    date_heure_arrivee = Column(DateTime(timezone=True), nullable=True)
+    status = Column(Enum(CourseStatus), nullable=False)
+    tarif = Column(Numeric(10, 2), nullable=True)
+    updatedAt = Column(DateTime(timezone=True), primary_key=True)
+    archivedAt = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
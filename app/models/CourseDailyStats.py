@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Date, Enum, Float, Index, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.Course import CourseStatus
+from app.service.Database import Base
+import uuid
+
+# Clé des courses sans chauffeur (annulées avant confirmation): une clé primaire ne peut pas être NULL
+NO_DRIVER = uuid.UUID(int=0)
+
+
+class CourseDailyStats(Base):
+    """
+    Agrégats des courses terminées et annulées, par jour (UTC), chauffeur et statut:
+    nombre de courses, chiffre d'affaires (somme des tarifs) et durées cumulées.
+
+    Tenus à jour par CourseRepository dans la transaction de fin / d'annulation
+    (CourseStatsRepository.record), reconstruits par app.scripts.rebuild_course_stats.
+    Jour d'une course: celui de sa fin ou de son annulation (updatedAt, UTC), que l'archivage
+    et le recalcul des tarifs ne modifient pas.
+    """
+    __tablename__ = "course_daily_stats"
+    # Statistiques d'un chauffeur sur une période (la clé primaire couvre les lectures par jour)
+    __table_args__ = (
+        Index("ix_course_daily_stats_chauffeur_day", "chauffeur_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    chauffeur_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    status = Column(Enum(CourseStatus), primary_key=True)
+    course_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    # Somme des durées (secondes) des duration_count courses dont la durée est connue
+    duration_seconds = Column(Float, nullable=False, default=0)
+    duration_count = Column(Integer, nullable=False, default=0)
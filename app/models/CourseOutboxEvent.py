@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.service.Database import Base
+import uuid
+
+
+class CourseOutboxEvent(Base):
+    """
+    Outbox transactionnelle des événements de course: écrite dans la même transaction
+    que la transition, puis publiée par OutboxDispatcher et supprimée une fois livrée.
+    """
+    __tablename__ = "course_outbox"
+    # Tête de file par course (ordre de publication) et sélection des événements à publier
+    __table_args__ = (
+        Index("ix_course_outbox_course", "course_id", "id"),
+        Index("ix_course_outbox_next_attempt", "nextAttemptAt"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer(), "sqlite"), primary_key=True, autoincrement=True)
+    course_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    type = Column(String(32), nullable=False)
+    # CourseOut sérialisé au moment de la transition
+    payload = Column(Text, nullable=False)
+    occurredAt = Column(DateTime(timezone=True), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    nextAttemptAt = Column(DateTime(timezone=True), nullable=False)
+    lastError = Column(Text, nullable=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from app.service.Database import Base
+
+# Ligne des courses (une seule aujourd'hui)
+COURSES_EPOCH = "courses"
+
+
+class CourseReadEpoch(Base):
+    """
+    Époque des lectures de courses, incrémentée par les corrections en masse qui gardent updatedAt
+    (app.scripts.reprice_courses --apply). Elle entre dans la version de GET /course/my: ETag et pages
+    de responseCache changent, aucun client ne garde (304) ni ne se voit resservir les anciens tarifs.
+    """
+    __tablename__ = "course_read_epoch"
+
+    name = Column(String(32), primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Text
+from app.service.Database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Clé Idempotency-Key reçue sur une écriture (création / transition de course).
+
+    La ligne est réservée avant l'écriture (response à NULL) par une requête qui en détient le bail
+    (leaseToken) jusqu'à leaseExpiresAt; la réponse JSON est enregistrée dans la transaction de
+    l'écriture. Un rejeu dans la fenêtre de validité renvoie cette réponse telle quelle.
+    """
+    __tablename__ = "idempotency_key"
+
+    user_id = Column(String(64), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # Empreinte de la requête (route, course, body): une même clé ne sert qu'à une seule requête
+    fingerprint = Column(String(64), nullable=False)
+    response = Column(Text, nullable=True)
+    expiresAt = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Requête en cours: au-delà du bail (arrêt brutal du worker), un nouvel essai reprend la clé
+    leaseToken = Column(String(32), nullable=True)
+    leaseExpiresAt = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+import uuid
+
+from app.out.CourseOut import CourseOut
+
+
+class BulkItemOut(BaseModel):
+    index: int
+    course_id: uuid.UUID | None = None
+    course: CourseOut | None = None
+    error: str | None = None
+
+
+class BulkResultOut(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemOut]
@@ -18,6 +18,10 @@ class CourseOut(BaseModel):
     chauffeur_id: uuid.UUID | None
     point_depart: str
     point_arrivee: str
+    depart_lat: float | None = None
+    depart_lon: float | None = None
+    arrivee_lat: float | None = None
+    arrivee_lon: float | None = None
     date_heure_depart: datetime | None
     date_heure_arrivee: datetime | None
     status: CourseStatus
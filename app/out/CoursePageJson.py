@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class CoursePageJson(BaseModel):
+    """Page de courses déjà sérialisée: le corps JSON est renvoyé tel quel par la route."""
+    content: bytes
+    next_cursor: Optional[str] = None
+    etag: Optional[str] = None
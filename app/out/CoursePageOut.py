@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from app.out.CourseOut import CourseOut
+
+
+class CoursePageOut(BaseModel):
+    items: list[CourseOut]
+    next_cursor: Optional[str] = None
+    etag: Optional[str] = None
@@ -0,0 +1,12 @@
+import uuid
+from datetime import date
+from pydantic import BaseModel
+
+
+class CourseStatsOut(BaseModel):
+    day: date
+    chauffeur_id: uuid.UUID | None = None
+    # Nombre de courses par statut (Terminée, Annulée)
+    counts: dict[str, int]
+    revenue: float
+    average_duration_seconds: float | None
@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from app.out.CourseStatsOut import CourseStatsOut
+
+
+class CourseStatsPageOut(BaseModel):
+    items: list[CourseStatsOut]
+    next_cursor: Optional[str] = None
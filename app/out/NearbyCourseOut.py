@@ -0,0 +1,6 @@
+from app.out.CourseOut import CourseOut
+
+
+class NearbyCourseOut(CourseOut):
+    # Distance (km) entre la position du driver et le point de départ
+    distance_km: float
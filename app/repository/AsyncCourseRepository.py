@@ -0,0 +1,104 @@
+import uuid
+from typing import AsyncIterator, Optional
+
+from app.command.CreateCourseCommand import CreateCourseCommand
+from app.models.Course import Course
+from app.repository.CourseRepository import EXPORT_CHUNK_SIZE, CourseRepository
+from app.service.Database import Database
+from app.service.PendingCourseIndex import pendingCourseIndex
+
+
+class AsyncCourseRepository:
+    """
+    Version asyncio de CourseRepository (mode DATABASE_MODE=async).
+
+    Chaque méthode ouvre une AsyncSession et exécute la logique de CourseRepository
+    via AsyncSession.run_sync: les requêtes passent par le pilote asyncio sans
+    occuper de thread, et les règles métier restent écrites une seule fois.
+    """
+
+    def __init__(self) -> None:
+        self.courseRepository = CourseRepository()
+
+    @Database.with_async_session
+    async def createCourse(self, course_in: CreateCourseCommand, db=None) -> Course:
+        return await db.run_sync(lambda session: self.courseRepository.createCourse(course_in, db=session))
+
+    @Database.with_async_session
+    async def getCourseById(self, course_id: uuid.UUID, db=None) -> Optional[Course]:
+        return await db.run_sync(lambda session: self.courseRepository.getCourseById(course_id, db=session))
+
+    @Database.with_async_session
+    async def confirmCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
+        return await db.run_sync(lambda session: self.courseRepository.confirmCourse(course_id, user_connected, db=session))
+
+    @Database.with_async_session
+    async def claimNextCourse(self, user_connected: dict, order: str = "oldest", db=None) -> Optional[Course]:
+        return await db.run_sync(lambda session: self.courseRepository.claimNextCourse(user_connected, order, db=session))
+
+    @Database.with_async_session
+    async def cancelCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
+        return await db.run_sync(lambda session: self.courseRepository.cancelCourse(course_id, user_connected, db=session))
+
+    @Database.with_async_session
+    async def createCourses(self, courses_in: list[CreateCourseCommand], user_connected: dict, db=None) -> list[Course]:
+        return await db.run_sync(lambda session: self.courseRepository.createCourses(courses_in, user_connected, db=session))
+
+    @Database.with_async_session
+    async def confirmCourses(self, course_ids: list[uuid.UUID], user_connected: dict, db=None) -> dict:
+        return await db.run_sync(lambda session: self.courseRepository.confirmCourses(course_ids, user_connected, db=session))
+
+    @Database.with_async_session
+    async def cancelCourses(self, course_ids: list[uuid.UUID], user_connected: dict, db=None) -> dict:
+        return await db.run_sync(lambda session: self.courseRepository.cancelCourses(course_ids, user_connected, db=session))
+
+    @Database.with_async_session
+    async def startCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
+        return await db.run_sync(lambda session: self.courseRepository.startCourse(course_id, user_connected, db=session))
+
+    @Database.with_async_session
+    async def endCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
+        return await db.run_sync(lambda session: self.courseRepository.endCourse(course_id, user_connected, db=session))
+
+    @Database.with_async_read_session
+    async def getMyCoursesVersion(self, user_connected: dict, db=None) -> str:
+        return await db.run_sync(lambda session: self.courseRepository.getMyCoursesVersion(user_connected, db=session))
+
+    @Database.with_async_read_session
+    async def getPendingCoursesVersion(self, user_connected: dict, db=None) -> str:
+        await self.ensurePendingIndex(db)
+        return await db.run_sync(lambda session: self.courseRepository.getPendingCoursesVersion(user_connected, db=session))
+
+    @Database.with_async_read_session
+    async def getMyCourses(self, user_connected: dict, limit: Optional[int] = None, cursor: Optional[str] = None, db=None) -> list:
+        return await db.run_sync(lambda session: self.courseRepository.getMyCourses(user_connected, limit, cursor, db=session))
+
+    @Database.with_async_read_session
+    async def getPendingCourses(self, user_connected: dict, limit: Optional[int] = None, cursor: Optional[str] = None, db=None) -> list:
+        await self.ensurePendingIndex(db)
+        return await db.run_sync(lambda session: self.courseRepository.getPendingCourses(user_connected, limit, cursor, db=session))
+
+    @Database.with_async_read_session
+    async def getNearestPendingCourses(
+        self, user_connected: dict, lat: float, lon: float, radius_km: float, limit: int, db=None
+    ) -> list[tuple]:
+        await self.ensurePendingIndex(db)
+        return await db.run_sync(
+            lambda session: self.courseRepository.getNearestPendingCourses(user_connected, lat, lon, radius_km, limit, db=session)
+        )
+
+    async def ensurePendingIndex(self, db) -> None:
+        """Recharge l'index des courses en attente s'il est périmé, depuis le primaire (AsyncSession)."""
+        if pendingCourseIndex.started:
+            primary = None if db.info.get("replica") else db
+            await pendingCourseIndex.ensureFreshAsync(lambda: self.getAllPendingCourses(db=primary))
+
+    @Database.with_async_session
+    async def getAllPendingCourses(self, db=None) -> list:
+        return await db.run_sync(lambda session: self.courseRepository.getAllPendingCourses(db=session))
+
+    async def streamExport(self, query, db) -> AsyncIterator[list]:
+        """Équivalent de CourseRepository.streamExport sur une AsyncSession (Database.async_stream_session)."""
+        result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for rows in result.partitions():
+            yield rows
@@ -0,0 +1,34 @@
+import uuid
+from datetime import date
+from typing import Optional
+
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from app.service.Database import Database
+
+
+class AsyncCourseStatsRepository:
+    """Version asyncio de CourseStatsRepository (mode DATABASE_MODE=async), via AsyncSession.run_sync."""
+
+    def __init__(self) -> None:
+        self.courseStatsRepository = CourseStatsRepository()
+
+    @Database.with_async_read_session
+    async def getDailyStats(self, user_connected: dict, since: Optional[date] = None, until: Optional[date] = None, db=None) -> list[dict]:
+        return await db.run_sync(lambda session: self.courseStatsRepository.getDailyStats(user_connected, since, until, db=session))
+
+    @Database.with_async_read_session
+    async def getDriverStats(
+        self,
+        user_connected: dict,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        chauffeur_id: Optional[uuid.UUID] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        db=None,
+    ) -> list[dict]:
+        return await db.run_sync(
+            lambda session: self.courseStatsRepository.getDriverStats(
+                user_connected, since, until, chauffeur_id, limit, cursor, db=session
+            )
+        )
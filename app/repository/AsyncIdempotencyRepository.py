@@ -0,0 +1,24 @@
+from typing import Optional
+
+from app.models.IdempotencyKey import IdempotencyKey
+from app.repository.IdempotencyRepository import IdempotencyRepository
+from app.service.Database import Database
+
+
+class AsyncIdempotencyRepository:
+    """Version asyncio de IdempotencyRepository (mode DATABASE_MODE=async), via AsyncSession.run_sync."""
+
+    def __init__(self) -> None:
+        self.idempotencyRepository = IdempotencyRepository()
+
+    @Database.with_async_session
+    async def reserve(
+        self, user_id: str, key: str, fingerprint: str, ttl: float, lease: float, token: str, db=None,
+    ) -> Optional[IdempotencyKey]:
+        return await db.run_sync(
+            lambda session: self.idempotencyRepository.reserve(user_id, key, fingerprint, ttl, lease, token, db=session)
+        )
+
+    @Database.with_async_session
+    async def release(self, user_id: str, key: str, token: str, db=None) -> None:
+        return await db.run_sync(lambda session: self.idempotencyRepository.release(user_id, key, token, db=session))
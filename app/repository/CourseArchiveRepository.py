@@ -0,0 +1,121 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, text, tuple_
+
+from app.models.Course import Course, CourseStatus
+from app.models.CourseArchive import CourseArchive
+from app.service.Database import Database
+from app.service.Pagination import Pagination
+
+# Statuts définitifs: seules ces courses sont archivées
+TERMINAL_STATUSES = (CourseStatus.TERMINEE, CourseStatus.ANNULEE)
+
+# Colonnes de CourseArchive dans l'ordre de COURSE_OUT_COLUMNS (mêmes tuples pour CourseSerializer)
+ARCHIVE_OUT_COLUMNS = (
+    CourseArchive.id,
+    CourseArchive.client_id,
+    CourseArchive.chauffeur_id,
+    CourseArchive.point_depart,
+    CourseArchive.point_arrivee,
+    CourseArchive.depart_lat,
+    CourseArchive.depart_lon,
+    CourseArchive.arrivee_lat,
+    CourseArchive.arrivee_lon,
+    CourseArchive.date_heure_depart,
+    CourseArchive.date_heure_arrivee,
+    CourseArchive.status,
+    CourseArchive.tarif,
+    CourseArchive.updatedAt,
+)
+
+# Colonnes recopiées de course vers course_archive
+_COPIED_COLUMNS = [column.key for column in ARCHIVE_OUT_COLUMNS]
+
+
+def _month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+class CourseArchiveRepository:
+    """
+    Archivage des courses terminées / annulées dans course_archive, et lecture de l'historique.
+
+    L'archivage se fait par lots, chacun dans sa propre transaction (copie puis suppression):
+    un job interrompu reprend simplement là où il s'est arrêté.
+    """
+
+    @staticmethod
+    def partitionName(month: datetime) -> str:
+        return f"{CourseArchive.__tablename__}_{month:%Y_%m}"
+
+    @staticmethod
+    def isPartitioned(db) -> bool:
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        return bool(db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+            {"table": CourseArchive.__tablename__},
+        ).scalar())
+
+    def ensurePartitions(self, db, months) -> None:
+        """Crée (si absentes) les partitions mensuelles couvrant les dates données (Postgres uniquement)."""
+        if not self.isPartitioned(db):
+            return
+        for month in sorted({_month_start(m) for m in months}):
+            db.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{self.partitionName(month)}" PARTITION OF "{CourseArchive.__tablename__}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+            ))
+
+    @Database.with_session
+    def archiveBatch(self, olderThan: datetime, batchSize: int, db=None) -> int:
+        """
+        Déplace au plus batchSize courses terminales dont updatedAt < olderThan, les plus anciennes d'abord.
+        Retourne le nombre de courses archivées (0: plus rien à archiver).
+        """
+        stmt = (
+            select(Course)
+            .where(Course.status.in_(TERMINAL_STATUSES), Course.updatedAt < olderThan)
+            .order_by(Course.updatedAt, Course.id)
+            .limit(batchSize)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            # Plusieurs jobs concurrents se répartissent les lignes au lieu de s'attendre
+            stmt = stmt.with_for_update(skip_locked=True)
+        courses = list(db.scalars(stmt))
+        if not courses:
+            db.rollback()
+            return 0
+
+        self.ensurePartitions(db, [course.updatedAt for course in courses])
+        now = datetime.now(timezone.utc)
+        db.execute(
+            insert(CourseArchive),
+            [{**{key: getattr(course, key) for key in _COPIED_COLUMNS}, "archivedAt": now} for course in courses],
+        )
+        db.execute(
+            delete(Course).where(Course.id.in_([course.id for course in courses])),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+        return len(courses)
+
+    def getPage(self, db, owner_column, owner_id: uuid.UUID, limit: Optional[int], cursor: Optional[str]) -> list:
+        """Page keyset (updatedAt, id) décroissante de l'historique archivé, mêmes tuples que CourseRepository."""
+        query = db.query(*ARCHIVE_OUT_COLUMNS).filter(owner_column == owner_id)
+        if cursor:
+            updated_at, course_id = Pagination.decodeCursor(cursor)
+            query = query.filter(tuple_(CourseArchive.updatedAt, CourseArchive.id) < (updated_at, course_id))
+        query = query.order_by(CourseArchive.updatedAt.desc(), CourseArchive.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
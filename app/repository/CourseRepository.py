@@ -1,14 +1,87 @@
+import heapq
+import itertools
+import os
 import uuid
-from typing import Optional
-from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Iterator, Optional
+from datetime import datetime
+
+from sqlalchemy import func, insert, select, tuple_, union_all, update
+from sqlalchemy.orm import aliased
 
 from app.command.CreateCourseCommand import CreateCourseCommand
 from app.command.ConfirmCourseCommand import ConfirmCourseCommand
 from app.models.Course import Course, CourseStatus
+from app.models.CourseArchive import CourseArchive
+from app.models.CourseReadEpoch import COURSES_EPOCH, CourseReadEpoch
+from app.repository.CourseArchiveRepository import ARCHIVE_OUT_COLUMNS, CourseArchiveRepository
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from app.repository.IdempotencyRepository import IdempotencyRepository
+from app.repository.OutboxRepository import OutboxRepository
+from app.service.CourseEvents import CourseEvents
 from app.service.Database import Database
+from app.service.FareEngine import FareEngine
+from app.service.Geo import Geo
+from app.service.Pagination import Pagination
+from app.service.PendingCourseIndex import pendingCourseIndex
+
+
+# Machine à états des courses: statut cible -> (statut attendu, message si la course n'y est pas)
+COURSE_TRANSITIONS: dict[CourseStatus, tuple[CourseStatus, str]] = {
+    CourseStatus.VALIDEE: (CourseStatus.DEMANDEE, "Seules les courses demandées peuvent être confirmées"),
+    CourseStatus.ANNULEE: (CourseStatus.DEMANDEE, "Seules les courses demandées peuvent être annulées"),
+    CourseStatus.EN_COURS: (CourseStatus.VALIDEE, "Seules les courses validées peuvent être démarrées"),
+    CourseStatus.TERMINEE: (CourseStatus.EN_COURS, "Seules les courses en cours peuvent être terminées"),
+}
+
+
+# Colonnes lues par les listes de courses: des tuples (Row) suffisent, sans entités ORM
+COURSE_OUT_COLUMNS = (
+    Course.id,
+    Course.client_id,
+    Course.chauffeur_id,
+    Course.point_depart,
+    Course.point_arrivee,
+    Course.depart_lat,
+    Course.depart_lon,
+    Course.arrivee_lat,
+    Course.arrivee_lon,
+    Course.date_heure_depart,
+    Course.date_heure_arrivee,
+    Course.status,
+    Course.tarif,
+    Course.updatedAt,
+)
+
+# Lignes lues par aller-retour du curseur côté serveur lors d'un export (mémoire bornée par ce bloc)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+
+def _parse_uuid(value) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _transitionError(current: Optional[Course], expected: CourseStatus, status_error: str, owner_error: Optional[str]) -> str:
+    # Ordre des vérifications historique: existence, statut, puis propriétaire
+    if not current:
+        return "Course non trouvée"
+    if current.status != expected:
+        return status_error
+    return owner_error
 
 
 class CourseRepository:
+    # Outbox écrite dans la même transaction que chaque écriture (publiée par OutboxDispatcher)
+    outboxRepository = OutboxRepository()
+    courseArchiveRepository = CourseArchiveRepository()
+    # Agrégats des courses terminées / annulées, tenus dans la transaction de la transition
+    courseStatsRepository = CourseStatsRepository()
+    # Réponse d'une requête avec Idempotency-Key, validée avec l'écriture
+    idempotencyRepository = IdempotencyRepository()
+
     @Database.with_session
     def createCourse(self, course_in: CreateCourseCommand, db=None) -> Course:
 
@@ -21,18 +94,113 @@ class CourseRepository:
             client_id=uuid.UUID(course_in.userConnected["id"]),
             point_depart=course_in.point_depart,
             point_arrivee=course_in.point_arrivee,
+            depart_lat=course_in.depart_lat,
+            depart_lon=course_in.depart_lon,
+            arrivee_lat=course_in.arrivee_lat,
+            arrivee_lon=course_in.arrivee_lon,
             # Les autres champs prennent leurs valeurs par défaut
         )
 
         db.add(entity)
-        db.commit()
+        db.flush()
+        # Relire dans la transaction: l'événement porte les valeurs telles que stockées en base
         db.refresh(entity)
+        CourseEvents.emit(db, CourseEvents.CREATED, entity)
+        self.outboxRepository.add(db, CourseEvents.CREATED, [entity])
+        self.idempotencyRepository.record(db, entity)
+        db.commit()
+        Database.record_write(course_in.userConnected["id"])
         return entity
 
     @Database.with_session
     def getCourseById(self, course_id: uuid.UUID, db=None) -> Optional[Course]:
         return db.query(Course).filter(Course.id == course_id).first()
 
+    def _transition(
+        self,
+        db,
+        course_id: uuid.UUID,
+        target: CourseStatus,
+        values: dict,
+        owner_column=None,
+        user_connected: Optional[dict] = None,
+        owner_error: Optional[str] = None,
+    ) -> Course:
+        """
+        Applique une transition de statut en une seule requête atomique:
+            UPDATE course SET ... WHERE id = ? AND status = ? [AND <propriétaire> = ?] RETURNING *
+
+        Le statut attendu provient de COURSE_TRANSITIONS. Si aucune ligne n'est modifiée,
+        la course est relue (chemin d'erreur uniquement) afin de lever le même message
+        qu'avec l'ancienne vérification en Python.
+        """
+        expected, status_error = COURSE_TRANSITIONS[target]
+
+        owner_id = None
+        if owner_column is not None:
+            owner_id = _parse_uuid((user_connected or {}).get("id"))
+
+        course = None
+        if owner_column is None or owner_id is not None:
+            stmt = (
+                update(Course)
+                .where(Course.id == course_id, Course.status == expected)
+                .values(status=target, updatedAt=datetime.utcnow(), **values)
+                .returning(Course)
+            )
+            if owner_column is not None:
+                stmt = stmt.where(owner_column == owner_id)
+            course = db.execute(stmt).scalar_one_or_none()
+
+        if course is None:
+            # Aucune ligne modifiée: retrouver la raison, dans le même ordre qu'avant
+            current = self.getCourseById(course_id, db=db)
+            raise ValueError(_transitionError(current, expected, status_error, owner_error))
+
+        return course
+
+    def _bulkTransition(
+        self,
+        db,
+        course_ids: list[uuid.UUID],
+        target: CourseStatus,
+        values: dict,
+        owner_column=None,
+        user_connected: Optional[dict] = None,
+        owner_error: Optional[str] = None,
+    ) -> dict:
+        """
+        Version lot de _transition: un seul UPDATE ... WHERE id IN (...) RETURNING,
+        puis une seule relecture des courses non modifiées pour expliquer l'échec.
+        Retourne {course_id: Course ou message d'erreur}.
+        """
+        expected, status_error = COURSE_TRANSITIONS[target]
+        ids = list(dict.fromkeys(course_ids))
+
+        owner_id = None
+        if owner_column is not None:
+            owner_id = _parse_uuid((user_connected or {}).get("id"))
+
+        results: dict = {}
+        if owner_column is None or owner_id is not None:
+            stmt = (
+                update(Course)
+                .where(Course.id.in_(ids), Course.status == expected)
+                .values(status=target, updatedAt=datetime.utcnow(), **values)
+                .returning(Course)
+            )
+            if owner_column is not None:
+                stmt = stmt.where(owner_column == owner_id)
+            results = {course.id: course for course in db.execute(stmt).scalars()}
+
+        missing = [course_id for course_id in ids if course_id not in results]
+        if missing:
+            current = {course.id: course for course in db.query(Course).filter(Course.id.in_(missing))}
+            for course_id in missing:
+                results[course_id] = _transitionError(current.get(course_id), expected, status_error, owner_error)
+
+        return results
+
     @Database.with_session
     def confirmCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
         # Vérifier que l'utilisateur est bien un driver
@@ -40,22 +208,61 @@ class CourseRepository:
         if "driver" not in user_roles:
             raise ValueError("Seuls les drivers peuvent confirmer une course")
 
-        # Récupérer la course
-        course = self.getCourseById(course_id, db=db)
-        if not course:
-            raise ValueError("Course non trouvée")
+        # Passer la course de "demandée" à "validée" en une seule requête conditionnelle
+        course = self._transition(
+            db, course_id, CourseStatus.VALIDEE,
+            {"chauffeur_id": uuid.UUID(user_connected["id"])},
+        )
+        CourseEvents.emit(db, CourseEvents.CONFIRMED, course)
+        self.outboxRepository.add(db, CourseEvents.CONFIRMED, [course])
+        self.idempotencyRepository.record(db, course)
+
+        db.commit()
+        Database.record_write(user_connected["id"])
+        return course
+
+    @Database.with_session
+    def claimNextCourse(self, user_connected: dict, order: str = "oldest", db=None) -> Optional[Course]:
+        """
+        Attribue au driver la prochaine course en attente (la plus ancienne, ou la plus récente)
+        et la confirme dans la même requête:
+            UPDATE course SET ... WHERE id = (SELECT id ... LIMIT 1 FOR UPDATE SKIP LOCKED) RETURNING *
 
-        # Vérifier que la course est bien à l'état "demandée"
-        if course.status != CourseStatus.DEMANDEE:
-            raise ValueError("Seules les courses demandées peuvent être confirmées")
+        Les drivers concurrents ne s'attendent pas et ne se disputent pas la même course:
+        chacun obtient une course différente. Retourne None s'il n'y a plus de course en attente.
+        """
+        user_roles = (user_connected or {}).get("roles", [])
+        if "driver" not in user_roles:
+            raise ValueError("Seuls les drivers peuvent confirmer une course")
 
-        # Mettre à jour la course
-        course.status = CourseStatus.VALIDEE
-        course.chauffeur_id = uuid.UUID(user_connected["id"])
-        course.updatedAt = datetime.utcnow()
+        candidate = aliased(Course)
+        age = (candidate.updatedAt, candidate.id) if order == "oldest" else (candidate.updatedAt.desc(), candidate.id.desc())
+        next_id = (
+            select(candidate.id)
+            .where(candidate.status == CourseStatus.DEMANDEE)
+            .order_by(*age)
+            .limit(1)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            # Les lignes déjà verrouillées par une autre attribution sont ignorées (sous SQLite, l'écriture est sérialisée)
+            next_id = next_id.with_for_update(skip_locked=True)
+
+        course = db.execute(
+            update(Course)
+            .where(Course.id == next_id.scalar_subquery(), Course.status == CourseStatus.DEMANDEE)
+            .values(status=CourseStatus.VALIDEE, updatedAt=datetime.utcnow(), chauffeur_id=uuid.UUID(user_connected["id"]))
+            .returning(Course)
+        ).scalar_one_or_none()
+        if course is None:
+            db.rollback()
+            return None
+
+        CourseEvents.emit(db, CourseEvents.CONFIRMED, course)
+        self.outboxRepository.add(db, CourseEvents.CONFIRMED, [course])
+        self.idempotencyRepository.record(db, course)
 
         db.commit()
-        db.refresh(course)
+        Database.record_write(user_connected["id"])
         return course
 
     @Database.with_session
@@ -65,82 +272,109 @@ class CourseRepository:
         if "customer" not in user_roles:
             raise ValueError("Seuls les customers peuvent annuler une course")
 
-        # Récupérer la course
-        course = self.getCourseById(course_id, db=db)
-        if not course:
-            raise ValueError("Course non trouvée")
+        # Annuler la course si elle est "demandée" et appartient bien à l'utilisateur
+        course = self._transition(
+            db, course_id, CourseStatus.ANNULEE, {},
+            owner_column=Course.client_id,
+            user_connected=user_connected,
+            owner_error="Vous ne pouvez annuler que vos propres courses",
+        )
+        CourseEvents.emit(db, CourseEvents.CANCELLED, course)
+        self.outboxRepository.add(db, CourseEvents.CANCELLED, [course])
+        self.courseStatsRepository.record(db, [course])
+        self.idempotencyRepository.record(db, course)
+
+        db.commit()
+        Database.record_write(user_connected["id"])
+        return course
+
+    @Database.with_session
+    def createCourses(self, courses_in: list[CreateCourseCommand], user_connected: dict, db=None) -> list[Course]:
+        # Vérifier que l'utilisateur est bien un customer
+        user_roles = (user_connected or {}).get("roles", [])
+        if "customer" not in user_roles:
+            raise ValueError("Seuls les customers peuvent créer une course")
 
-        # Vérifier que la course est bien à l'état "demandée"
-        if course.status != CourseStatus.DEMANDEE:
-            raise ValueError("Seules les courses demandées peuvent être annulées")
+        if not courses_in:
+            return []
 
-        # Vérifier que l'utilisateur est bien le client de cette course
-        if str(course.client_id) != user_connected.get("id"):
-            raise ValueError("Vous ne pouvez annuler que vos propres courses")
+        client_id = uuid.UUID(user_connected["id"])
+        rows = [
+            {"client_id": client_id, **course_in.model_dump(exclude={"userConnected"})}
+            for course_in in courses_in
+        ]
 
-        # Mettre à jour la course
-        course.status = CourseStatus.ANNULEE
-        course.updatedAt = datetime.utcnow()
+        # INSERT multi-lignes ... RETURNING, dans l'ordre des paramètres
+        entities = list(db.scalars(insert(Course).returning(Course, sort_by_parameter_order=True), rows))
+        CourseEvents.emitMany(db, CourseEvents.CREATED, entities)
+        self.outboxRepository.add(db, CourseEvents.CREATED, entities)
 
         db.commit()
-        db.refresh(course)
-        return course
+        Database.record_write(user_connected["id"])
+        return entities
 
     @Database.with_session
-    def startCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
+    def confirmCourses(self, course_ids: list[uuid.UUID], user_connected: dict, db=None) -> dict:
         # Vérifier que l'utilisateur est bien un driver
         user_roles = (user_connected or {}).get("roles", [])
         if "driver" not in user_roles:
-            raise ValueError("Seuls les drivers peuvent démarrer une course")
+            raise ValueError("Seuls les drivers peuvent confirmer une course")
 
-        # Récupérer la course
-        course = self.getCourseById(course_id, db=db)
-        if not course:
-            raise ValueError("Course non trouvée")
+        results = self._bulkTransition(
+            db, course_ids, CourseStatus.VALIDEE,
+            {"chauffeur_id": uuid.UUID(user_connected["id"])},
+        )
+        confirmed = [r for r in results.values() if isinstance(r, Course)]
+        CourseEvents.emitMany(db, CourseEvents.CONFIRMED, confirmed)
+        self.outboxRepository.add(db, CourseEvents.CONFIRMED, confirmed)
 
-        # Vérifier que la course est bien à l'état "validée"
-        if course.status != CourseStatus.VALIDEE:
-            raise ValueError("Seules les courses validées peuvent être démarrées")
+        db.commit()
+        Database.record_write(user_connected["id"])
+        return results
 
-        # Vérifier que l'utilisateur est bien le chauffeur assigné à cette course
-        if str(course.chauffeur_id) != user_connected.get("id"):
-            raise ValueError("Vous ne pouvez démarrer que les courses qui vous sont assignées")
+    @Database.with_session
+    def cancelCourses(self, course_ids: list[uuid.UUID], user_connected: dict, db=None) -> dict:
+        # Vérifier que l'utilisateur est bien un customer
+        user_roles = (user_connected or {}).get("roles", [])
+        if "customer" not in user_roles:
+            raise ValueError("Seuls les customers peuvent annuler une course")
 
-        # Mettre à jour la course
-        course.status = CourseStatus.EN_COURS
-        course.date_heure_depart = datetime.utcnow()
-        course.updatedAt = datetime.utcnow()
+        results = self._bulkTransition(
+            db, course_ids, CourseStatus.ANNULEE, {},
+            owner_column=Course.client_id,
+            user_connected=user_connected,
+            owner_error="Vous ne pouvez annuler que vos propres courses",
+        )
+        cancelled = [r for r in results.values() if isinstance(r, Course)]
+        CourseEvents.emitMany(db, CourseEvents.CANCELLED, cancelled)
+        self.outboxRepository.add(db, CourseEvents.CANCELLED, cancelled)
+        self.courseStatsRepository.record(db, cancelled)
 
         db.commit()
-        db.refresh(course)
-        return course
+        Database.record_write(user_connected["id"])
+        return results
 
-    def _calculate_fare(self, start_time: datetime, end_time: datetime) -> float:
-        """
-        Calcule le tarif de manière bidon pour le POC.
-        Tarif de base: 5€ + 2€ par minute de course
-        """
-        # S'assurer que les deux datetime ont la même timezone (UTC)
-        if start_time.tzinfo is not None and end_time.tzinfo is not None:
-            # Les deux ont une timezone, on peut les soustraire directement
-            duration = end_time - start_time
-        else:
-            # Au moins un des deux n'a pas de timezone, on les convertit en UTC
-            if start_time.tzinfo is None:
-                start_time = start_time.replace(tzinfo=timezone.utc)
-            if end_time.tzinfo is None:
-                end_time = end_time.replace(tzinfo=timezone.utc)
-            duration = end_time - start_time
-
-        duration_minutes = duration.total_seconds() / 60
-
-        base_fare = 5.0  # 5€ de prise en charge
-        rate_per_minute = 2.0  # 2€ par minute
+    @Database.with_session
+    def startCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
+        # Vérifier que l'utilisateur est bien un driver
+        user_roles = (user_connected or {}).get("roles", [])
+        if "driver" not in user_roles:
+            raise ValueError("Seuls les drivers peuvent démarrer une course")
 
-        total_fare = base_fare + (rate_per_minute * duration_minutes)
+        # Démarrer la course si elle est "validée" et assignée à ce chauffeur
+        course = self._transition(
+            db, course_id, CourseStatus.EN_COURS,
+            {"date_heure_depart": datetime.utcnow()},
+            owner_column=Course.chauffeur_id,
+            user_connected=user_connected,
+            owner_error="Vous ne pouvez démarrer que les courses qui vous sont assignées",
+        )
+        self.outboxRepository.add(db, CourseEvents.STARTED, [course])
+        self.idempotencyRepository.record(db, course)
 
-        # Arrondir à 2 décimales
-        return round(total_fare, 2)
+        db.commit()
+        Database.record_write(user_connected["id"])
+        return course
 
     @Database.with_session
     def endCourse(self, course_id: uuid.UUID, user_connected: dict, db=None) -> Course:
@@ -149,45 +383,107 @@ class CourseRepository:
         if "driver" not in user_roles:
             raise ValueError("Seuls les drivers peuvent terminer une course")
 
-        # Récupérer la course
-        course = self.getCourseById(course_id, db=db)
-        if not course:
-            raise ValueError("Course non trouvée")
-
-        # Vérifier que la course est bien à l'état "en cours"
-        if course.status != CourseStatus.EN_COURS:
-            raise ValueError("Seules les courses en cours peuvent être terminées")
-
-        # Vérifier que l'utilisateur est bien le chauffeur assigné à cette course
-        if str(course.chauffeur_id) != user_connected.get("id"):
-            raise ValueError("Vous ne pouvez terminer que les courses qui vous sont assignées")
+        # Tarif calculé avant la transition et écrit par le même UPDATE que le statut: le départ
+        # et les coordonnées ne changent plus une fois la course démarrée (grille en vigueur
+        # au départ: durée, distance, plage horaire)
+        arrival = datetime.utcnow()
+        values = {"date_heure_arrivee": arrival}
+        ride = db.execute(
+            select(
+                Course.date_heure_depart,
+                Course.depart_lat,
+                Course.depart_lon,
+                Course.arrivee_lat,
+                Course.arrivee_lon,
+            ).where(Course.id == course_id)
+        ).one_or_none()
+        if ride is not None and ride.date_heure_depart is not None:
+            values["tarif"] = FareEngine.default().priceCourse(SimpleNamespace(**ride._asdict(), date_heure_arrivee=arrival))
+
+        # Terminer la course si elle est "en cours" et assignée à ce chauffeur
+        course = self._transition(
+            db, course_id, CourseStatus.TERMINEE,
+            values,
+            owner_column=Course.chauffeur_id,
+            user_connected=user_connected,
+            owner_error="Vous ne pouvez terminer que les courses qui vous sont assignées",
+        )
 
-        # Vérifier que la date de départ est renseignée
-        if not course.date_heure_depart:
+        # Départ absent à la lecture: rien à facturer (la transaction n'est pas encore validée)
+        if "tarif" not in values:
+            db.rollback()
             raise ValueError("La course n'a pas de date de départ")
 
-        # Mettre à jour la course
-        course.status = CourseStatus.TERMINEE
-        course.date_heure_arrivee = datetime.utcnow()
-        course.updatedAt = datetime.utcnow()
-
-        # Calculer le tarif en fonction de la durée (méthode bidon pour POC)
-        course.tarif = self._calculate_fare(course.date_heure_depart, course.date_heure_arrivee)
+        self.outboxRepository.add(db, CourseEvents.ENDED, [course])
+        self.courseStatsRepository.record(db, [course])
+        self.idempotencyRepository.record(db, course)
 
         db.commit()
-        db.refresh(course)
+        Database.record_write(user_connected["id"])
         return course
 
-    @Database.with_session
-    def getCoursesByClientId(self, client_id: uuid.UUID, db=None) -> list[Course]:
-        return db.query(Course).filter(Course.client_id == client_id).order_by(Course.updatedAt.desc()).all()
+    def _keysetPage(self, query, limit: Optional[int], cursor: Optional[str]) -> list:
+        """
+        Pagination keyset: tri (updatedAt, id) décroissant et reprise strictement
+        après le curseur, ce qui suit les index composites sans OFFSET ni tri complet.
+        """
+        if cursor:
+            updated_at, course_id = Pagination.decodeCursor(cursor)
+            query = query.filter(tuple_(Course.updatedAt, Course.id) < (updated_at, course_id))
+        query = query.order_by(Course.updatedAt.desc(), Course.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def _withArchive(self, db, rows: list, archive_owner_column, owner_id: uuid.UUID, limit: Optional[int], cursor: Optional[str]) -> list:
+        """
+        Complète une page de course avec l'historique archivé: les deux pages keyset (même curseur)
+        sont fusionnées sur (updatedAt, id) décroissant, le curseur suivant reste donc valable.
+        """
+        archived = self.courseArchiveRepository.getPage(db, archive_owner_column, owner_id, limit, cursor)
+        if not archived:
+            return rows
+        merged = heapq.merge(rows, archived, key=lambda row: (row.updatedAt, row.id), reverse=True)
+        return list(itertools.islice(merged, limit))
+
+    @Database.with_read_session
+    def getCoursesByClientId(self, client_id: uuid.UUID, limit: Optional[int] = None, cursor: Optional[str] = None, db=None) -> list:
+        rows = self._keysetPage(db.query(*COURSE_OUT_COLUMNS).filter(Course.client_id == client_id), limit, cursor)
+        return self._withArchive(db, rows, CourseArchive.client_id, client_id, limit, cursor)
+
+    @Database.with_read_session
+    def getCoursesByChauffeurId(self, chauffeur_id: uuid.UUID, limit: Optional[int] = None, cursor: Optional[str] = None, db=None) -> list:
+        rows = self._keysetPage(db.query(*COURSE_OUT_COLUMNS).filter(Course.chauffeur_id == chauffeur_id), limit, cursor)
+        return self._withArchive(db, rows, CourseArchive.chauffeur_id, chauffeur_id, limit, cursor)
+
+    @Database.with_read_session
+    def getMyCourses(self, user_connected: dict, limit: Optional[int] = None, cursor: Optional[str] = None, db=None) -> list:
+        user_id = user_connected.get("id")
+        user_roles = user_connected.get("roles", [])
 
-    @Database.with_session
-    def getCoursesByChauffeurId(self, chauffeur_id: uuid.UUID, db=None) -> list[Course]:
-        return db.query(Course).filter(Course.chauffeur_id == chauffeur_id).order_by(Course.updatedAt.desc()).all()
+        if not user_id:
+            raise ValueError("Utilisateur non identifié")
 
-    @Database.with_session
-    def getMyCourses(self, user_connected: dict, db=None) -> list[Course]:
+        user_uuid = uuid.UUID(user_id)
+
+        if "customer" in user_roles:
+            return self.getCoursesByClientId(user_uuid, limit, cursor, db=db)
+
+        if "driver" in user_roles:
+            return self.getCoursesByChauffeurId(user_uuid, limit, cursor, db=db)
+
+        # Si l'utilisateur n'a aucun rôle pertinent
+        else:
+            raise ValueError("L'utilisateur doit avoir au moins un rôle customer ou driver")
+
+    def getMyExportQuery(
+        self,
+        user_connected: dict,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        statuses: Optional[list[CourseStatus]] = None,
+    ):
+        """Requête d'export de l'historique de l'utilisateur (client ou chauffeur), archive comprise."""
         user_id = user_connected.get("id")
         user_roles = user_connected.get("roles", [])
 
@@ -197,23 +493,169 @@ class CourseRepository:
         user_uuid = uuid.UUID(user_id)
 
         if "customer" in user_roles:
-            return self.getCoursesByClientId(user_uuid, db=db)
+            return self.getExportQuery(client_id=user_uuid, since=since, until=until, statuses=statuses)
 
         if "driver" in user_roles:
-            return self.getCoursesByChauffeurId(user_uuid, db=db)
+            return self.getExportQuery(chauffeur_id=user_uuid, since=since, until=until, statuses=statuses)
+
+        raise ValueError("L'utilisateur doit avoir au moins un rôle customer ou driver")
+
+    def getExportQuery(
+        self,
+        client_id: Optional[uuid.UUID] = None,
+        chauffeur_id: Optional[uuid.UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        statuses: Optional[list[CourseStatus]] = None,
+    ):
+        """
+        Courses de course et course_archive (tuples COURSE_OUT_COLUMNS), filtrées sur le client, le chauffeur,
+        updatedAt dans [since, until[ et le statut, triées par (updatedAt, id) décroissant comme GET /course/my.
+        Le tri éventuel reste côté base: les index (propriétaire, updatedAt, id) des deux tables permettent
+        à Postgres de fusionner les deux parcours ordonnés (Merge Append).
+        """
+        if since is not None and until is not None and since >= until:
+            raise ValueError("La date de début doit précéder la date de fin")
+
+        parts = []
+        for model, columns in ((Course, COURSE_OUT_COLUMNS), (CourseArchive, ARCHIVE_OUT_COLUMNS)):
+            query = select(*columns)
+            if client_id is not None:
+                query = query.where(model.client_id == client_id)
+            if chauffeur_id is not None:
+                query = query.where(model.chauffeur_id == chauffeur_id)
+            if since is not None:
+                query = query.where(model.updatedAt >= since)
+            if until is not None:
+                query = query.where(model.updatedAt < until)
+            if statuses:
+                query = query.where(model.status.in_(statuses))
+            parts.append(query)
+
+        courses = union_all(*parts).subquery()
+        return select(courses).order_by(courses.c.updatedAt.desc(), courses.c.id.desc())
+
+    def streamExport(self, query, db) -> Iterator[list]:
+        """
+        Lignes d'une requête d'export par blocs de EXPORT_CHUNK_SIZE, lues par un curseur côté serveur
+        (yield_per): la mémoire ne dépend pas de la taille de l'historique.
+        La session (Database.stream_session) reste ouverte pendant toute la lecture.
+        """
+        result = db.execute(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        yield from result.partitions()
 
-        # Si l'utilisateur n'a aucun rôle pertinent
+    @Database.with_read_session
+    def getMyCoursesVersion(self, user_connected: dict, db=None) -> str:
+        """
+        Version des courses de l'utilisateur (nombre et dernier updatedAt, archive comprise, époque de lecture):
+        change à chaque création / transition et à chaque correction en masse (bumpReadEpoch),
+        calculée sur les index composites sans lire les lignes.
+        """
+        user_id = user_connected.get("id")
+        user_roles = user_connected.get("roles", [])
+
+        if not user_id:
+            raise ValueError("Utilisateur non identifié")
+
+        user_uuid = uuid.UUID(user_id)
+
+        if "customer" in user_roles:
+            column, archive_column = Course.client_id, CourseArchive.client_id
+        elif "driver" in user_roles:
+            column, archive_column = Course.chauffeur_id, CourseArchive.chauffeur_id
         else:
             raise ValueError("L'utilisateur doit avoir au moins un rôle customer ou driver")
 
-    @Database.with_session
-    def getPendingCourses(self, user_connected: dict, db=None) -> list[Course]:
+        # Époque lue dans la même requête: corrections en masse qui ne changent pas updatedAt (tarifs)
+        epoch = select(CourseReadEpoch.epoch).where(CourseReadEpoch.name == COURSES_EPOCH).scalar_subquery()
+        count, last, readEpoch = db.query(func.count(), func.max(Course.updatedAt), epoch).filter(column == user_uuid).one()
+        archived, lastArchived = db.query(func.count(), func.max(CourseArchive.updatedAt)).filter(archive_column == user_uuid).one()
+        return f"{count}:{last}:{archived}:{lastArchived}:{readEpoch}"
+
+    def bumpReadEpoch(self, db) -> None:
+        """
+        Change la version de GET /course/my de tous les utilisateurs (ETag, responseCache) après une
+        modification qui garde updatedAt. Dans la transaction de l'appelant: visible avec la modification.
+        """
+        bumped = db.execute(
+            update(CourseReadEpoch).where(CourseReadEpoch.name == COURSES_EPOCH).values(epoch=CourseReadEpoch.epoch + 1),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        if not bumped:
+            db.execute(insert(CourseReadEpoch).values(name=COURSES_EPOCH, epoch=1))
+
+    @Database.with_read_session
+    def getPendingCoursesVersion(self, user_connected: dict, db=None) -> str:
+        """Version de l'ensemble des courses en attente (index en mémoire, ou nombre et dernier updatedAt en base)."""
+        user_roles = (user_connected or {}).get("roles", [])
+        if "driver" not in user_roles:
+            raise ValueError("Seuls les drivers peuvent consulter les courses en attente")
+
+        if pendingCourseIndex.started:
+            self._ensurePendingIndex(db)
+            return f"index:{pendingCourseIndex.version()}"
+
+        count, last = db.query(func.count(), func.max(Course.updatedAt)).filter(Course.status == CourseStatus.DEMANDEE).one()
+        return f"{count}:{last}"
+
+    @Database.with_read_session
+    def getPendingCourses(self, user_connected: dict, limit: Optional[int] = None, cursor: Optional[str] = None, db=None) -> list:
         # Vérifier que l'utilisateur est bien un driver
         user_roles = (user_connected or {}).get("roles", [])
         if "driver" not in user_roles:
             raise ValueError("Seuls les drivers peuvent consulter les courses en attente")
 
-        # Récupérer toutes les courses avec le statut "demandée"
-        return db.query(Course).filter(
-            Course.status == CourseStatus.DEMANDEE
-        ).order_by(Course.updatedAt.desc()).all()
+        # Servies depuis l'index en mémoire lorsqu'il est actif (CourseOut, sans accès à la base)
+        if pendingCourseIndex.started:
+            self._ensurePendingIndex(db)
+            return pendingCourseIndex.page(limit, cursor)
+
+        # Récupérer les courses avec le statut "demandée", page par page
+        return self._keysetPage(db.query(*COURSE_OUT_COLUMNS).filter(Course.status == CourseStatus.DEMANDEE), limit, cursor)
+
+    @Database.with_read_session
+    def getNearestPendingCourses(
+        self, user_connected: dict, lat: float, lon: float, radius_km: float, limit: int, db=None
+    ) -> list[tuple]:
+        """
+        Les `limit` courses en attente les plus proches de (lat, lon) dans un rayon de radius_km,
+        triées par distance: liste de couples (course, distance_km).
+        """
+        user_roles = (user_connected or {}).get("roles", [])
+        if "driver" not in user_roles:
+            raise ValueError("Seuls les drivers peuvent consulter les courses en attente")
+
+        if pendingCourseIndex.started:
+            self._ensurePendingIndex(db)
+            return pendingCourseIndex.nearest(lat, lon, radius_km, limit)
+
+        # Pré-filtre rectangulaire sur l'index (status, depart_lat, depart_lon), distance exacte ensuite
+        min_lat, max_lat, min_lon, max_lon = Geo.boundingBox(lat, lon, radius_km)
+        rows = db.query(*COURSE_OUT_COLUMNS).filter(
+            Course.status == CourseStatus.DEMANDEE,
+            Course.depart_lat.between(min_lat, max_lat),
+            Course.depart_lon.between(min_lon, max_lon),
+        )
+        candidates = []
+        for row in rows:
+            distance = Geo.distanceKm(lat, lon, row.depart_lat, row.depart_lon)
+            if distance <= radius_km:
+                candidates.append((round(distance, 3), row))
+        return [(row, distance) for distance, row in heapq.nsmallest(limit, candidates, key=lambda c: (c[0], c[1].id))]
+
+    def _ensurePendingIndex(self, db) -> None:
+        # Mode asyncio: index rechargé avant l'appel par AsyncCourseRepository, sans bloquer la boucle d'événements
+        if db.get_bind().dialect.is_async:
+            return
+        # L'index se recharge depuis le primaire: un réplica en retard perdrait des événements déjà rejoués
+        primary = None if db.info.get("replica") else db
+        pendingCourseIndex.ensureFresh(lambda: self.getAllPendingCourses(db=primary))
+
+    @Database.with_session
+    def getAllPendingCourses(self, db=None) -> list:
+        # Chargement complet (reconstruction de l'index des courses en attente)
+        return db.query(*COURSE_OUT_COLUMNS).filter(Course.status == CourseStatus.DEMANDEE).all()
+
+    @Database.with_session
+    def rebuildPendingIndex(self, db=None) -> None:
+        pendingCourseIndex.rebuild(lambda: self.getAllPendingCourses(db=db))
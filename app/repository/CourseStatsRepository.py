@@ -0,0 +1,244 @@
+import os
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Date, case, cast, delete, extract, func, literal, select, text, true, tuple_, union_all
+
+from app.models.Course import Course, CourseStatus
+from app.models.CourseArchive import CourseArchive
+from app.models.CourseDailyStats import NO_DRIVER, CourseDailyStats
+from app.service.Database import Database
+from app.service.Pagination import Pagination
+
+# Rôle des utilisateurs ops / finance: statistiques de tous les chauffeurs (un driver ne voit que les siennes)
+STATS_ADMIN_ROLE = os.getenv("STATS_ADMIN_ROLE", "admin")
+# Période maximale d'une lecture (jours) et période par défaut (jours précédant demain, aujourd'hui compris)
+STATS_MAX_DAYS = int(os.getenv("STATS_MAX_DAYS", 366))
+STATS_DEFAULT_DAYS = 30
+
+# Statuts agrégés: ceux dans lesquels une course termine son cycle de vie
+ROLLUP_STATUSES = (CourseStatus.TERMINEE, CourseStatus.ANNULEE)
+
+_SUMS = ("course_count", "revenue", "duration_seconds", "duration_count")
+
+
+def _utc_day(value: datetime) -> date:
+    # Sous SQLite les dates sont relues sans fuseau (écrites en UTC)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time())
+
+
+class CourseStatsRepository:
+    """
+    Agrégats journaliers des courses terminées / annulées (table course_daily_stats).
+
+    record() reçoit la Session de CourseRepository et s'exécute dans la transaction de la transition;
+    les lectures ne parcourent que les agrégats de la période, jamais la table course.
+    """
+
+    def record(self, db, courses: list) -> None:
+        """
+        Ajoute des courses terminées ou annulées aux agrégats de leur jour, dans la transaction en cours.
+        À appeler juste avant le commit: les lignes d'agrégat (dont celle, partagée, des annulations
+        du jour) ne restent verrouillées que le temps du commit.
+        """
+        rows: dict[tuple, dict] = {}
+        for course in courses:
+            chauffeur_id = course.chauffeur_id or NO_DRIVER
+            day = _utc_day(course.updatedAt)
+            row = rows.setdefault((day, str(chauffeur_id), course.status.value), {
+                "day": day, "chauffeur_id": chauffeur_id, "status": course.status,
+                "course_count": 0, "revenue": Decimal(0), "duration_seconds": 0.0, "duration_count": 0,
+            })
+            row["course_count"] += 1
+            if course.tarif is not None:
+                row["revenue"] += Decimal(str(course.tarif))
+            if course.date_heure_depart is not None and course.date_heure_arrivee is not None:
+                row["duration_seconds"] += (course.date_heure_arrivee - course.date_heure_depart).total_seconds()
+                row["duration_count"] += 1
+        if rows:
+            # Clés triées: deux transactions concurrentes verrouillent les lignes dans le même ordre
+            db.execute(self._upsert(db), [rows[key] for key in sorted(rows)])
+
+    @Database.with_read_session
+    def getDailyStats(self, user_connected: dict, since: Optional[date] = None, until: Optional[date] = None, db=None) -> list[dict]:
+        """Agrégats par jour (croissant) de [since, until[: tous les chauffeurs, ou ceux du driver connecté."""
+        chauffeur_id = self._scope(user_connected)
+        since, until = self._period(since, until)
+
+        stmt = (
+            select(CourseDailyStats.day, *self._aggregates())
+            .where(CourseDailyStats.day >= since, CourseDailyStats.day < until)
+            .group_by(CourseDailyStats.day)
+            .order_by(CourseDailyStats.day)
+        )
+        if chauffeur_id is not None:
+            stmt = stmt.where(CourseDailyStats.chauffeur_id == chauffeur_id)
+        return [self._toStats(row, row.day) for row in db.execute(stmt)]
+
+    @Database.with_read_session
+    def getDriverStats(
+        self,
+        user_connected: dict,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        chauffeur_id: Optional[uuid.UUID] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        db=None,
+    ) -> list[dict]:
+        """
+        Agrégats par chauffeur et par jour de [since, until[, triés par (jour, chauffeur) décroissant,
+        page par page (keyset sur la clé primaire de course_daily_stats).
+        """
+        chauffeur_id = self._scope(user_connected, chauffeur_id)
+        since, until = self._period(since, until)
+
+        stmt = (
+            select(CourseDailyStats.day, CourseDailyStats.chauffeur_id, *self._aggregates())
+            .where(
+                CourseDailyStats.day >= since,
+                CourseDailyStats.day < until,
+                CourseDailyStats.chauffeur_id != NO_DRIVER,
+            )
+            .group_by(CourseDailyStats.day, CourseDailyStats.chauffeur_id)
+            .order_by(CourseDailyStats.day.desc(), CourseDailyStats.chauffeur_id.desc())
+        )
+        if chauffeur_id is not None:
+            stmt = stmt.where(CourseDailyStats.chauffeur_id == chauffeur_id)
+        if cursor:
+            day, last_id = Pagination.decodeCursor(cursor)
+            stmt = stmt.where(tuple_(CourseDailyStats.day, CourseDailyStats.chauffeur_id) < (day.date(), last_id))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [self._toStats(row, row.day, row.chauffeur_id) for row in db.execute(stmt)]
+
+    def rebuild(self, db, since: Optional[date] = None, until: Optional[date] = None) -> int:
+        """
+        Recalcule depuis course et course_archive les agrégats des jours [since, until[ (tous par défaut).
+        Retourne le nombre de lignes d'agrégat écrites; le commit revient à l'appelant.
+
+        Sous Postgres, la table d'agrégats est verrouillée (SHARE ROW EXCLUSIVE) jusqu'au commit:
+        le recalcul attend les transitions qui ont déjà appelé record(), et celles qui arrivent ensuite
+        attendent le commit du recalcul avant d'ajouter leur course aux agrégats recalculés.
+        Sans ce verrou, une course validée entre le DELETE et l'INSERT ... SELECT serait comptée
+        deux fois (par record() et par le recalcul). Sous SQLite les écritures sont déjà sérialisées.
+        """
+        postgres = db.get_bind().dialect.name == "postgresql"
+        if postgres:
+            db.execute(text(f"LOCK TABLE {CourseDailyStats.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+        sources = []
+        for model in (Course, CourseArchive):
+            if postgres:
+                day = cast(func.timezone("UTC", model.updatedAt), Date)
+                duration = extract("epoch", model.date_heure_arrivee - model.date_heure_depart)
+            else:
+                day = func.date(model.updatedAt)
+                duration = (func.julianday(model.date_heure_arrivee) - func.julianday(model.date_heure_depart)) * 86400
+            source = select(
+                day.label("day"),
+                func.coalesce(model.chauffeur_id, literal(NO_DRIVER, CourseDailyStats.chauffeur_id.type)).label("chauffeur_id"),
+                model.status.label("status"),
+                model.tarif.label("tarif"),
+                duration.label("duration"),
+            ).where(model.status.in_(ROLLUP_STATUSES))
+            # Filtre sur updatedAt (index de course, partitions de course_archive), pas sur le jour calculé
+            if since is not None:
+                source = source.where(model.updatedAt >= _midnight(since))
+            if until is not None:
+                source = source.where(model.updatedAt < _midnight(until))
+            sources.append(source)
+
+        courses = union_all(*sources).subquery()
+        totals = (
+            select(
+                courses.c.day,
+                courses.c.chauffeur_id,
+                courses.c.status,
+                func.count(),
+                func.coalesce(func.sum(courses.c.tarif), 0),
+                func.coalesce(func.sum(courses.c.duration), 0),
+                func.count(courses.c.duration),
+            )
+            # WHERE explicite: sous SQLite, INSERT ... SELECT ... ON CONFLICT l'exige pour lever l'ambiguïté
+            .where(true())
+            .group_by(courses.c.day, courses.c.chauffeur_id, courses.c.status)
+        )
+
+        stale = delete(CourseDailyStats)
+        if since is not None:
+            stale = stale.where(CourseDailyStats.day >= since)
+        if until is not None:
+            stale = stale.where(CourseDailyStats.day < until)
+        db.execute(stale)
+        result = db.execute(self._upsert(db, ["day", "chauffeur_id", "status", *_SUMS], totals))
+        return result.rowcount
+
+    @staticmethod
+    def _upsert(db, columns: Optional[list[str]] = None, select_stmt=None):
+        """INSERT (ou INSERT ... SELECT) ... ON CONFLICT (jour, chauffeur, statut) DO UPDATE: ajoute aux sommes existantes."""
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(CourseDailyStats)
+        if select_stmt is not None:
+            stmt = stmt.from_select(columns, select_stmt)
+        return stmt.on_conflict_do_update(
+            index_elements=[CourseDailyStats.day, CourseDailyStats.chauffeur_id, CourseDailyStats.status],
+            set_={name: getattr(CourseDailyStats, name) + getattr(stmt.excluded, name) for name in _SUMS},
+        )
+
+    @staticmethod
+    def _aggregates() -> list:
+        # Un nombre de courses par statut agrégé (colonnes count_<i>, dans l'ordre de ROLLUP_STATUSES)
+        counts = [
+            func.sum(case((CourseDailyStats.status == status, CourseDailyStats.course_count), else_=0)).label(f"count_{i}")
+            for i, status in enumerate(ROLLUP_STATUSES)
+        ]
+        return counts + [
+            func.sum(CourseDailyStats.revenue).label("revenue"),
+            func.sum(CourseDailyStats.duration_seconds).label("duration_seconds"),
+            func.sum(CourseDailyStats.duration_count).label("duration_count"),
+        ]
+
+    @staticmethod
+    def _toStats(row, day: date, chauffeur_id: Optional[uuid.UUID] = None) -> dict:
+        return {
+            "day": day,
+            "chauffeur_id": chauffeur_id,
+            "counts": {status.value: int(getattr(row, f"count_{i}") or 0) for i, status in enumerate(ROLLUP_STATUSES)},
+            "revenue": float(row.revenue or 0),
+            "average_duration_seconds": row.duration_seconds / row.duration_count if row.duration_count else None,
+        }
+
+    @staticmethod
+    def _scope(user_connected: dict, chauffeur_id: Optional[uuid.UUID] = None) -> Optional[uuid.UUID]:
+        """Chauffeur dont l'utilisateur peut lire les statistiques (None: tous)."""
+        user_roles = (user_connected or {}).get("roles", [])
+        if STATS_ADMIN_ROLE in user_roles:
+            return chauffeur_id
+        if "driver" in user_roles:
+            own_id = uuid.UUID(user_connected["id"])
+            if chauffeur_id is not None and chauffeur_id != own_id:
+                raise ValueError("Vous ne pouvez consulter que vos propres statistiques")
+            return own_id
+        raise ValueError("Seuls les drivers et les administrateurs peuvent consulter les statistiques")
+
+    @staticmethod
+    def _period(since: Optional[date], until: Optional[date]) -> tuple[date, date]:
+        until = until or datetime.now(timezone.utc).date() + timedelta(days=1)
+        since = since or until - timedelta(days=STATS_DEFAULT_DAYS)
+        if since >= until:
+            raise ValueError("La date de début doit précéder la date de fin")
+        if (until - since).days > STATS_MAX_DAYS:
+            raise ValueError(f"Période limitée à {STATS_MAX_DAYS} jours")
+        return since, until
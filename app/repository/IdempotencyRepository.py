@@ -0,0 +1,131 @@
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models.IdempotencyKey import IdempotencyKey
+from app.out.CourseOut import CourseOut
+from app.service.Database import Database
+
+# Clé réservée par la requête en cours (user_id, key, leaseToken), posée par IdempotentUseCase
+current_idempotency_lease: ContextVar[Optional[tuple[str, str, str]]] = ContextVar("current_idempotency_lease", default=None)
+
+
+class IdempotencyLeaseLost(Exception):
+    """La réservation a été reprise par un autre essai (bail expiré): l'écriture doit être annulée."""
+
+
+class IdempotencyRepository:
+    @Database.with_session
+    def reserve(
+        self, user_id: str, key: str, fingerprint: str, ttl: float, lease: float, token: str, db=None,
+    ) -> Optional[IdempotencyKey]:
+        """
+        Réserve la clé pour une nouvelle requête (bail token jusqu'à now + lease) et retourne None,
+        ou retourne l'enregistrement existant encore valide (réponse à rejouer, ou requête toujours
+        en cours si response est NULL). Une réservation sans réponse dont le bail a expiré est reprise
+        par une requête identique: la requête d'origine n'a rien écrit (réponse et écriture vont ensemble).
+        """
+        now = datetime.now(timezone.utc)
+        existing = self._find(db, user_id, key, now)
+        if existing is not None:
+            if existing.response is not None or existing.fingerprint != fingerprint or not self._leaseExpired(existing, now):
+                return existing
+            taken = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.response.is_(None),
+                    or_(IdempotencyKey.leaseExpiresAt.is_(None), IdempotencyKey.leaseExpiresAt <= now),
+                )
+                .values(leaseToken=token, leaseExpiresAt=now + timedelta(seconds=lease)),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            db.commit()
+            # Reprise concurrente (ou réponse enregistrée entre-temps): l'enregistrement relu fait foi
+            return None if taken else self._find(db, user_id, key, now)
+
+        # Clé expirée éventuelle remplacée par la nouvelle réservation (jamais une réservation valide concurrente)
+        db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.expiresAt <= now)
+        )
+        db.add(IdempotencyKey(
+            user_id=user_id, key=key, fingerprint=fingerprint, expiresAt=now + timedelta(seconds=ttl),
+            leaseToken=token, leaseExpiresAt=now + timedelta(seconds=lease),
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Même clé réservée au même instant par une autre requête: c'est elle qui fait foi
+            db.rollback()
+            return self._find(db, user_id, key, now)
+        return None
+
+    def record(self, db, course) -> None:
+        """
+        Enregistre la réponse (CourseOut) de la requête idempotente en cours dans la transaction
+        de l'écriture, juste avant son commit: l'écriture et sa réponse sont validées ensemble.
+        Sans effet hors d'une requête avec Idempotency-Key. Si le bail a été repris par un autre essai,
+        la transaction est annulée et IdempotencyLeaseLost levée: l'écriture n'est faite qu'une fois.
+        """
+        lease = current_idempotency_lease.get()
+        if lease is None:
+            return
+        user_id, key, token = lease
+        stored = db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.leaseToken == token,
+                IdempotencyKey.response.is_(None),
+            )
+            .values(response=CourseOut.model_validate(course).model_dump_json(), leaseToken=None, leaseExpiresAt=None),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        if not stored:
+            db.rollback()
+            raise IdempotencyLeaseLost(f"Idempotency-Key {key} reprise par une autre requête")
+
+    @Database.with_session
+    def release(self, user_id: str, key: str, token: str, db=None) -> None:
+        # Échec de la requête: la clé est libérée pour qu'un nouvel essai puisse aboutir (si elle n'a pas été reprise)
+        db.execute(
+            delete(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.leaseToken == token,
+                IdempotencyKey.response.is_(None),
+            )
+        )
+        db.commit()
+
+    @Database.with_session
+    def purgeExpired(self, db=None) -> int:
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expiresAt <= datetime.now(timezone.utc)))
+        db.commit()
+        return result.rowcount
+
+    def _find(self, db, user_id: str, key: str, now: datetime) -> Optional[IdempotencyKey]:
+        return (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.expiresAt > now)
+            .populate_existing()
+            .first()
+        )
+
+    @staticmethod
+    def _leaseExpired(record: IdempotencyKey, now: datetime) -> bool:
+        # Réservations antérieures au bail (leaseExpiresAt NULL): considérées comme expirées
+        if record.leaseExpiresAt is None:
+            return True
+        expiresAt = record.leaseExpiresAt
+        if expiresAt.tzinfo is None:
+            # SQLite relit les dates sans fuseau (écrites en UTC)
+            expiresAt = expiresAt.replace(tzinfo=timezone.utc)
+        return expiresAt <= now
@@ -0,0 +1,66 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import aliased
+
+from app.models.CourseOutboxEvent import CourseOutboxEvent
+from app.out.CourseOut import CourseOut
+
+# OUTBOX_SINK: destination des événements (voir OutboxSinks.fromSpec); vide = outbox désactivée
+OUTBOX_SINK = os.getenv("OUTBOX_SINK", "")
+OUTBOX_ENABLED = bool(OUTBOX_SINK)
+
+class OutboxRepository:
+    """
+    Accès à l'outbox des événements de course. Les méthodes reçoivent la Session de l'appelant:
+    add() s'exécute dans la transaction de CourseRepository, les autres dans celle du dispatcher.
+    """
+
+    def add(self, db, eventType: str, courses: list) -> None:
+        """Ajoute un événement par course dans la transaction en cours (sans effet si l'outbox est désactivée)."""
+        if not OUTBOX_ENABLED or not courses:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "course_id": course.id,
+                "type": eventType,
+                "payload": CourseOut.model_validate(course).model_dump_json(),
+                "occurredAt": now,
+                "attempts": 0,
+                "nextAttemptAt": now,
+            }
+            for course in courses
+        ]
+        db.execute(insert(CourseOutboxEvent), rows)
+
+    def claimBatch(self, db, limit: int) -> list[CourseOutboxEvent]:
+        """
+        Événements prêts à publier, au plus un par course: seule la tête de file de chaque course
+        est éligible, ce qui garantit l'ordre par course même avec des reprises ou plusieurs instances.
+        Sous Postgres, les lignes sont verrouillées (SKIP LOCKED) jusqu'à la fin de la transaction.
+        """
+        earlier = aliased(CourseOutboxEvent)
+        stmt = (
+            select(CourseOutboxEvent)
+            .where(
+                CourseOutboxEvent.nextAttemptAt <= datetime.now(timezone.utc),
+                ~exists().where(earlier.course_id == CourseOutboxEvent.course_id, earlier.id < CourseOutboxEvent.id),
+            )
+            .order_by(CourseOutboxEvent.id)
+            .limit(limit)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = stmt.with_for_update(skip_locked=True)
+        return list(db.scalars(stmt))
+
+    def markPublished(self, db, events: list[CourseOutboxEvent]) -> None:
+        db.execute(delete(CourseOutboxEvent).where(CourseOutboxEvent.id.in_([e.id for e in events])))
+
+    def markFailed(self, db, events: list[CourseOutboxEvent], error: str, baseDelay: float, maxDelay: float) -> None:
+        now = datetime.now(timezone.utc)
+        for e in events:
+            e.attempts += 1
+            e.nextAttemptAt = now + timedelta(seconds=min(maxDelay, baseDelay * 2 ** (e.attempts - 1)))
+            e.lastError = error[:1000]
@@ -0,0 +1,63 @@
+"""
+Archivage des courses terminées / annulées.
+
+Exécution:
+    python -m app.scripts.archive_courses --older-than-days 90 --batch-size 1000
+
+Le script:
+- déplace par lots les courses TERMINEE / ANNULEE dont updatedAt est antérieur au seuil
+  de la table course vers course_archive (partition mensuelle sous Postgres),
+- valide chaque lot séparément: le job peut être interrompu puis relancé sans perte ni doublon,
+- s'arrête quand il ne reste plus rien à archiver (ou après --max-batches lots).
+
+GET /course/my continue de paginer dans l'historique archivé.
+"""
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.repository.CourseArchiveRepository import CourseArchiveRepository
+from app.service.Logging import Logging
+
+logger = logging.getLogger(__name__)
+
+# Âge minimal (jours) d'une course terminale avant archivage
+COURSE_ARCHIVE_AFTER_DAYS = float(os.getenv("COURSE_ARCHIVE_AFTER_DAYS", 90))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.scripts.archive_courses", description="Archivage des courses terminales")
+    parser.add_argument("--older-than-days", type=float, default=COURSE_ARCHIVE_AFTER_DAYS, help="Âge minimal (updatedAt) des courses archivées")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Courses déplacées par transaction")
+    parser.add_argument("--max-batches", type=int, default=None, help="Nombre maximal de lots (défaut: jusqu'à épuisement)")
+    parser.add_argument("--pause", type=float, default=0.0, help="Pause (secondes) entre deux lots, pour ménager la base")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    Logging.configure()
+
+    # updatedAt est écrit en UTC naïf (datetime.utcnow): seuil dans la même convention
+    olderThan = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=args.older_than_days)
+    repository = CourseArchiveRepository()
+    total = 0
+    batches = 0
+    while args.max_batches is None or batches < args.max_batches:
+        moved = repository.archiveBatch(olderThan, args.batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        logger.info("Lot %d: %d courses archivées (%d au total)", batches, moved, total)
+        if args.pause:
+            time.sleep(args.pause)
+
+    print(f"{total} course(s) archivée(s) antérieures au {olderThan:%Y-%m-%d %H:%M} UTC.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
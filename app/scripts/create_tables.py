@@ -9,13 +9,20 @@ ou:
 Le script:
 - charge les variables d'environnement (via app.service.database),
 - importe dynamiquement tous les modèles sous app.models,
-- appelle Base.metadata.create_all(bind=engine).
+- appelle Base.metadata.create_all(bind=Database.get_engine()),
+- ajoute les colonnes nullables manquantes aux tables déjà existantes,
+- crée les index manquants sur les tables déjà existantes,
+- sous Postgres, crée les partitions mensuelles de course_archive jusqu'au mois courant.
 """
 import importlib
 import pkgutil
+from datetime import datetime, timezone
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.orm import Session
 
 import app.models as models_pkg
-from app.service.Database import Base, engine
+from app.service.Database import Base, Database
 
 
 def import_all_models() -> None:
@@ -28,11 +35,70 @@ def import_all_models() -> None:
         importlib.import_module(name)
 
 
+def add_missing_columns() -> None:
+    """
+    create_all ne modifie pas une table existante: les nouvelles colonnes
+    nullables des modèles (ex: coordonnées GPS) sont ajoutées par ALTER TABLE.
+    """
+    engine = Database.get_engine()
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                preparer = engine.dialect.identifier_preparer
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+                ))
+
+
+def create_missing_indexes() -> None:
+    """
+    create_all ne crée les index qu'avec une nouvelle table:
+    on les ajoute aussi aux tables existantes (checkfirst => idempotent).
+    """
+    engine = Database.get_engine()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def create_archive_partitions() -> None:
+    """
+    Partitions mensuelles de course_archive, de la plus ancienne course archivable au mois courant
+    (le job d'archivage crée aussi à la volée celles qui manqueraient).
+    """
+    from app.models.Course import Course
+    from app.repository.CourseArchiveRepository import TERMINAL_STATUSES, CourseArchiveRepository, _month_start, _next_month
+
+    with Session(Database.get_engine()) as db:
+        repository = CourseArchiveRepository()
+        if not repository.isPartitioned(db):
+            return
+        oldest = db.scalar(select(func.min(Course.updatedAt)).where(Course.status.in_(TERMINAL_STATUSES)))
+        current = _month_start(datetime.now(timezone.utc))
+        month = _month_start(oldest) if oldest is not None else current
+        months = []
+        while month <= current:
+            months.append(month)
+            month = _next_month(month)
+        repository.ensurePartitions(db, months)
+        db.commit()
+
+
 def main() -> None:
     # S'assurer que toutes les tables des modèles sont enregistrées
     import_all_models()
     # Création idempotente des tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=Database.get_engine())
+    add_missing_columns()
+    create_missing_indexes()
+    create_archive_partitions()
     print("Tables créées (si absentes).")
 
 
@@ -0,0 +1,66 @@
+"""
+Export en flux de l'historique des courses (NDJSON ou CSV).
+
+Exécution:
+    python -m app.scripts.export_courses --client-id <uuid> --output courses.ndjson
+    python -m app.scripts.export_courses --chauffeur-id <uuid> --format csv --since 2025-01-01 --status Terminée
+
+Le script:
+- exporte les courses de course et course_archive d'un client, d'un chauffeur (ou de tous),
+  filtrées sur la dernière modification (--since inclus, --until exclu, UTC) et le statut (--status, répétable),
+  triées par date de modification décroissante,
+- lit par blocs (EXPORT_CHUNK_SIZE) avec un curseur côté serveur: la mémoire reste constante
+  quelle que soit la taille de l'historique,
+- écrit sur la sortie standard (ou --output) le même contenu que GET /course/export.
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from app.models.Course import CourseStatus
+from app.repository.CourseRepository import CourseRepository
+from app.service.CourseSerializer import CourseSerializer
+from app.service.Database import Database
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.scripts.export_courses", description="Export de l'historique des courses")
+    parser.add_argument("--client-id", type=uuid.UUID, help="Courses de ce client")
+    parser.add_argument("--chauffeur-id", type=uuid.UUID, help="Courses de ce chauffeur")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Modifiées à partir de (UTC, inclus)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Modifiées avant (UTC, exclu)")
+    parser.add_argument("--status", type=CourseStatus, action="append", help="Statut exporté (répétable, défaut: tous)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="Format de sortie")
+    parser.add_argument("--output", help="Fichier de sortie (défaut: sortie standard)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    repository = CourseRepository()
+    query = repository.getExportQuery(
+        client_id=args.client_id, chauffeur_id=args.chauffeur_id, since=args.since, until=args.until, statuses=args.status,
+    )
+
+    start = time.perf_counter()
+    total = 0
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        if args.format == "csv":
+            output.write(CourseSerializer.dumpCsv([], header=True))
+        with Database.stream_session() as db:
+            for rows in repository.streamExport(query, db):
+                output.write(CourseSerializer.dumpCsv(rows) if args.format == "csv" else CourseSerializer.dumpNdjson(rows))
+                total += len(rows)
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"{total} course(s) exportée(s) en {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Reconstruction des agrégats de courses (table course_daily_stats).
+
+Exécution:
+    python -m app.scripts.rebuild_course_stats
+    python -m app.scripts.rebuild_course_stats --since 2025-01-01 --until 2025-02-01
+
+Le script:
+- recalcule depuis course et course_archive les agrégats des jours [--since, --until[ (UTC),
+  ou de tout l'historique par défaut: à lancer après la création de la table, une reprise
+  de données ou une correction manuelle des courses,
+- remplace les agrégats de la période dans une seule transaction: les tableaux de bord lisent
+  les anciens agrégats jusqu'au commit,
+- peut tourner pendant que l'application termine et annule des courses: sous Postgres, la table
+  d'agrégats est verrouillée jusqu'au commit et ces transitions attendent la fin du recalcul.
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from app.service.Database import Database
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.scripts.rebuild_course_stats", description="Reconstruction des agrégats de courses")
+    parser.add_argument("--since", type=date.fromisoformat, help="Premier jour recalculé (UTC, inclus)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Dernier jour recalculé (UTC, exclu)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    start = time.perf_counter()
+    with Database.session() as db:
+        rows = CourseStatsRepository().rebuild(db, args.since, args.until)
+        db.commit()
+
+    since = args.since or "l'origine"
+    until = args.until or "aujourd'hui"
+    print(f"{rows} agrégat(s) recalculé(s) de {since} à {until} en {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Recalcul des tarifs des courses terminées avec les grilles tarifaires (FareEngine).
+
+Exécution:
+    python -m app.scripts.reprice_courses --since 2025-01-01 --until 2025-01-02
+    python -m app.scripts.reprice_courses --table archive --tariffs tarifs-2025.yaml --apply
+
+Le script:
+- lit par blocs (--chunk-size) les courses terminées de la table course (ou course_archive),
+  éventuellement filtrées sur la date d'arrivée (--since inclus, --until exclu),
+- recalcule les tarifs de chaque bloc avec FareEngine.priceBatch (tableaux NumPy, sans boucle par course),
+- affiche le nombre de tarifs différents et l'écart total (rapprochement),
+- avec --apply, enregistre les nouveaux tarifs (updatedAt inchangé: ni la pagination ni les partitions ne bougent)
+  en changeant, dans la transaction de chaque bloc, l'époque de lecture des courses (ETag de GET /course/my),
+  puis recalcule le chiffre d'affaires des agrégats de courses (course_daily_stats) de la période.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import bindparam, func, select, update
+
+from app.models.Course import Course, CourseStatus
+from app.models.CourseArchive import CourseArchive
+from app.repository.CourseRepository import CourseRepository
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from app.service.Database import Database
+from app.service.FareEngine import FareEngine
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.scripts.reprice_courses", description="Recalcul des tarifs des courses terminées")
+    parser.add_argument("--table", choices=["course", "archive"], default="course", help="Table à recalculer")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Arrivée à partir de (UTC, inclus)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Arrivée avant (UTC, exclu)")
+    parser.add_argument("--tariffs", help="Fichier de grilles tarifaires (défaut: TARIFF_PLANS_PATH)")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Courses lues et recalculées par bloc")
+    parser.add_argument("--apply", action="store_true", help="Enregistre les tarifs recalculés (sinon simple rapport)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    engine = FareEngine.fromFile(args.tariffs) if args.tariffs else FareEngine.default()
+    model = CourseArchive if args.table == "archive" else Course
+
+    with Database.session() as db:
+        # Dates lues en UTC sans fuseau: converties en datetime64 par NumPy, sans boucle Python
+        utc = (lambda column: func.timezone("UTC", column)) if db.get_bind().dialect.name == "postgresql" else (lambda column: column)
+        stmt = (
+            select(
+                model.id, utc(model.date_heure_depart), utc(model.date_heure_arrivee),
+                model.depart_lat, model.depart_lon, model.arrivee_lat, model.arrivee_lon, model.tarif,
+            )
+            .where(
+                model.status == CourseStatus.TERMINEE,
+                model.date_heure_depart.is_not(None),
+                model.date_heure_arrivee.is_not(None),
+            )
+            .order_by(model.id)
+        )
+        if args.since:
+            stmt = stmt.where(model.date_heure_arrivee >= args.since)
+        if args.until:
+            stmt = stmt.where(model.date_heure_arrivee < args.until)
+
+        changes = update(model).where(model.id == bindparam("b_id")).values(
+            tarif=bindparam("b_tarif"), updatedAt=model.updatedAt,
+        )
+
+        start = time.perf_counter()
+        total = changed = 0
+        delta = 0.0
+        lastId = None
+        while True:
+            # Blocs successifs sur la clé primaire: chaque bloc est une requête courte, reprise après le dernier id
+            chunk = stmt if lastId is None else stmt.where(model.id > lastId)
+            rows = db.execute(chunk.limit(args.chunk_size)).all()
+            if not rows:
+                break
+            ids, starts, ends, departLat, departLon, arriveeLat, arriveeLon, tarifs = zip(*rows)
+            lastId = ids[-1]
+
+            fares = engine.priceBatch(
+                np.array(starts, dtype="datetime64[us]"),
+                np.array(ends, dtype="datetime64[us]"),
+                FareEngine.distancesKm(
+                    np.array(departLat, dtype=np.float64), np.array(departLon, dtype=np.float64),
+                    np.array(arriveeLat, dtype=np.float64), np.array(arriveeLon, dtype=np.float64),
+                ),
+            )
+            current = np.array(tarifs, dtype=np.float64)
+            diff = np.isnan(current) | (np.rint(current * 100) != np.rint(fares * 100))
+            total += len(ids)
+            changed += int(diff.sum())
+            delta += float(np.sum(fares[diff] - np.nan_to_num(current[diff])))
+
+            if args.apply and diff.any():
+                db.connection().execute(changes, [
+                    {"b_id": ids[i], "b_tarif": Decimal(f"{fares[i]:.2f}")} for i in np.flatnonzero(diff)
+                ])
+                # updatedAt gardé: sans nouvelle époque, les clients revalideraient (304) les anciens tarifs
+                CourseRepository().bumpReadEpoch(db)
+            db.commit()
+
+        if args.apply and changed:
+            # Agrégats classés par jour de fin (updatedAt), à quelques microsecondes de l'arrivée: un jour de marge
+            since = args.since.date() - timedelta(days=1) if args.since else None
+            until = args.until.date() + timedelta(days=1) if args.until else None
+            CourseStatsRepository().rebuild(db, since, until)
+            db.commit()
+
+    elapsed = time.perf_counter() - start
+    action = "mis à jour" if args.apply else "à mettre à jour"
+    print(f"{total} course(s) recalculée(s) en {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s)")
+    print(f"{changed} tarif(s) {action}, écart total {delta:+.2f} €")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Lanceur de production: plusieurs workers uvicorn (uvloop + httptools) derrière un même socket.
+
+Exécution:
+    python -m app.server
+
+Le lanceur:
+- importe l'application et charge sa configuration (clé publique, grilles tarifaires) une seule
+  fois dans le processus maître (erreurs de configuration détectées avant de démarrer les workers,
+  code et clé partagés en copy-on-write),
+- ouvre le socket d'écoute puis fork() WEB_CONCURRENCY workers (défaut: nombre de cœurs
+  disponibles pour le conteneur); chaque worker recrée ses pools de connexions,
+- relance un worker qui s'arrête de façon inattendue,
+- sur SIGTERM / SIGINT, relaie le signal aux workers: ils cessent d'accepter des connexions,
+  terminent les requêtes en cours (transitions comprises) pendant au plus
+  GRACEFUL_TIMEOUT_SECONDS, exécutent le shutdown du lifespan puis s'arrêtent.
+"""
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time
+
+import uvicorn
+
+from app.service.Logging import Logging
+
+logger = logging.getLogger(__name__)
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", 5000))
+GRACEFUL_TIMEOUT_SECONDS = float(os.getenv("GRACEFUL_TIMEOUT_SECONDS", 30))
+KEEP_ALIVE_SECONDS = int(os.getenv("KEEP_ALIVE_SECONDS", 5))
+
+
+def cpu_count() -> int:
+    """Cœurs utilisables: affinité CPU du processus, bornée par le quota cgroup v2 du conteneur."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            count = min(count, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 0)) or cpu_count()
+
+
+class Server:
+    """Processus maître: fork des workers, supervision et arrêt gracieux."""
+
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        self.children: dict[int, float] = {}
+        self.stopping = False
+        self.sock = None
+
+    def run(self) -> int:
+        self.sock = sock = self.config.bind_socket()
+        logger.info("Démarrage de %d workers sur %s:%d", self.workers, self.config.host, self.config.port)
+
+        signal.signal(signal.SIGTERM, self._handleExit)
+        signal.signal(signal.SIGINT, self._handleExit)
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            startedAt = self.children.pop(pid, None)
+            if startedAt is None or self.stopping:
+                continue
+            logger.warning("Worker %d arrêté (statut %d), relance", pid, os.waitstatus_to_exitcode(status))
+            # Un worker qui tombe dès son démarrage (configuration, base absente) ne doit pas boucler à vide
+            if time.monotonic() - startedAt < 1.0:
+                time.sleep(1.0)
+                # SIGTERM / SIGINT reçu pendant l'attente: pas de relance, l'arrêt est en cours
+                if self.stopping:
+                    continue
+            self._spawn(sock)
+
+        logger.info("Arrêt terminé")
+        return 0
+
+    def _spawn(self, sock) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+
+        # Worker: signaux rendus à uvicorn, pools de connexions propres au processus
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            from app.service.Database import Database
+
+            Database.reset_after_fork()
+            uvicorn.Server(self.config).run(sockets=[sock])
+        except BaseException:
+            logger.exception("Worker %d arrêté sur erreur", os.getpid())
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+
+    def _handleExit(self, signum, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info("Signal %s reçu, arrêt gracieux des workers", signal.Signals(signum).name)
+        # Le maître n'accepte jamais de connexion: sa copie du socket ne doit pas garder
+        # la file d'attente ouverte une fois que les workers ont fermé les leurs
+        self.sock.close()
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+        # Au-delà du délai de grâce (plus le shutdown du lifespan), les workers restants sont tués
+        timer = threading.Timer(GRACEFUL_TIMEOUT_SECONDS + 10, self._killRemaining)
+        timer.daemon = True
+        timer.start()
+
+    def _killRemaining(self) -> None:
+        for pid in list(self.children):
+            logger.warning("Worker %d toujours actif, arrêt forcé", pid)
+            self._signal(pid, signal.SIGKILL)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def main() -> int:
+    Logging.configure()
+
+    # Application importée et configuration chargée (clé publique, grilles tarifaires) avant le fork:
+    # partagées par tous les workers, une erreur de configuration arrête le lanceur avant leur démarrage
+    from app.main import app, preload
+
+    preload()
+
+    config = uvicorn.Config(
+        app,
+        host=HOST,
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        proxy_headers=True,
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT_SECONDS,
+        # Les logs uvicorn passent par le handler ECS configuré par Logging
+        log_config=None,
+    )
+    return Server(config, WEB_CONCURRENCY).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,13 @@
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from fastapi import HTTPException, Depends
-from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 
-load_dotenv()
+from app.service.TokenCache import TokenCache
 
 
 class Auth:
@@ -16,28 +16,76 @@ class Auth:
     - hachage / vérification de mot de passe (bcrypt)
     - création / décodage de JWT RS256
     - dépendance FastAPI pour récupérer l'utilisateur courant
+    - cache des tokens déjà vérifiés (une vérification RS256 par token et par durée de vie)
+
+    La clé publique (PATH_PUBLIC_KEY) est lue et analysée une seule fois, par load() au démarrage
+    de l'application ou au premier token à vérifier: construire le service ne lit aucun fichier
+    et n'importe pas python-jose.
     """
 
     def __init__(self) -> None:
-        with open(os.getenv("PATH_PUBLIC_KEY"), "r") as f:
-            self.PUBLIC_KEY = f.read()
-
         self.ALGORITHM = "RS256"
         self.ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 5))
 
+        self.tokenCache = TokenCache(
+            maxsize=int(os.getenv("JWT_CACHE_SIZE", 10000)),
+            ttl=float(os.getenv("JWT_CACHE_TTL_SECONDS", 300)),
+        )
+        self._publicKey = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Clé publique RS256 analysée (objet jose.jwk), lue au premier appel.
+        jwt.decode la reçoit telle quelle: le PEM n'est pas ré-analysé à chaque vérification.
+        """
+        if self._publicKey is None:
+            with self._lock:
+                if self._publicKey is None:
+                    from jose import jwk
+
+                    with open(os.getenv("PATH_PUBLIC_KEY"), "r") as f:
+                        self._publicKey = jwk.construct(f.read(), self.ALGORITHM)
+        return self._publicKey
+
+    def isLoaded(self) -> bool:
+        return self._publicKey is not None
+
     def decodeToken(self, token: str) -> dict:
+        cached = self.tokenCache.get(token)
+        if cached is not None:
+            return cached
+        return self._verify(token)
+
+    async def decodeTokenAsync(self, token: str) -> dict:
+        """
+        decodeToken depuis la boucle d'événements: un token en cache est servi sur place,
+        la vérification RS256 d'un token inconnu passe par le threadpool.
+        """
+        cached = self.tokenCache.get(token)
+        if cached is not None:
+            return cached
+        return await run_in_threadpool(self._verify, token)
+
+    def _verify(self, token: str) -> dict:
+        from jose import jwt, JWTError
+
+        publicKey = self.load()
         try:
-            payload = jwt.decode(token, self.PUBLIC_KEY, algorithms=[self.ALGORITHM])
+            payload = jwt.decode(token, publicKey, algorithms=[self.ALGORITHM])
             id = payload.get("id")
             if id is None:
                 raise HTTPException(status_code=401, detail="Invalid token")
+            self.tokenCache.set(token, payload)
             return payload
         except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-    def getCurrentUser(self, token: str = Depends(OAuth2PasswordBearer(tokenUrl="/customer/login"))) -> dict:
+    async def getCurrentUser(self, token: str = Depends(OAuth2PasswordBearer(tokenUrl="/customer/login"))) -> dict:
         """
         Dépendance FastAPI : extrait et valide le token,
         retourne le payload (ou une erreur 401 si invalide).
+        Coroutine afin d'éviter un passage par le threadpool pour un token en cache;
+        la vérification d'un nouveau token n'occupe pas la boucle d'événements.
         """
-        return self.decodeToken(token)
\ No newline at end of file
+        return await self.decodeTokenAsync(token)
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CourseEventBus:
+    """
+    Diffusion en mémoire (dans le process) des événements de course vers les abonnés.
+
+    - chaque abonné possède sa propre asyncio.Queue bornée, liée à sa boucle d'événements,
+    - des listeners synchrones (ex: index en mémoire) sont appelés directement à la publication,
+    - publish() est thread-safe (appelé depuis le thread LISTEN ou un worker du threadpool),
+    - un abonné trop lent n'est pas bloquant: sa file est vidée et il reçoit un
+      événement "resync" lui demandant de recharger l'état complet.
+    """
+
+    RESYNC = {"type": "resync"}
+
+    def __init__(self, queue_size: int = 1000) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._listeners: list[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+
+    def addListener(self, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def subscriberCount(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event: dict) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+            subscribers = list(self._subscribers.items())
+        for callback in listeners:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Listener d'événements de course en échec")
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Boucle fermée: l'abonné a disparu sans se désinscrire
+                self.unsubscribe(queue)
+
+    def _offer(self, queue: asyncio.Queue, event: dict) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self.RESYNC)
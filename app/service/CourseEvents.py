@@ -0,0 +1,145 @@
+import json
+import logging
+import select
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, func, text
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from app.out.CourseOut import CourseOut
+from app.service.CourseEventBus import CourseEventBus
+from app.service.Database import Database
+
+logger = logging.getLogger(__name__)
+
+# Canal Postgres LISTEN/NOTIFY des événements de course
+CHANNEL = "course_events"
+
+# Clé de Session.info où sont mis en attente les événements hors Postgres
+_PENDING_KEY = "course_events"
+
+
+class CourseEvents:
+    """
+    Événements du cycle de vie des courses (created / confirmed / cancelled).
+
+    Côté écriture (CourseRepository), emit() est appelé dans la transaction:
+    - Postgres: pg_notify(), livré par le serveur uniquement si la transaction est validée,
+    - autres bases (SQLite en dev): l'événement est mis en attente sur la session
+      et publié dans le bus local après le commit.
+
+    Côté lecture, une seule connexion LISTEN par process (thread démarré au premier
+    abonné ou listener) alimente le CourseEventBus, qui diffuse à tous les abonnés.
+    """
+
+    CREATED = "created"
+    CONFIRMED = "confirmed"
+    CANCELLED = "cancelled"
+    # Transitions publiées uniquement par l'outbox (OutboxRepository), pas sur LISTEN/NOTIFY
+    STARTED = "started"
+    ENDED = "ended"
+
+    bus = CourseEventBus()
+    _listener: Optional[threading.Thread] = None
+    _listenerLock = threading.Lock()
+
+    @staticmethod
+    def emit(db: Session, eventType: str, course) -> None:
+        message = {"type": eventType, "course": CourseOut.model_validate(course).model_dump(mode="json")}
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(sql_select(func.pg_notify(CHANNEL, json.dumps(message))))
+        else:
+            db.info.setdefault(_PENDING_KEY, []).append(message)
+
+    @staticmethod
+    def emitMany(db: Session, eventType: str, courses: list) -> None:
+        """Comme emit(), pour un lot de courses: un seul aller-retour sous Postgres."""
+        if not courses:
+            return
+        messages = [
+            {"type": eventType, "course": CourseOut.model_validate(course).model_dump(mode="json")}
+            for course in courses
+        ]
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(
+                text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+                {"channel": CHANNEL, "payloads": [json.dumps(message) for message in messages]},
+            )
+        else:
+            db.info.setdefault(_PENDING_KEY, []).extend(messages)
+
+    @classmethod
+    def subscribe(cls):
+        cls._ensureListener()
+        return cls.bus.subscribe()
+
+    @classmethod
+    def unsubscribe(cls, queue) -> None:
+        cls.bus.unsubscribe(queue)
+
+    @classmethod
+    def addListener(cls, callback) -> None:
+        """Enregistre un callback synchrone appelé pour chaque événement (toutes instances sous Postgres)."""
+        cls._ensureListener()
+        cls.bus.addListener(callback)
+
+    @classmethod
+    def _ensureListener(cls) -> None:
+        if Database.get_engine().dialect.name != "postgresql":
+            return
+        with cls._listenerLock:
+            if cls._listener is None or not cls._listener.is_alive():
+                cls._listener = threading.Thread(target=cls._listen, name="course-events-listener", daemon=True)
+                cls._listener.start()
+
+    @classmethod
+    def _listen(cls) -> None:
+        backoff = 1.0
+        reconnecting = False
+        while True:
+            conn = None
+            try:
+                # Connexion dédiée, détachée du pool: elle reste ouverte pour LISTEN
+                raw = Database.get_engine().raw_connection()
+                conn = raw.driver_connection
+                raw.detach()
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+
+                if reconnecting:
+                    # Des notifications ont pu être perdues pendant la coupure
+                    cls.bus.publish(CourseEventBus.RESYNC)
+                backoff = 1.0
+
+                while True:
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        cls.bus.publish(json.loads(notification.payload))
+            except Exception:
+                logger.exception("Écoute LISTEN %s interrompue, reconnexion dans %.0fs", CHANNEL, backoff)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                reconnecting = True
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+@event.listens_for(Session, "after_commit")
+def _publishPendingEvents(session: Session) -> None:
+    for message in session.info.pop(_PENDING_KEY, []):
+        CourseEvents.bus.publish(message)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discardPendingEvents(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Iterable
+
+from pydantic_core import to_jsonable_python
+
+from app.out.CourseOut import CourseOut
+
+
+class CourseSerializer:
+    """
+    Sérialisation directe des listes de courses en JSON (bytes), sans instancier de CourseOut
+    par ligne ni repasser par jsonable_encoder / JSONResponse côté FastAPI.
+
+    Les lignes viennent des requêtes de liste (tuples des colonnes COURSE_OUT_COLUMNS) ou de
+    l'index des courses en attente (CourseOut). Le résultat est identique octet pour octet
+    à la réponse construite à partir des CourseOut (jsonable_encoder puis JSONResponse): mêmes clés
+    dans le même ordre, encodeurs pydantic-core pour les UUID et les dates, puis json.dumps avec
+    les réglages de JSONResponse (flottants au format de Python: 1e-05, 1e+16), JSON compact en UTF-8.
+    """
+
+    @staticmethod
+    def dumpList(items: Iterable) -> bytes:
+        return _dumps([item if isinstance(item, CourseOut) else CourseSerializer._rowToDict(item) for item in items])
+
+    @staticmethod
+    def dumpNearby(pairs: Iterable[tuple]) -> bytes:
+        """Comme dumpList pour des couples (course, distance_km): mêmes octets que des NearbyCourseOut."""
+        return _dumps([{**CourseSerializer._toDict(item), "distance_km": distance} for item, distance in pairs])
+
+    @staticmethod
+    def dumpNdjson(rows: Iterable) -> bytes:
+        """Une course JSON par ligne (NDJSON): mêmes objets que les éléments de dumpList."""
+        items = to_jsonable_python([CourseSerializer._rowToDict(row) for row in rows])
+        return "".join([_encodeJson(item) + "\n" for item in items]).encode()
+
+    @staticmethod
+    def dumpCsv(rows: Iterable, header: bool = False) -> bytes:
+        """Lignes CSV (colonnes CSV_COLUMNS), précédées de l'en-tête si demandé."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if header:
+            writer.writerow(CSV_COLUMNS)
+        writer.writerows(CourseSerializer._rowToCsv(row) for row in rows)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _rowToCsv(row) -> list:
+        # Dates ISO 8601, statut par sa valeur; les champs absents (None) restent vides
+        return [
+            value.isoformat() if isinstance(value, datetime) else value.value if field == "status" else value
+            for field, value in zip(CSV_COLUMNS, row)
+        ]
+
+    @staticmethod
+    def _toDict(item) -> dict:
+        return item.model_dump() if isinstance(item, CourseOut) else CourseSerializer._rowToDict(item)
+
+    @staticmethod
+    def _rowToDict(row) -> dict:
+        # Dépaquetage dans l'ordre de COURSE_OUT_COLUMNS: bien plus rapide que l'accès par attribut sur un Row
+        (
+            id, client_id, chauffeur_id, point_depart, point_arrivee,
+            depart_lat, depart_lon, arrivee_lat, arrivee_lon,
+            depart, arrivee, status, tarif, updatedAt,
+        ) = row
+        return {
+            "id": id,
+            "client_id": client_id,
+            "chauffeur_id": chauffeur_id,
+            "point_depart": point_depart,
+            "point_arrivee": point_arrivee,
+            "depart_lat": depart_lat,
+            "depart_lon": depart_lon,
+            "arrivee_lat": arrivee_lat,
+            "arrivee_lon": arrivee_lon,
+            "date_heure_depart": depart,
+            "date_heure_arrivee": arrivee,
+            "status": status.value,
+            "tarif": None if tarif is None else float(tarif),
+            "updatedAt": updatedAt,
+        }
+
+
+# Réglages de JSONResponse (starlette): json.dumps compact, UTF-8 non échappé, NaN refusés
+_encodeJson = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+def _dumps(value) -> bytes:
+    return _encodeJson(to_jsonable_python(value)).encode()
+
+
+# Colonnes de l'export CSV: champs de CourseOut, dans l'ordre de COURSE_OUT_COLUMNS
+CSV_COLUMNS = list(CourseOut.model_fields)
+
+# FAST_SERIALIZATION=false pour revenir aux CourseOut validés puis sérialisés par FastAPI
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "true").lower() == "true"
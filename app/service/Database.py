@@ -1,42 +1,439 @@
+import inspect
+import itertools
+import logging
 import os
-from typing import Generator
-from contextlib import contextmanager
+import threading
+import time
+import zlib
+from contextvars import ContextVar
+from typing import AsyncGenerator, Generator, Optional
+from contextlib import asynccontextmanager, contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
 from dotenv import load_dotenv
 
+from app.service.Metrics import registry, DURATION_BUCKETS
+from app.service.ReadYourWrites import ReadYourWrites
+
 load_dotenv()
 
+logger = logging.getLogger("app.sql")
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Engine unique au module avec pool (les connexions sont réutilisées)
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True)
+# "sync" (défaut): routes exécutées dans le threadpool avec l'engine du module
+# "async": routes natives asyncio avec l'AsyncEngine (asyncpg / aiosqlite)
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync").lower()
+
+# Pilotes asyncio utilisés lorsque ASYNC_DATABASE_URL n'est pas fourni
+_ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+# Requêtes SQL au-delà de ce seuil (ms) journalisées en WARNING (format ECS)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+
+# Pool de connexions (voir README): dimensionné par défaut sur les 40 threads du threadpool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Connexions ouvertes au démarrage de l'application (Database.warm_up), dans la limite de DB_POOL_SIZE
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", 4))
+# Réplicas de lecture (une ou plusieurs URL séparées par des virgules) et fenêtre "read-your-writes"
+READ_DATABASE_URLS = [url.strip() for url in os.getenv("READ_DATABASE_URL", "").split(",") if url.strip()]
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+READ_YOUR_WRITES_SLOTS = int(os.getenv("READ_YOUR_WRITES_SLOTS", 65536))
+
+# DB_PGBOUNCER=true: pas de pool côté application (NullPool) et pas de requêtes préparées nommées
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Attente d'une connexion du pool", ("pool",), DURATION_BUCKETS,
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total", "Connexions non obtenues avant DB_POOL_TIMEOUT", ("pool",),
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections", "Connexions du pool par état (in_use, idle, overflow, size)", ("pool", "state"),
+)
+DB_READS = registry.counter(
+    "db_reads_total", "Lectures routées vers un réplica ou gardées sur le primaire", ("target",),
+)
+
+SQL_STATEMENT_DURATION = registry.histogram(
+    "sql_statement_duration_seconds", "Durée des requêtes SQL", ("route",), DURATION_BUCKETS,
+)
+SQL_SLOW_STATEMENTS = registry.counter(
+    "sql_slow_statements_total", "Requêtes SQL au-delà de SLOW_QUERY_THRESHOLD_MS", ("route",),
+)
+SQL_FAILED_STATEMENTS = registry.counter(
+    "sql_failed_statements_total", "Requêtes SQL en erreur (contrainte, verrou, connexion perdue...)", ("route",),
+)
+
+
+class QueryStats:
+    """Compteurs SQL d'une requête HTTP (nombre de requêtes, temps cumulé), étiquetés par route FastAPI."""
+
+    __slots__ = ("scope", "count", "duration")
+
+    def __init__(self, scope: Optional[dict] = None) -> None:
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+
+    def route(self) -> str:
+        # La route n'est connue qu'après le routage: lue dans le scope ASGI au moment voulu
+        route = (self.scope or {}).get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+# Statistiques de la requête HTTP en cours (posées par RequestMetricsMiddleware)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+class UnitOfWork:
+    """
+    Sessions d'une requête HTTP: ouvertes à la première utilisation, une par fabrique (primaire,
+    réplica choisi, AsyncSession), partagées par tous les appels de dépôt de la requête
+    puis fermées en fin de requête (dépendance Database.unit_of_work).
+
+    Chaque session est liée à une connexion prise une seule fois dans le pool: les commits
+    successifs de la requête (Idempotency-Key, écriture, réponse enregistrée) la gardent.
+    """
+
+    __slots__ = ("sessions", "connections")
+
+    def __init__(self) -> None:
+        self.sessions: dict = {}
+        self.connections: list = []
+
+    def get(self, factory) -> Session:
+        session = self.sessions.get(factory)
+        if session is None:
+            connection = factory.kw["bind"].connect()
+            self.connections.append(connection)
+            session = self.sessions[factory] = factory(bind=connection)
+        return session
+
+    async def getAsync(self, factory):
+        session = self.sessions.get(factory)
+        if session is None:
+            connection = await factory.kw["bind"].connect()
+            self.connections.append(connection)
+            session = self.sessions[factory] = factory(bind=connection)
+        return session
+
+    def closeSync(self) -> None:
+        """Ferme les sessions et rend les connexions au pool (hors de la boucle d'événements)."""
+        sessions, connections = self._detach()
+        UnitOfWork._closeAll(sessions + connections)
+
+    async def close(self) -> None:
+        sessions, connections = self._detach()
+        if any(isinstance(session, Session) for session in sessions):
+            # Sessions synchrones (DATABASE_MODE=sync): fermées hors de la boucle d'événements
+            # (le retour de la connexion au pool fait un ROLLBACK réseau)
+            from starlette.concurrency import run_in_threadpool
+
+            await run_in_threadpool(UnitOfWork._closeAll, sessions + connections)
+            return
+        for resource in sessions + connections:
+            await resource.close()
+
+    def _detach(self) -> tuple[list, list]:
+        sessions, self.sessions = list(self.sessions.values()), {}
+        connections, self.connections = self.connections, []
+        return sessions, connections
+
+    @staticmethod
+    def _closeAll(resources: list) -> None:
+        for resource in resources:
+            resource.close()
+
+
+# Unité de travail de la requête HTTP en cours (posée par Database.unit_of_work)
+current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("current_unit_of_work", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    route = _record(elapsed)
+
+    SQL_STATEMENT_DURATION.observe(elapsed, route=route)
+    if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        SQL_SLOW_STATEMENTS.inc(route=route)
+        logger.warning(
+            "Requête SQL lente (%.1f ms)", elapsed * 1000,
+            extra={
+                "event.duration": int(elapsed * 1e9),
+                "sql.statement": statement[:2000],
+                "http.route": route,
+            },
+        )
+
+
+def _handle_error(exception_context):
+    # La requête a échoué entre les deux hooks: retirer son départ, sinon la pile de la connexion
+    # grossit et la requête suivante est chronométrée depuis un départ périmé
+    conn = exception_context.connection
+    started = conn.info.get("query_start_time") if conn is not None else None
+    if not started:
+        # Erreur hors exécution (connexion, commit): aucun départ empilé
+        return
+    elapsed = time.perf_counter() - started.pop()
+    SQL_FAILED_STATEMENTS.inc(route=_record(elapsed))
+
+
+def _record(elapsed: float) -> str:
+    """Ajoute la requête aux compteurs de la requête HTTP en cours; retourne sa route ("-" hors requête)."""
+    stats = current_query_stats.get()
+    if stats is None:
+        return "-"
+    stats.count += 1
+    stats.duration += elapsed
+    return stats.route()
+
 
-# Fabrique de sessions et registre "scopé" (une session par thread worker)
-_SessionFactory = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+def _instrument(target_engine) -> None:
+    """Branche le comptage / chronométrage des requêtes SQL sur un engine (sync)."""
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target_engine, "handle_error", _handle_error)
+
+
+class _TimedCheckout:
+    """Mixin de pool: chronomètre l'obtention d'une connexion (attente du pool + ouverture éventuelle)."""
+
+    LABEL = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc(pool=self.LABEL)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, pool=self.LABEL)
+
+
+def _timed_pool_class(base, label: str):
+    return type(f"Timed{base.__name__}", (_TimedCheckout, base), {"LABEL": label})
+
+
+def _engine_options(url: str, label: str, is_async: bool = False) -> dict:
+    """Options de create_engine / create_async_engine selon les variables DB_POOL_* et DB_PGBOUNCER."""
+    parsed = make_url(url)
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # SQLite en mémoire: pool propre à SQLAlchemy (une connexion par thread), rien à dimensionner
+        return options
+
+    if DB_PGBOUNCER:
+        # PgBouncer gère le pool; en mode transaction, les requêtes préparées nommées ne survivent
+        # pas d'une transaction à l'autre: cache d'asyncpg désactivé
+        options["poolclass"] = _timed_pool_class(NullPool, label)
+        if is_async and parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+
+    options.update(
+        poolclass=_timed_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool, label),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+
+# Engines (sync) dont le pool est exposé sur /metrics: (étiquette, engine)
+_pooled_engines: list[tuple] = []
+
+
+def _collect_pool_metrics() -> None:
+    for label, target_engine in list(_pooled_engines):
+        pool = target_engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        DB_POOL_CONNECTIONS.set(pool.size(), pool=label, state="size")
+        DB_POOL_CONNECTIONS.set(pool.checkedout(), pool=label, state="in_use")
+        DB_POOL_CONNECTIONS.set(pool.checkedin(), pool=label, state="idle")
+        DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), pool=label, state="overflow")
+
+
+registry.addCollector(_collect_pool_metrics)
+
+# Engine unique au module avec pool (les connexions sont réutilisées), créé au premier appel
+# de Database.get_engine(): importer le module n'ouvre rien et ne charge pas le pilote (psycopg2)
+engine = None
+_engine_lock = threading.Lock()
+
+# Fabrique de sessions (liée à l'engine à sa création) et registre "scopé" (une session par thread worker)
+_SessionFactory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
 SessionRegistry = scoped_session(_SessionFactory)
 
+# Réplicas: un engine et une fabrique de sessions par URL, choisis à tour de rôle (créés avec l'engine primaire)
+_read_engines: list = []
+_ReadSessionFactories: list = []
+_read_counter = itertools.count()
+# Partagé par les workers de python -m app.server: créé à l'import, avant le fork
+readYourWrites = ReadYourWrites(window=READ_YOUR_WRITES_SECONDS, slots=READ_YOUR_WRITES_SLOTS)
+
 Base = declarative_base()
 
+# Engine / sessions asyncio, créés à la demande (uniquement en mode "async")
+_async_engine = None
+_AsyncSessionFactory = None
+_AsyncReadSessionFactories = None
+
+
+def _create_engines() -> None:
+    """Engine primaire et engines des réplicas (Database.get_engine, sous _engine_lock)."""
+    global engine
+    read_engines = [
+        create_engine(url, future=True, **_engine_options(url, f"read{i}")) for i, url in enumerate(READ_DATABASE_URLS)
+    ]
+    for i, read_engine in enumerate(read_engines):
+        _instrument(read_engine)
+        _pooled_engines.append((f"read{i}", read_engine))
+    _ReadSessionFactories[:] = [
+        sessionmaker(bind=e, autoflush=False, expire_on_commit=False, info={"replica": True}) for e in read_engines
+    ]
+    _read_engines[:] = read_engines
+
+    primary = create_engine(DATABASE_URL, future=True, **_engine_options(DATABASE_URL, "sync"))
+    _instrument(primary)
+    _pooled_engines.append(("sync", primary))
+    _SessionFactory.configure(bind=primary)
+    # Affecté en dernier: un autre thread qui voit l'engine trouve aussi les fabriques prêtes
+    engine = primary
+
+
+def _to_async_url(url: str) -> str:
+    """Convertit DATABASE_URL vers le pilote asyncio correspondant (ex: postgresql -> postgresql+asyncpg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"Aucun pilote asyncio connu pour '{backend}', renseigner ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def _reader_id(signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[str]:
+    """Identifiant de l'utilisateur d'une lecture: argument `user_connected` de la méthode décorée, s'il existe."""
+    user_connected = signature.bind_partial(*args, **kwargs).arguments.get("user_connected")
+    return user_connected.get("id") if isinstance(user_connected, dict) else None
+
+
+def _pick_read_factory(factories: list, user_id: Optional[str]):
+    """Fabrique de sessions du réplica de l'utilisateur (sinon le suivant), ou None pour lire sur le primaire."""
+    if not factories:
+        return None
+    if readYourWrites.isSticky(user_id):
+        DB_READS.inc(target="primary")
+        return None
+    DB_READS.inc(target="replica")
+    if user_id:
+        # Réplica fixe par utilisateur: lectures monotones (la version calculée pour l'ETag
+        # et la page servie viennent du même réplica)
+        return factories[zlib.crc32(str(user_id).encode()) % len(factories)]
+    return factories[next(_read_counter) % len(factories)]
+
+
+def _run_in_unit_of_work(uow: UnitOfWork, factory, func, args: tuple, kwargs: dict):
+    # Session de la requête: annulée en cas d'erreur (les appels suivants repartent d'un état propre), pas fermée
+    db = uow.get(factory)
+    kwargs["db"] = db
+    try:
+        return func(*args, **kwargs)
+    except BaseException:
+        db.rollback()
+        raise
+
+
+async def _run_in_async_unit_of_work(uow: UnitOfWork, factory, func, args: tuple, kwargs: dict):
+    db = await uow.getAsync(factory)
+    kwargs["db"] = db
+    try:
+        return await func(*args, **kwargs)
+    except BaseException:
+        await db.rollback()
+        raise
+
 
 class Database:
     """
     Fournit des utilitaires d'accès à la base.
 
     Bonnes pratiques:
-    - Engine: singleton module + pool (déjà réutilisé).
-    - Session: une par unité de travail / requête. On utilise scoped_session
-      pour éviter un singleton global dangereux; on obtient une "session par thread".
+    - Engine: singleton module + pool (déjà réutilisé), créé au premier appel de get_engine().
+    - Session: une par unité de travail / requête. Dans une requête HTTP, la dépendance
+      unit_of_work ouvre une session partagée par tous les appels de dépôt; ailleurs
+      (scripts, tâches de fond), on utilise scoped_session: une "session par thread".
     """
 
+    @staticmethod
+    async def unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+        """
+        Dépendance FastAPI (déclarée sur l'application): une unité de travail par requête HTTP.
+        with_session / with_read_session et leurs équivalents asyncio y prennent leur session
+        au lieu d'en ouvrir (et d'en fermer) une à chaque appel.
+        """
+        uow = UnitOfWork()
+        token = current_unit_of_work.set(uow)
+        try:
+            yield uow
+        finally:
+            current_unit_of_work.reset(token)
+            await uow.close()
+
+    @staticmethod
+    @contextmanager
+    def unit_of_work_scope() -> Generator[UnitOfWork, None, None]:
+        """
+        Équivalent synchrone de unit_of_work (scripts, benchmarks):
+            with Database.unit_of_work_scope(): ...
+        """
+        uow = UnitOfWork()
+        token = current_unit_of_work.set(uow)
+        try:
+            yield uow
+        finally:
+            current_unit_of_work.reset(token)
+            uow.closeSync()
+
+    @staticmethod
+    def release_unit_of_work() -> None:
+        """
+        Mode sync: rend au pool, dans le thread qui vient de s'en servir, les connexions de l'unité
+        de travail en cours. Sans cela, une requête terminée garderait sa connexion en attendant
+        une place dans le threadpool pour la fermer, pendant que les threads occupés attendent
+        une connexion du pool. Les appels suivants de la requête en reprennent une au besoin.
+        """
+        uow = current_unit_of_work.get()
+        if uow is not None:
+            uow.closeSync()
+
     @staticmethod
     def get_session() -> Session:
         """
         Retourne la session courante (scopée au thread).
         Si elle n'existe pas encore, elle est créée par le registre.
         """
+        Database.get_engine()
         return SessionRegistry()
 
     @staticmethod
@@ -85,6 +482,10 @@ class Database:
             if "db" in kwargs and kwargs["db"] is not None:
                 # Une session est déjà fournie (ex: appel imbriqué): ne pas gérer le cycle de vie ici
                 return func(*args, **kwargs)
+            uow = current_unit_of_work.get()
+            if uow is not None:
+                Database.get_engine()
+                return _run_in_unit_of_work(uow, _SessionFactory, func, args, kwargs)
             db = Database.get_session()
             try:
                 kwargs["db"] = db
@@ -95,5 +496,227 @@ class Database:
 
     @staticmethod
     def get_engine():
-        """Accès à l'engine unique du module."""
+        """
+        Accès à l'engine unique du module, créé au premier appel (avec ceux des réplicas).
+        Créer un engine n'ouvre aucune connexion: voir warm_up().
+        """
+        global engine
+        if engine is None:
+            with _engine_lock:
+                if engine is None:
+                    _create_engines()
         return engine
+
+    @staticmethod
+    def warm_up(connections: int = DB_POOL_WARMUP) -> int:
+        """
+        Ouvre jusqu'à `connections` connexions par pool (primaire et réplicas) puis les rend au pool:
+        les premières requêtes après le démarrage n'attendent pas l'ouverture d'une connexion
+        (TCP, TLS, authentification). Sans effet sans pool applicatif (PgBouncer, SQLite en mémoire).
+        Retourne le nombre de connexions ouvertes.
+        """
+        Database.get_engine()
+        opened = 0
+        for target_engine in [engine, *_read_engines]:
+            pool = target_engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            held = []
+            try:
+                for _ in range(min(connections, pool.size())):
+                    held.append(target_engine.connect())
+            finally:
+                for connection in held:
+                    connection.close()
+            opened += len(held)
+        return opened
+
+    @staticmethod
+    async def warm_up_async(connections: int = DB_POOL_WARMUP) -> int:
+        """Équivalent asyncio de warm_up (AsyncEngine du primaire et des réplicas, connexions ouvertes en parallèle)."""
+        import asyncio
+
+        targets = [Database.get_async_engine()] + [factory.kw["bind"] for factory in Database.get_async_read_session_factories()]
+        opened = 0
+        for target_engine in targets:
+            pool = target_engine.sync_engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            held = await asyncio.gather(*(target_engine.connect() for _ in range(min(connections, pool.size()))))
+            for connection in held:
+                await connection.close()
+            opened += len(held)
+        return opened
+
+    @staticmethod
+    def ping() -> None:
+        """SELECT 1 sur le primaire (sonde /ready); lève l'erreur du pilote si la base est injoignable."""
+        with Database.get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    @staticmethod
+    async def ping_async() -> None:
+        async with Database.get_async_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    @staticmethod
+    def reset_after_fork() -> None:
+        """
+        À appeler dans un worker juste après fork() (app.server): les pools hérités du parent
+        sont remplacés sans fermer leurs connexions (elles restent au parent) et de nouvelles
+        connexions sont ouvertes à la demande. Les AsyncEngine, liés à une boucle asyncio,
+        sont recréés au premier appel dans le worker.
+        """
+        global _async_engine, _AsyncSessionFactory, _AsyncReadSessionFactories
+        SessionRegistry.remove()
+        for sync_engine in [engine, *_read_engines] if engine is not None else []:
+            sync_engine.dispose(close=False)
+        _pooled_engines[:] = [(label, e) for label, e in _pooled_engines if not label.startswith("async")]
+        _async_engine = None
+        _AsyncSessionFactory = None
+        _AsyncReadSessionFactories = None
+
+    @staticmethod
+    def is_async() -> bool:
+        """Indique si l'application tourne en mode asyncio (DATABASE_MODE=async)."""
+        return DATABASE_MODE == "async"
+
+    @staticmethod
+    def get_async_engine():
+        """
+        Accès à l'AsyncEngine du module, créé au premier appel.
+        L'URL vient de ASYNC_DATABASE_URL, ou est déduite de DATABASE_URL.
+        """
+        global _async_engine, _AsyncSessionFactory
+        if _async_engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+            url = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+            _async_engine = create_async_engine(url, **_engine_options(url, "async", is_async=True))
+            _instrument(_async_engine.sync_engine)
+            _pooled_engines.append(("async", _async_engine.sync_engine))
+            _AsyncSessionFactory = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+        return _async_engine
+
+    @staticmethod
+    def get_async_session():
+        """Retourne une nouvelle AsyncSession (une par appel / unité de travail)."""
+        Database.get_async_engine()
+        return _AsyncSessionFactory()
+
+    @staticmethod
+    def with_async_session(func):
+        """
+        Équivalent asyncio de with_session: injecte une AsyncSession 'db'
+        si l'appelant n'en fournit pas, et la ferme à la fin de l'appel.
+
+        Usage:
+            @Database.with_async_session
+            async def my_method(self, arg1, ..., db=None): ...
+        """
+        async def _wrapper(*args, **kwargs):
+            if "db" in kwargs and kwargs["db"] is not None:
+                return await func(*args, **kwargs)
+            uow = current_unit_of_work.get()
+            if uow is not None:
+                Database.get_async_engine()
+                return await _run_in_async_unit_of_work(uow, _AsyncSessionFactory, func, args, kwargs)
+            async with Database.get_async_session() as db:
+                kwargs["db"] = db
+                return await func(*args, **kwargs)
+        return _wrapper
+
+    @staticmethod
+    def record_write(user_id: Optional[str]) -> None:
+        """
+        Signale une écriture validée par cet utilisateur: ses lectures restent sur le primaire
+        pendant READ_YOUR_WRITES_SECONDS (sans effet si aucun réplica n'est configuré).
+        """
+        if READ_DATABASE_URLS:
+            readYourWrites.recordWrite(user_id)
+
+    @staticmethod
+    def with_read_session(func):
+        """
+        Variante de with_session pour les lectures: la Session 'db' vient d'un réplica
+        (READ_DATABASE_URL, à tour de rôle), sauf si l'utilisateur `user_connected`
+        a écrit récemment ou si aucun réplica n'est configuré (primaire, comme with_session).
+        """
+        signature = inspect.signature(func)
+        primary = Database.with_session(func)
+
+        def _wrapper(*args, **kwargs):
+            if "db" in kwargs and kwargs["db"] is not None:
+                return func(*args, **kwargs)
+            Database.get_engine()
+            factory = _pick_read_factory(_ReadSessionFactories, _reader_id(signature, args, kwargs))
+            if factory is None:
+                return primary(*args, **kwargs)
+            uow = current_unit_of_work.get()
+            if uow is not None:
+                return _run_in_unit_of_work(uow, factory, func, args, kwargs)
+            with factory() as db:
+                kwargs["db"] = db
+                return func(*args, **kwargs)
+        return _wrapper
+
+    @staticmethod
+    def get_async_read_session_factories() -> list:
+        """Fabriques d'AsyncSession des réplicas (URL de READ_DATABASE_URL converties vers le pilote asyncio)."""
+        global _AsyncReadSessionFactories
+        if _AsyncReadSessionFactories is None:
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+            factories = []
+            for i, url in enumerate(READ_DATABASE_URLS):
+                async_url = _to_async_url(url)
+                read_engine = create_async_engine(async_url, **_engine_options(async_url, f"async_read{i}", is_async=True))
+                _instrument(read_engine.sync_engine)
+                _pooled_engines.append((f"async_read{i}", read_engine.sync_engine))
+                factories.append(async_sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False, info={"replica": True}))
+            _AsyncReadSessionFactories = factories
+        return _AsyncReadSessionFactories
+
+    @staticmethod
+    def with_async_read_session(func):
+        """Équivalent asyncio de with_read_session."""
+        signature = inspect.signature(func)
+        primary = Database.with_async_session(func)
+
+        async def _wrapper(*args, **kwargs):
+            if "db" in kwargs and kwargs["db"] is not None:
+                return await func(*args, **kwargs)
+            factory = _pick_read_factory(Database.get_async_read_session_factories(), _reader_id(signature, args, kwargs))
+            if factory is None:
+                return await primary(*args, **kwargs)
+            uow = current_unit_of_work.get()
+            if uow is not None:
+                return await _run_in_async_unit_of_work(uow, factory, func, args, kwargs)
+            async with factory() as db:
+                kwargs["db"] = db
+                return await func(*args, **kwargs)
+        return _wrapper
+
+    @staticmethod
+    @contextmanager
+    def stream_session(user_id: Optional[str] = None) -> Generator[Session, None, None]:
+        """
+        Session d'une lecture en flux (export): hors unité de travail, car le corps d'une
+        StreamingResponse est envoyé après la fin de la requête; réplica si possible, comme
+        with_read_session. La connexion est gardée jusqu'à la fin de la lecture.
+        """
+        Database.get_engine()
+        factory = _pick_read_factory(_ReadSessionFactories, user_id) or _SessionFactory
+        with factory() as db:
+            yield db
+
+    @staticmethod
+    @asynccontextmanager
+    async def async_stream_session(user_id: Optional[str] = None) -> AsyncGenerator:
+        """Équivalent asyncio de stream_session."""
+        factory = _pick_read_factory(Database.get_async_read_session_factories(), user_id)
+        if factory is None:
+            Database.get_async_engine()
+            factory = _AsyncSessionFactory
+        async with factory() as db:
+            yield db
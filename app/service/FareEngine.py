@@ -0,0 +1,166 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.service.Geo import EARTH_RADIUS_KM, Geo
+from app.service.TariffPlan import TariffPlan
+
+# TARIFF_PLANS_PATH: fichier YAML (ou JSON) des grilles tarifaires; absent = grille historique (5€ + 2€/min)
+TARIFF_PLANS_PATH = os.getenv("TARIFF_PLANS_PATH", "")
+
+_DEFAULT_PLANS = [TariffPlan(version="v1")]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _numpy():
+    # NumPy n'est nécessaire qu'au calcul par lots (scripts de recalcul), pas au service HTTP
+    import numpy
+    return numpy
+
+
+def _utc(value: datetime) -> datetime:
+    # Les dates de course sont écrites en UTC (datetime.utcnow()), parfois sans fuseau
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class FareEngine:
+    """
+    Calcul des tarifs à partir de grilles versionnées (TariffPlan), chacune applicable
+    aux courses démarrées à partir de son validFrom.
+
+    - price() / priceCourse(): une course (fin de course dans CourseRepository),
+    - priceBatch(): des tableaux NumPy de courses, sans boucle Python par ligne
+      (rapprochement de fin de journée, rejeu d'une nouvelle grille sur l'historique).
+
+    Les deux chemins font les mêmes opérations flottantes dans le même ordre et arrondissent
+    au centime de la même façon (demi-pair): ils donnent le même tarif.
+    """
+
+    def __init__(self, plans: list[TariffPlan]) -> None:
+        if not plans:
+            raise ValueError("Au moins une grille tarifaire est requise")
+        self.plans = sorted(plans, key=lambda plan: plan.validFrom)
+        self._zones = {plan.timezone: ZoneInfo(plan.timezone) for plan in self.plans}
+
+    @classmethod
+    def fromFile(cls, path: str) -> "FareEngine":
+        """Fichier YAML ou JSON: {"plans": [{"version": "2025-01", "validFrom": "2025-01-01", ...}, ...]}."""
+        import yaml
+
+        with open(path, encoding="utf-8") as f:
+            content = yaml.safe_load(f) or {}
+        plans = content.get("plans", []) if isinstance(content, dict) else content
+        return cls([TariffPlan.model_validate(plan) for plan in plans])
+
+    @classmethod
+    def fromEnvironment(cls) -> "FareEngine":
+        return cls.fromFile(TARIFF_PLANS_PATH) if TARIFF_PLANS_PATH else cls(_DEFAULT_PLANS)
+
+    @classmethod
+    def default(cls) -> "FareEngine":
+        """Grilles de TARIFF_PLANS_PATH, chargées une fois par process au premier appel (ou au démarrage de l'application)."""
+        global _default
+        if _default is None:
+            _default = cls.fromEnvironment()
+        return _default
+
+    def planAt(self, start: datetime) -> TariffPlan:
+        """Grille en vigueur au départ (la première si le départ la précède)."""
+        start = _utc(start)
+        current = self.plans[0]
+        for plan in self.plans[1:]:
+            if plan.validFrom > start:
+                break
+            current = plan
+        return current
+
+    def price(self, start: datetime, end: datetime, distanceKm: Optional[float] = None, surge: Optional[float] = None) -> float:
+        start, end = _utc(start), _utc(end)
+        plan = self.planAt(start)
+        minutes = (end - start).total_seconds() / 60
+        local = start.astimezone(self._zones[plan.timezone])
+        multiplier = plan.bandMultiplier(local.hour * 3600 + local.minute * 60 + local.second)
+
+        fare = plan.base + plan.perMinute * minutes + plan.perKm * (distanceKm or 0.0)
+        fare = fare * multiplier * (plan.surge if surge is None else surge)
+        return round(max(plan.minimum, fare) * 100) / 100
+
+    def priceCourse(self, course, surge: Optional[float] = None) -> float:
+        distanceKm = None
+        if None not in (course.depart_lat, course.depart_lon, course.arrivee_lat, course.arrivee_lon):
+            distanceKm = Geo.distanceKm(course.depart_lat, course.depart_lon, course.arrivee_lat, course.arrivee_lon)
+        return self.price(course.date_heure_depart, course.date_heure_arrivee, distanceKm, surge)
+
+    def priceBatch(self, starts, ends, distanceKm=None, surge=None):
+        """
+        Tarifs d'un lot de courses.
+
+        starts / ends: dates UTC (datetime64 ou datetime naïfs), distanceKm: km (NaN = inconnue),
+        surge: coefficient scalaire ou par course (défaut: celui de la grille). Retourne un tableau float64.
+        """
+        np = _numpy()
+        starts = np.asarray(starts, dtype="datetime64[us]")
+        ends = np.asarray(ends, dtype="datetime64[us]")
+        startUs = starts.astype(np.int64)
+        minutes = (ends.astype(np.int64) - startUs) / 1e6 / 60
+        km = np.zeros(len(starts)) if distanceKm is None else np.nan_to_num(np.asarray(distanceKm, dtype=np.float64), nan=0.0)
+        surges = None if surge is None else np.broadcast_to(np.asarray(surge, dtype=np.float64), starts.shape)
+
+        validFrom = np.array([(plan.validFrom - _EPOCH) // timedelta(microseconds=1) for plan in self.plans], dtype=np.int64)
+        planIndex = np.clip(np.searchsorted(validFrom, startUs, side="right") - 1, 0, None)
+
+        fares = np.empty(len(starts), dtype=np.float64)
+        for i, plan in enumerate(self.plans):
+            mask = planIndex == i
+            if not mask.any():
+                continue
+            fare = plan.base + plan.perMinute * minutes[mask] + plan.perKm * km[mask]
+            fare = fare * self._bandMultipliers(plan, startUs[mask]) * (plan.surge if surges is None else surges[mask])
+            fares[mask] = np.maximum(plan.minimum, fare)
+        return np.rint(fares * 100) / 100
+
+    @staticmethod
+    def distancesKm(departLat, departLon, arriveeLat, arriveeLon):
+        """Haversine vectorisée (même formule que Geo.distanceKm); NaN si une coordonnée manque."""
+        np = _numpy()
+        phi1, phi2 = np.radians(np.asarray(departLat, dtype=np.float64)), np.radians(np.asarray(arriveeLat, dtype=np.float64))
+        dphi = phi2 - phi1
+        dlambda = np.radians(np.asarray(arriveeLon, dtype=np.float64) - np.asarray(departLon, dtype=np.float64))
+        a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+    def _bandMultipliers(self, plan: TariffPlan, startUs):
+        np = _numpy()
+        multipliers = np.ones(len(startUs), dtype=np.float64)
+        if not plan.timeBands:
+            return multipliers
+
+        # Décalage horaire calculé une fois par heure UTC distincte, pas par course
+        seconds = startUs // 1_000_000
+        hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+        zone = self._zones[plan.timezone]
+        offsets = np.array(
+            [datetime.fromtimestamp(int(hour) * 3600, zone).utcoffset().total_seconds() for hour in hours],
+            dtype=np.int64,
+        )
+        secondsOfDay = (seconds + offsets[inverse]) % 86400
+
+        assigned = np.zeros(len(startUs), dtype=bool)
+        for band in plan.timeBands:
+            start, end = band.startSeconds(), band.endSeconds()
+            if start <= end:
+                inside = (secondsOfDay >= start) & (secondsOfDay < end)
+            else:
+                inside = (secondsOfDay >= start) | (secondsOfDay < end)
+            inside &= ~assigned
+            multipliers[inside] = band.multiplier
+            assigned |= inside
+        return multipliers
+
+
+# Grilles chargées une fois par process (FareEngine.default())
+_default: Optional[FareEngine] = None
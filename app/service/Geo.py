@@ -0,0 +1,34 @@
+import math
+
+# Rayon terrestre moyen (km) et longueur d'un degré de latitude
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class Geo:
+    """Calculs géographiques simples (sphère, degrés WGS84) pour la recherche de courses proches."""
+
+    @staticmethod
+    def distanceKm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Distance orthodromique (haversine) en km."""
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        dphi = phi2 - phi1
+        dlambda = math.radians(lon2 - lon1)
+        a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+    @staticmethod
+    def boundingBox(lat: float, lon: float, radiusKm: float) -> tuple[float, float, float, float]:
+        """
+        Rectangle (min_lat, max_lat, min_lon, max_lon) contenant le cercle de rayon radiusKm.
+        Près des pôles ou de l'antiméridien, toutes les longitudes sont retenues (cas rares, résultat exact).
+        """
+        dlat = radiusKm / KM_PER_DEGREE
+        min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+        if cos_lat <= 1e-6:
+            return min_lat, max_lat, -180.0, 180.0
+        dlon = radiusKm / (KM_PER_DEGREE * cos_lat)
+        if lon - dlon < -180.0 or lon + dlon > 180.0:
+            return min_lat, max_lat, -180.0, 180.0
+        return min_lat, max_lat, lon - dlon, lon + dlon
@@ -0,0 +1,19 @@
+import logging
+import os
+
+import ecs_logging
+
+
+class Logging:
+    """Configuration des logs applicatifs au format ECS (Elastic Common Schema) sur la sortie standard."""
+
+    @staticmethod
+    def configure() -> None:
+        root = logging.getLogger()
+        if any(isinstance(handler.formatter, ecs_logging.StdlibFormatter) for handler in root.handlers):
+            return
+
+        handler = logging.StreamHandler()
+        handler.setFormatter(ecs_logging.StdlibFormatter())
+        root.addHandler(handler)
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+from app.repository.OutboxRepository import OUTBOX_SINK, OutboxRepository
+from app.service.Database import Database
+from app.service.Metrics import registry
+from app.service.OutboxSinks import OutboxSinks
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PUBLISHED = registry.counter("outbox_events_published_total", "Événements de l'outbox livrés")
+OUTBOX_FAILURES = registry.counter("outbox_send_failures_total", "Lots de l'outbox en échec (rejoués plus tard)")
+
+
+class OutboxDispatcher:
+    """
+    Vide l'outbox par lots vers une destination (sink.send(list[dict])), dans un thread de fond.
+
+    - livraison "au moins une fois": un lot en échec est rejoué avec un délai exponentiel
+      (retryBase * 2^(tentatives-1), plafonné à retryMax); les consommateurs dédoublonnent sur `id`,
+    - ordre garanti par course: seule la tête de file de chaque course est publiée,
+      la suivante devient éligible une fois la précédente livrée.
+    """
+
+    def __init__(self, sink, batchSize: int = 100, interval: float = 1.0, retryBase: float = 1.0, retryMax: float = 300.0) -> None:
+        self.sink = sink
+        self.batchSize = batchSize
+        self.interval = interval
+        self.retryBase = retryBase
+        self.retryMax = retryMax
+        self.outboxRepository = OutboxRepository()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="course-outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                sent = self.dispatchOnce()
+            except Exception:
+                logger.exception("Publication de l'outbox impossible")
+                sent = 0
+            # Lot plein: il reste probablement des événements, on enchaîne sans attendre
+            if sent < self.batchSize:
+                self._stop.wait(self.interval)
+
+    def dispatchOnce(self) -> int:
+        """Publie un lot; retourne le nombre d'événements livrés."""
+        with Database.session() as db:
+            events = self.outboxRepository.claimBatch(db, self.batchSize)
+            if not events:
+                db.rollback()
+                return 0
+
+            messages = [
+                {
+                    "id": e.id,
+                    "type": e.type,
+                    "course_id": str(e.course_id),
+                    "occurredAt": e.occurredAt.isoformat(),
+                    "course": json.loads(e.payload),
+                }
+                for e in events
+            ]
+            try:
+                self.sink.send(messages)
+            except Exception as error:
+                self.outboxRepository.markFailed(db, events, str(error) or type(error).__name__, self.retryBase, self.retryMax)
+                db.commit()
+                OUTBOX_FAILURES.inc()
+                logger.warning("Lot de %d événements non livré: %s", len(events), error)
+                return 0
+
+            self.outboxRepository.markPublished(db, events)
+            db.commit()
+            OUTBOX_PUBLISHED.inc(len(events))
+            return len(events)
+
+
+def create_dispatcher() -> OutboxDispatcher:
+    return OutboxDispatcher(
+        OutboxSinks.fromSpec(OUTBOX_SINK),
+        batchSize=int(os.getenv("OUTBOX_BATCH_SIZE", 100)),
+        interval=float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", 1)),
+        retryBase=float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", 1)),
+        retryMax=float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", 300)),
+    )
@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+import urllib.request
+
+
+class MemorySink:
+    """Destination en mémoire (tests, développement): conserve les événements reçus."""
+
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+        self._lock = threading.Lock()
+
+    def send(self, events: list[dict]) -> None:
+        with self._lock:
+            self.events.extend(events)
+
+
+class FileSink:
+    """Ajoute les événements à un fichier NDJSON (un événement par ligne)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def send(self, events: list[dict]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class WebhookSink:
+    """POST JSON {"events": [...]} vers une URL; toute réponse hors 2xx est un échec (lot rejoué)."""
+
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, events: list[dict]) -> None:
+        body = json.dumps({"events": events}, ensure_ascii=False, separators=(",", ":")).encode()
+        request = urllib.request.Request(self.url, data=body, method="POST", headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"Webhook {self.url}: HTTP {response.status}")
+
+
+class OutboxSinks:
+    @staticmethod
+    def fromSpec(spec: str):
+        """
+        Destination décrite par OUTBOX_SINK:
+        - "memory",
+        - "file:/chemin/events.ndjson",
+        - "http://..." ou "https://..." (webhook).
+        """
+        if spec == "memory":
+            return MemorySink()
+        if spec.startswith("file:"):
+            return FileSink(spec[len("file:"):].removeprefix("//"))
+        if spec.startswith(("http://", "https://")):
+            return WebhookSink(spec, timeout=float(os.getenv("OUTBOX_WEBHOOK_TIMEOUT_SECONDS", 10)))
+        raise ValueError(f"OUTBOX_SINK inconnu: {spec}")
@@ -0,0 +1,29 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+
+class Pagination:
+    """
+    Pagination par curseur (keyset) sur le couple (updatedAt, id), tri décroissant.
+
+    Le curseur est opaque pour les clients: JSON [updatedAt ISO, id] encodé en base64 url-safe.
+    """
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+
+    @staticmethod
+    def encodeCursor(updated_at: datetime, course_id: uuid.UUID) -> str:
+        raw = json.dumps([updated_at.isoformat(), str(course_id)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decodeCursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            updated_at, course_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(updated_at), uuid.UUID(course_id)
+        except (ValueError, TypeError):
+            raise ValueError("Curseur de pagination invalide")
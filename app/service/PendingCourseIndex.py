@@ -0,0 +1,242 @@
+import asyncio
+import bisect
+import heapq
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Iterable, Optional
+
+from app.out.CourseOut import CourseOut
+from app.service.CourseEvents import CourseEvents
+from app.service.Geo import Geo
+from app.service.Pagination import Pagination
+
+
+class PendingCourseIndex:
+    """
+    Index en mémoire (par process) des courses au statut "demandée", trié par (updatedAt, id).
+
+    - reconstruit depuis la base au démarrage (rebuild),
+    - maintenu incrémentalement par les événements created / confirmed / cancelled
+      (sous Postgres, LISTEN/NOTIFY propage aussi les écritures des autres instances),
+    - considéré périmé après PENDING_INDEX_MAX_AGE_SECONDS ou après invalidate()
+      (ex: reconnexion LISTEN): la lecture suivante le reconstruit.
+
+    Les courses ayant des coordonnées de départ sont aussi rangées dans une grille
+    (cases de GRID_CELL_DEGREES degrés) pour la recherche des plus proches (nearest).
+
+    version() résume le contenu (nombre de courses, XOR de leurs identifiants): identique
+    d'un process à l'autre pour le même ensemble de courses, il sert d'ETag aux lectures.
+    """
+
+    GRID_CELL_DEGREES = 0.01
+
+    def __init__(self, maxAge: float = 60.0) -> None:
+        self.maxAge = maxAge
+        self.started = False
+        self._courses: dict = {}
+        self._keys: list[tuple] = []
+        self._cells: dict[tuple[int, int], set] = {}
+        self._fingerprint = 0
+        self._builtAt: Optional[float] = None
+        self._loaded = False
+        self._buffer: Optional[list[dict]] = None
+        self._lock = threading.RLock()
+        self._rebuildLock = threading.Lock()
+
+    def start(self) -> None:
+        """Branche l'index sur le flux d'événements (à appeler au démarrage de l'application)."""
+        CourseEvents.addListener(self.apply)
+        self.started = True
+
+    def isLoaded(self) -> bool:
+        """Premier chargement terminé (sonde /ready)."""
+        return self._loaded
+
+    def isStale(self) -> bool:
+        builtAt = self._builtAt
+        return builtAt is None or time.monotonic() - builtAt > self.maxAge
+
+    def invalidate(self) -> None:
+        self._builtAt = None
+
+    def rebuild(self, loader: Callable[[], Iterable]) -> None:
+        """
+        Recharge l'index depuis loader() (les courses "demandées" en base).
+        Les événements reçus pendant le chargement sont rejoués ensuite pour ne rien perdre.
+        """
+        with self._rebuildLock:
+            self._rebuild(loader)
+
+    def ensureFresh(self, loader: Callable[[], Iterable]) -> None:
+        """
+        Reconstruit l'index s'il est périmé. Un seul thread recharge à la fois;
+        les autres continuent de servir la version courante si elle existe déjà.
+        """
+        if not self.isStale():
+            return
+        if not self._rebuildLock.acquire(blocking=not self._loaded):
+            return
+        try:
+            if self.isStale():
+                self._rebuild(loader)
+        finally:
+            self._rebuildLock.release()
+
+    async def ensureFreshAsync(self, loader: Callable[[], Awaitable[Iterable]]) -> None:
+        """
+        Équivalent asyncio de ensureFresh (loader coroutine, ex: AsyncSession du primaire):
+        ni le chargement ni l'attente d'un premier chargement en cours ne bloquent la boucle.
+        """
+        while self.isStale():
+            if self._rebuildLock.acquire(blocking=False):
+                try:
+                    if self.isStale():
+                        self._beginRebuild()
+                        try:
+                            courses = [CourseOut.model_validate(course) for course in await loader()]
+                        except BaseException:
+                            self._cancelRebuild()
+                            raise
+                        self._finishRebuild(courses)
+                finally:
+                    self._rebuildLock.release()
+                return
+            if self._loaded:
+                return
+            await asyncio.sleep(0.01)
+
+    def _rebuild(self, loader: Callable[[], Iterable]) -> None:
+        self._beginRebuild()
+        try:
+            courses = [CourseOut.model_validate(course) for course in loader()]
+        except BaseException:
+            self._cancelRebuild()
+            raise
+        self._finishRebuild(courses)
+
+    def _beginRebuild(self) -> None:
+        # Événements reçus pendant le chargement: mis de côté, rejoués ensuite pour ne rien perdre
+        with self._lock:
+            self._buffer = []
+
+    def _cancelRebuild(self) -> None:
+        with self._lock:
+            self._buffer = None
+
+    def _finishRebuild(self, courses: list[CourseOut]) -> None:
+        with self._lock:
+            self._courses = {}
+            self._keys = []
+            self._cells = {}
+            self._fingerprint = 0
+            for course in courses:
+                self._insert(course)
+            self._builtAt = time.monotonic()
+            self._loaded = True
+            # Rejoués après la date de construction: un "resync" reçu entre-temps invalide bien l'index
+            buffered, self._buffer = self._buffer, None
+            for event in buffered:
+                self._apply(event)
+
+    def apply(self, event: dict) -> None:
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.append(event)
+            else:
+                self._apply(event)
+
+    def page(self, limit: Optional[int], cursor: Optional[str]) -> list[CourseOut]:
+        """Même contrat que la pagination keyset en base: tri décroissant, reprise après le curseur."""
+        with self._lock:
+            end = len(self._keys)
+            if cursor:
+                updated_at, course_id = Pagination.decodeCursor(cursor)
+                end = bisect.bisect_left(self._keys, (self._utc(updated_at), course_id))
+            start = 0 if limit is None else max(0, end - limit)
+            return [self._courses[key[1]][1] for key in reversed(self._keys[start:end])]
+
+    def nearest(self, lat: float, lon: float, radiusKm: float, limit: int) -> list[tuple[CourseOut, float]]:
+        """Les `limit` courses les plus proches de (lat, lon) dans le rayon, en couples (course, distance_km)."""
+        min_lat, max_lat, min_lon, max_lon = Geo.boundingBox(lat, lon, radiusKm)
+        rows = range(self._cell(min_lat), self._cell(max_lat) + 1)
+        cols = range(self._cell(min_lon), self._cell(max_lon) + 1)
+
+        candidates = []
+        with self._lock:
+            if len(rows) * len(cols) <= len(self._cells):
+                cells = (self._cells.get((row, col)) for row in rows for col in cols)
+            else:
+                # Rayon large / index peu rempli: parcourir les cases occupées
+                cells = (ids for (row, col), ids in self._cells.items() if row in rows and col in cols)
+            for ids in cells:
+                for courseId in ids or ():
+                    course = self._courses[courseId][1]
+                    distance = Geo.distanceKm(lat, lon, course.depart_lat, course.depart_lon)
+                    if distance <= radiusKm:
+                        candidates.append((round(distance, 3), course))
+        return [(course, distance) for distance, course in heapq.nsmallest(limit, candidates, key=lambda c: (c[0], c[1].id))]
+
+    def version(self) -> str:
+        with self._lock:
+            return f"{len(self._courses)}:{self._fingerprint:032x}"
+
+    def __len__(self) -> int:
+        return len(self._courses)
+
+    def _apply(self, event: dict) -> None:
+        eventType = event.get("type")
+        if eventType == "resync":
+            self.invalidate()
+            return
+
+        course = CourseOut.model_validate(event["course"])
+        self._remove(course.id)
+        if eventType == CourseEvents.CREATED:
+            self._insert(course)
+
+    def _insert(self, course: CourseOut) -> None:
+        key = (self._utc(course.updatedAt), course.id)
+        self._courses[course.id] = (key, course)
+        self._fingerprint ^= course.id.int
+        bisect.insort(self._keys, key)
+        if course.depart_lat is not None and course.depart_lon is not None:
+            self._cells.setdefault(self._gridCell(course), set()).add(course.id)
+
+    @staticmethod
+    def _utc(value: datetime) -> datetime:
+        # Les dates naïves de l'application sont en UTC (datetime.utcnow)
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+    def _remove(self, courseId) -> None:
+        entry = self._courses.pop(courseId, None)
+        if entry is not None:
+            self._fingerprint ^= courseId.int
+            index = bisect.bisect_left(self._keys, entry[0])
+            del self._keys[index]
+            course = entry[1]
+            if course.depart_lat is not None and course.depart_lon is not None:
+                cell = self._gridCell(course)
+                ids = self._cells.get(cell)
+                if ids is not None:
+                    ids.discard(courseId)
+                    if not ids:
+                        del self._cells[cell]
+
+    @classmethod
+    def _cell(cls, degrees: float) -> int:
+        return math.floor(degrees / cls.GRID_CELL_DEGREES)
+
+    @classmethod
+    def _gridCell(cls, course: CourseOut) -> tuple[int, int]:
+        return cls._cell(course.depart_lat), cls._cell(course.depart_lon)
+
+
+# PENDING_INDEX_ENABLED=false pour servir /course/pending directement depuis la base
+PENDING_INDEX_ENABLED = os.getenv("PENDING_INDEX_ENABLED", "true").lower() == "true"
+
+pendingCourseIndex = PendingCourseIndex(
+    maxAge=float(os.getenv("PENDING_INDEX_MAX_AGE_SECONDS", 60)),
+)
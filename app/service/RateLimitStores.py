@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.service.Metrics import registry
+
+RATE_LIMIT_LOCK_TIMEOUTS = registry.counter(
+    "rate_limit_lock_timeouts_total", "Requêtes acceptées sans décompte: verrou des seaux partagés non obtenu à temps",
+)
+
+
+class MemoryBucketStore:
+    """
+    Seaux à jetons du process (un worker).
+
+    Chaque seau est réduit à une date: l'instant où il sera de nouveau plein (GCRA). Un seau plein
+    équivaut à une clé absente: les entrées dont la date est passée sont purgées au fil de l'eau,
+    en tête (ordre des derniers accès), et la table ne dépasse jamais `maxsize` clés.
+    """
+
+    def __init__(self, maxsize: int = 100000) -> None:
+        self.maxsize = maxsize
+        self._fullAt: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Prend `cost` jetons du seau `key` (`rate` jetons/s, `burst` au plus): 0 si accepté, sinon secondes à attendre."""
+        now = time.monotonic()
+        with self._lock:
+            fullAt = max(self._fullAt.get(key, now), now) + cost / rate
+            excess = fullAt - now - burst / rate
+            if excess > 0:
+                return excess
+            self._fullAt[key] = fullAt
+            self._fullAt.move_to_end(key)
+            self._purge(now)
+        return 0.0
+
+    def _purge(self, now: float) -> None:
+        while self._fullAt:
+            key, fullAt = next(iter(self._fullAt.items()))
+            if fullAt > now and len(self._fullAt) <= self.maxsize:
+                break
+            del self._fullAt[key]
+
+    def __len__(self) -> int:
+        return len(self._fullAt)
+
+
+class SharedBucketStore:
+    """
+    Seaux à jetons partagés par les workers d'un même hôte (python -m app.server).
+
+    Table de taille fixe en mémoire partagée (mmap anonyme, créé avant le fork des workers):
+    16 octets par emplacement, empreinte de la clé et date de seau plein, comme MemoryBucketStore.
+    Adressage ouvert sur PROBES emplacements: un emplacement dont le seau est plein est libre;
+    à défaut, celui qui se remplit le plus tôt est réutilisé (la clé évincée repart d'un seau plein).
+
+    Le verrou est partagé entre process et pris sur la boucle d'événements: la section critique
+    dure quelques microsecondes, l'attente est bornée à LOCK_TIMEOUT_SECONDS. Au-delà (worker
+    arrêté en pleine mise à jour: le verrou n'est plus jamais rendu), la requête est acceptée
+    sans décompte plutôt que de refuser tout le trafic, et comptée dans
+    rate_limit_lock_timeouts_total (à surveiller: la limitation ne s'applique plus).
+    """
+
+    PROBES = 8
+    LOCK_TIMEOUT_SECONDS = 0.002
+
+    def __init__(self, slots: int = 65536) -> None:
+        import mmap
+        import multiprocessing
+
+        self.slots = slots
+        self._memory = mmap.mmap(-1, slots * 16)
+        self._hashes = memoryview(self._memory)[:slots * 8].cast("Q")
+        self._fullAt = memoryview(self._memory)[slots * 8:].cast("d")
+        self._lock = multiprocessing.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Voir MemoryBucketStore.take."""
+        # Empreinte 64 bits non nulle (0: emplacement jamais utilisé)
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+        start = digest % self.slots
+        now = time.monotonic()
+        if not self._lock.acquire(timeout=self.LOCK_TIMEOUT_SECONDS):
+            RATE_LIMIT_LOCK_TIMEOUTS.inc()
+            return 0.0
+        try:
+            slot = None
+            victim = start
+            for probe in range(self.PROBES):
+                index = (start + probe) % self.slots
+                if self._hashes[index] == digest:
+                    slot = index
+                    break
+                if self._fullAt[index] < self._fullAt[victim]:
+                    victim = index
+
+            current = max(self._fullAt[slot], now) if slot is not None else now
+            fullAt = current + cost / rate
+            excess = fullAt - now - burst / rate
+            if excess > 0:
+                return excess
+            if slot is None:
+                slot = victim
+                self._hashes[slot] = digest
+            self._fullAt[slot] = fullAt
+            return 0.0
+        finally:
+            self._lock.release()
+
+
+class RateLimitStores:
+    @staticmethod
+    def fromSpec(spec: str, size: int):
+        """
+        Seaux décrits par RATE_LIMIT_BACKEND:
+        - "memory": par worker (chaque worker applique le budget complet),
+        - "shared": partagés par les workers de l'hôte (créés avant le fork).
+        """
+        if spec == "memory":
+            return MemoryBucketStore(maxsize=size)
+        if spec == "shared":
+            return SharedBucketStore(slots=size)
+        raise ValueError(f"RATE_LIMIT_BACKEND inconnu: {spec}")
@@ -0,0 +1,100 @@
+import os
+from typing import Optional
+
+from app.service.RateLimitStores import RateLimitStores
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# "memory" (par worker) ou "shared" (partagé par les workers de python -m app.server)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+# Clés suivies (memory) ou emplacements de la table partagée (shared)
+RATE_LIMIT_SIZE = int(os.getenv("RATE_LIMIT_SIZE", 65536))
+
+# Budgets par défaut, par utilisateur: (nom, méthode, préfixe du chemin, jetons/s, rafale).
+# Première règle correspondante; les chemins hors /course (/metrics, /ready, /docs) ne sont pas limités.
+DEFAULT_RULES = (
+    ("pending", "GET", "/course/pending", 2.0, 10.0),
+    ("my", "GET", "/course/my", 5.0, 20.0),
+    ("export", "GET", "/course/export", 0.1, 3.0),
+    ("stats", "GET", "/course/stats", 2.0, 20.0),
+    ("claim", "POST", "/course/claim-next", 2.0, 10.0),
+    ("write", "POST", "/course", 5.0, 20.0),
+    ("default", None, "/course", 10.0, 50.0),
+)
+
+
+class RateLimitRule:
+    """Budget d'un groupe de routes: seau de `burst` jetons rechargé de `rate` jetons par seconde."""
+
+    __slots__ = ("name", "method", "prefix", "rate", "burst")
+
+    def __init__(self, name: str, method: Optional[str], prefix: str, rate: float, burst: float) -> None:
+        self.name = name
+        self.method = method
+        self.prefix = prefix
+        self.rate = rate
+        self.burst = burst
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and path.startswith(self.prefix)
+
+
+class RateLimiter:
+    """
+    Limitation de débit par utilisateur (id du JWT) et par groupe de routes, en seaux à jetons.
+
+    Le budget d'une règle est multiplié par le facteur le plus élevé des rôles de l'utilisateur
+    (RATE_LIMIT_ROLE_FACTORS); les requêtes sans token valide sont comptées par adresse IP.
+    """
+
+    def __init__(self, rules: list[RateLimitRule], store, roleFactors: Optional[dict[str, float]] = None) -> None:
+        self.rules = rules
+        self.store = store
+        self.roleFactors = roleFactors or {}
+
+    def rule(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def take(self, rule: RateLimitRule, identity: str, roles: list) -> float:
+        """Consomme un jeton de `identity` pour `rule`: 0 si la requête passe, sinon secondes avant de réessayer."""
+        factor = max((self.roleFactors.get(role, 1.0) for role in roles), default=1.0)
+        return self.store.take(f"{rule.name}:{identity}", rule.rate * factor, rule.burst * factor)
+
+    @staticmethod
+    def parseRules(spec: str) -> list[RateLimitRule]:
+        """Règles par défaut, budgets remplacés par RATE_LIMIT_BUDGETS ("pending=1/5,export=0.05/2": jetons/s / rafale)."""
+        budgets = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, budget = item.partition("=")
+            rate, _, burst = budget.partition("/")
+            budgets[name.strip()] = (float(rate), float(burst or rate))
+
+        unknown = set(budgets) - {name for name, *_ in DEFAULT_RULES}
+        if unknown:
+            raise ValueError(f"RATE_LIMIT_BUDGETS: règles inconnues {', '.join(sorted(unknown))}")
+        return [
+            RateLimitRule(name, method, prefix, *budgets.get(name, (rate, burst)))
+            for name, method, prefix, rate, burst in DEFAULT_RULES
+        ]
+
+    @staticmethod
+    def parseFactors(spec: str) -> dict[str, float]:
+        """RATE_LIMIT_ROLE_FACTORS: "admin=10,driver=2"."""
+        factors = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            role, _, factor = item.partition("=")
+            factors[role.strip()] = float(factor)
+        return factors
+
+    @staticmethod
+    def fromEnv() -> Optional["RateLimiter"]:
+        """Limiteur configuré par les variables RATE_LIMIT_* (None si RATE_LIMIT_ENABLED=false)."""
+        if not RATE_LIMIT_ENABLED:
+            return None
+        return RateLimiter(
+            RateLimiter.parseRules(os.getenv("RATE_LIMIT_BUDGETS", "")),
+            RateLimitStores.fromSpec(RATE_LIMIT_BACKEND, RATE_LIMIT_SIZE),
+            RateLimiter.parseFactors(os.getenv("RATE_LIMIT_ROLE_FACTORS", "admin=10")),
+        )
@@ -0,0 +1,38 @@
+import hashlib
+import mmap
+import time
+from typing import Optional
+
+
+class ReadYourWrites:
+    """
+    Mémorise les utilisateurs ayant écrit récemment pour que leurs lectures restent sur le primaire
+    pendant `window` secondes (le temps que les réplicas rattrapent leur retard).
+
+    Table de taille fixe en mémoire partagée (mmap anonyme, créé à l'import de Database, donc avant
+    le fork des workers de python -m app.server): une écriture sur un worker est vue par tous.
+    Chaque emplacement garde la fin de fenêtre (horloge monotone, commune aux process de l'hôte)
+    des utilisateurs dont l'empreinte y tombe: une collision garde un autre utilisateur sur
+    le primaire un peu plus longtemps, jamais l'inverse (pas de lecture périmée).
+    """
+
+    def __init__(self, window: float = 5.0, slots: int = 65536) -> None:
+        self.window = window
+        self.slots = slots
+        self._memory = mmap.mmap(-1, slots * 8)
+        self._until = memoryview(self._memory).cast("d")
+
+    def recordWrite(self, user_id: Optional[str]) -> None:
+        if not user_id or self.window <= 0:
+            return
+        # Fenêtre identique pour tous: la nouvelle fin est toujours la plus tardive, pas de verrou
+        self._until[self._slot(user_id)] = time.monotonic() + self.window
+
+    def isSticky(self, user_id: Optional[str]) -> bool:
+        if not user_id or self.window <= 0:
+            return False
+        return self._until[self._slot(user_id)] > time.monotonic()
+
+    def _slot(self, user_id: str) -> int:
+        digest = hashlib.blake2b(str(user_id).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.slots
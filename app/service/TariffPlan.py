@@ -0,0 +1,49 @@
+from datetime import datetime, time, timezone
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class TimeBand(BaseModel):
+    """Plage horaire (heure locale du départ) et son coefficient; start > end = plage à cheval sur minuit."""
+    start: time
+    end: time
+    multiplier: float = Field(gt=0)
+
+    def startSeconds(self) -> int:
+        return self.start.hour * 3600 + self.start.minute * 60 + self.start.second
+
+    def endSeconds(self) -> int:
+        return self.end.hour * 3600 + self.end.minute * 60 + self.end.second
+
+
+class TariffPlan(BaseModel):
+    """
+    Grille tarifaire versionnée, applicable aux courses démarrées à partir de validFrom.
+
+    tarif = max(minimum, (base + perMinute * minutes + perKm * km) * coefficient horaire * surge)
+    """
+    version: str
+    validFrom: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    timezone: str = "Europe/Paris"
+    base: float = Field(default=5.0, ge=0)
+    perMinute: float = Field(default=2.0, ge=0)
+    perKm: float = Field(default=0.0, ge=0)
+    minimum: float = Field(default=0.0, ge=0)
+    surge: float = Field(default=1.0, gt=0)
+    timeBands: list[TimeBand] = []
+
+    @field_validator("validFrom")
+    @classmethod
+    def _utc(cls, value: datetime) -> datetime:
+        # Dates sans fuseau: UTC, comme les dates de course
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def bandMultiplier(self, secondsOfDay: int) -> float:
+        for band in self.timeBands:
+            start, end = band.startSeconds(), band.endSeconds()
+            inside = start <= secondsOfDay < end if start <= end else (secondsOfDay >= start or secondsOfDay < end)
+            if inside:
+                return band.multiplier
+        return 1.0
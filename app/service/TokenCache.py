@@ -0,0 +1,30 @@
+import hashlib
+import time
+from typing import Optional
+
+from app.service.TtlLruCache import TtlLruCache
+
+
+class TokenCache(TtlLruCache):
+    """
+    Cache LRU borné des payloads JWT déjà vérifiés.
+
+    - clé: empreinte SHA-256 du token (le token brut n'est pas conservé),
+    - une entrée expire au plus tard à l'`exp` du token, et au plus après `ttl` secondes.
+    """
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        payload = super().get(self._key(token))
+        return None if payload is None else dict(payload)
+
+    def set(self, token: str, payload: dict) -> None:
+        # exp est une date murale: convertie en durée restante pour l'horloge monotone du cache
+        ttl = self.ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        super().set(self._key(token), dict(payload), ttl)
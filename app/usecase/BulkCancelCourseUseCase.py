@@ -0,0 +1,37 @@
+from app.command.BulkCancelCourseCommand import BulkCancelCourseCommand
+from app.out.BulkResultOut import BulkItemOut, BulkResultOut
+from app.out.CourseOut import CourseOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
+from app.repository.CourseRepository import CourseRepository
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+
+class BulkCancelCourseUseCase:
+    def __init__(self) -> None:
+        self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: BulkCancelCourseCommand) -> BulkResultOut:
+        with UseCaseErrors.toHttp():
+            results = self.courseRepository.cancelCourses(command.course_ids, command.userConnected or {})
+
+        return self._report(command, results)
+
+    async def executeAsync(self, command: BulkCancelCourseCommand) -> BulkResultOut:
+        with UseCaseErrors.toHttp():
+            results = await self.asyncCourseRepository.cancelCourses(command.course_ids, command.userConnected or {})
+
+        return self._report(command, results)
+
+    def _report(self, command: BulkCancelCourseCommand, results: dict) -> BulkResultOut:
+        # Le dépôt renvoie, par identifiant, la course mise à jour ou le message d'erreur
+        items = []
+        for index, course_id in enumerate(command.course_ids):
+            outcome = results[course_id]
+            if isinstance(outcome, str):
+                items.append(BulkItemOut(index=index, course_id=course_id, error=outcome))
+            else:
+                items.append(BulkItemOut(index=index, course_id=course_id, course=CourseOut.model_validate(outcome)))
+
+        failed = sum(1 for item in items if item.error is not None)
+        return BulkResultOut(succeeded=len(items) - failed, failed=failed, results=items)
@@ -0,0 +1,51 @@
+from pydantic import ValidationError
+
+from app.command.BulkCreateCourseCommand import BulkCreateCourseCommand
+from app.command.CreateCourseCommand import CreateCourseCommand
+from app.out.BulkResultOut import BulkItemOut, BulkResultOut
+from app.out.CourseOut import CourseOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
+from app.repository.CourseRepository import CourseRepository
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+
+class BulkCreateCourseUseCase:
+    def __init__(self) -> None:
+        self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: BulkCreateCourseCommand) -> BulkResultOut:
+        valid, errors = self._validate(command)
+        with UseCaseErrors.toHttp():
+            entities = self.courseRepository.createCourses([item for _, item in valid], command.userConnected or {})
+
+        return self._report(valid, errors, entities)
+
+    async def executeAsync(self, command: BulkCreateCourseCommand) -> BulkResultOut:
+        valid, errors = self._validate(command)
+        with UseCaseErrors.toHttp():
+            entities = await self.asyncCourseRepository.createCourses([item for _, item in valid], command.userConnected or {})
+
+        return self._report(valid, errors, entities)
+
+    def _validate(self, command: BulkCreateCourseCommand) -> tuple[list[tuple[int, CreateCourseCommand]], list[BulkItemOut]]:
+        # Validation élément par élément avec le modèle de création unitaire
+        valid, errors = [], []
+        for index, raw in enumerate(command.courses):
+            try:
+                valid.append((index, CreateCourseCommand.model_validate(raw)))
+            except ValidationError as e:
+                detail = "; ".join(f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors())
+                errors.append(BulkItemOut(index=index, error=detail))
+        return valid, errors
+
+    def _report(self, valid: list, errors: list[BulkItemOut], entities: list) -> BulkResultOut:
+        created = [
+            BulkItemOut(index=index, course_id=entity.id, course=CourseOut.model_validate(entity))
+            for (index, _), entity in zip(valid, entities)
+        ]
+        return BulkResultOut(
+            succeeded=len(created),
+            failed=len(errors),
+            results=sorted(created + errors, key=lambda item: item.index),
+        )
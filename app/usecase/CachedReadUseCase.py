@@ -0,0 +1,95 @@
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.out.CoursePageJson import CoursePageJson
+from app.out.CoursePageOut import CoursePageOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
+from app.repository.CourseRepository import CourseRepository
+from app.service.TtlLruCache import TtlLruCache
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+# Pages gardées en mémoire par process (0: cache désactivé, seuls l'ETag et le 304 restent)
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 10000))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+
+# Partagé par toutes les requêtes du process
+responseCache = TtlLruCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+# Les clients doivent revalider à chaque fois (If-None-Match), aucun cache partagé
+CACHE_CONTROL = "private, no-cache"
+
+
+class CachedReadUseCase:
+    """
+    Enveloppe un use case de lecture paginée (GET /course/my, GET /course/pending) pour les
+    requêtes conditionnelles:
+    - la version des données lues (requête d'agrégat sur index, ou index en mémoire) donne l'ETag,
+      avec l'utilisateur, ses rôles et les paramètres de la requête,
+    - If-None-Match correspondant: 304 sans lire ni sérialiser la page,
+    - sinon la page est servie depuis responseCache, ou calculée par le use case puis mise en cache.
+
+    Toute création ou transition change la version: un ETag n'est jamais associé à des données périmées.
+    Instance unique par route: la commande et If-None-Match sont passés à execute().
+    """
+
+    def __init__(self, useCase, scope: str) -> None:
+        self.useCase = useCase
+        self.scope = scope
+        self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: BaseModel, ifNoneMatch: Optional[str] = None) -> CoursePageOut | CoursePageJson:
+        userConnected = command.userConnected or {}
+        with UseCaseErrors.toHttp():
+            if self.scope == "pending":
+                version = self.courseRepository.getPendingCoursesVersion(userConnected)
+            else:
+                version = self.courseRepository.getMyCoursesVersion(userConnected)
+
+        etag = self._etag(command, version)
+        page = self._cached(etag, ifNoneMatch)
+        if page is None:
+            page = self.useCase.execute(command)
+            responseCache.set(etag, page)
+        return page.model_copy(update={"etag": etag})
+
+    async def executeAsync(self, command: BaseModel, ifNoneMatch: Optional[str] = None) -> CoursePageOut | CoursePageJson:
+        userConnected = command.userConnected or {}
+        with UseCaseErrors.toHttp():
+            if self.scope == "pending":
+                version = await self.asyncCourseRepository.getPendingCoursesVersion(userConnected)
+            else:
+                version = await self.asyncCourseRepository.getMyCoursesVersion(userConnected)
+
+        etag = self._etag(command, version)
+        page = self._cached(etag, ifNoneMatch)
+        if page is None:
+            page = await self.useCase.executeAsync(command)
+            responseCache.set(etag, page)
+        return page.model_copy(update={"etag": etag})
+
+    def _etag(self, command: BaseModel, version: str) -> str:
+        userConnected = command.userConnected or {}
+        roles = ",".join(sorted(userConnected.get("roles", [])))
+        payload = command.model_dump_json(exclude={"userConnected"})
+        key = f"{self.scope}\n{userConnected.get('id')}\n{roles}\n{version}\n{payload}"
+        return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+    def _cached(self, etag: str, ifNoneMatch: Optional[str]) -> Optional[CoursePageOut | CoursePageJson]:
+        if self._matches(etag, ifNoneMatch):
+            raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+        return responseCache.get(etag)
+
+    @staticmethod
+    def _matches(etag: str, ifNoneMatch: Optional[str]) -> bool:
+        # Comparaison faible (RFC 9110): W/"x" et "x" désignent la même représentation
+        if not ifNoneMatch:
+            return False
+        if ifNoneMatch.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in ifNoneMatch.split(","))
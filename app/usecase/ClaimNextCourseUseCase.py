@@ -0,0 +1,30 @@
+from fastapi import HTTPException
+
+from app.command.ClaimNextCourseCommand import ClaimNextCourseCommand
+from app.out.CourseOut import CourseOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
+from app.repository.CourseRepository import CourseRepository
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+
+class ClaimNextCourseUseCase:
+    def __init__(self) -> None:
+        self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: ClaimNextCourseCommand) -> CourseOut:
+        with UseCaseErrors.toHttp():
+            entity = self.courseRepository.claimNextCourse(command.userConnected or {}, command.order)
+
+        return self._toOut(entity)
+
+    async def executeAsync(self, command: ClaimNextCourseCommand) -> CourseOut:
+        with UseCaseErrors.toHttp():
+            entity = await self.asyncCourseRepository.claimNextCourse(command.userConnected or {}, command.order)
+
+        return self._toOut(entity)
+
+    def _toOut(self, entity) -> CourseOut:
+        if entity is None:
+            raise HTTPException(status_code=404, detail="Aucune course en attente")
+        return CourseOut.model_validate(entity)
@@ -1,23 +1,25 @@
 import uuid
-from fastapi import HTTPException
 
 from app.command.ConfirmCourseCommand import ConfirmCourseCommand
 from app.out.CourseOut import CourseOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
 from app.repository.CourseRepository import CourseRepository
+from app.usecase.UseCaseErrors import UseCaseErrors
 
 
 class ConfirmCourseUseCase:
-    def __init__(self, course_id: uuid.UUID, command: ConfirmCourseCommand) -> None:
-        self.course_id = course_id
-        self.command = command
+    def __init__(self) -> None:
         self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
 
-    def execute(self) -> CourseOut:
-        try:
-            entity = self.courseRepository.confirmCourse(self.course_id, self.command.userConnected or {})
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+    def execute(self, course_id: uuid.UUID, command: ConfirmCourseCommand) -> CourseOut:
+        with UseCaseErrors.toHttp():
+            entity = self.courseRepository.confirmCourse(course_id, command.userConnected or {})
 
-        return CourseOut.model_validate(entity)
\ No newline at end of file
+        return CourseOut.model_validate(entity)
+
+    async def executeAsync(self, course_id: uuid.UUID, command: ConfirmCourseCommand) -> CourseOut:
+        with UseCaseErrors.toHttp():
+            entity = await self.asyncCourseRepository.confirmCourse(course_id, command.userConnected or {})
+
+        return CourseOut.model_validate(entity)
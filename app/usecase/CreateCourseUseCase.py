@@ -1,21 +1,23 @@
-from fastapi import HTTPException
-
 from app.command.CreateCourseCommand import CreateCourseCommand
 from app.out.CourseOut import CourseOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
 from app.repository.CourseRepository import CourseRepository
+from app.usecase.UseCaseErrors import UseCaseErrors
 
 
 class CreateCourseUseCase:
-    def __init__(self, command: CreateCourseCommand) -> None:
-        self.command = command
+    def __init__(self) -> None:
         self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: CreateCourseCommand) -> CourseOut:
+        with UseCaseErrors.toHttp():
+            entity = self.courseRepository.createCourse(command)
+
+        return CourseOut.model_validate(entity)
 
-    def execute(self) -> CourseOut:
-        try:
-            entity = self.courseRepository.createCourse(self.command)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+    async def executeAsync(self, command: CreateCourseCommand) -> CourseOut:
+        with UseCaseErrors.toHttp():
+            entity = await self.asyncCourseRepository.createCourse(command)
 
-        return CourseOut.model_validate(entity)
\ No newline at end of file
+        return CourseOut.model_validate(entity)
@@ -0,0 +1,59 @@
+from typing import AsyncIterator, Iterator
+
+from app.command.ExportCoursesCommand import ExportCoursesCommand
+from app.models.Course import CourseStatus
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
+from app.repository.CourseRepository import CourseRepository
+from app.service.CourseSerializer import CourseSerializer
+from app.service.Database import Database
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+# Type de contenu de la réponse, par format d'export
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+class ExportCoursesUseCase:
+    """
+    Export en flux de l'historique des courses de l'utilisateur (NDJSON ou CSV).
+
+    La requête est construite et vérifiée avant la réponse (erreurs 400 / 500 habituelles);
+    les courses sont ensuite lues par blocs (curseur côté serveur) et sérialisées au fil de
+    l'envoi, sans jamais charger tout l'historique en mémoire.
+    """
+
+    def __init__(self) -> None:
+        self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: ExportCoursesCommand) -> Iterator[bytes]:
+        return self._stream(command, self._query(command))
+
+    async def executeAsync(self, command: ExportCoursesCommand) -> AsyncIterator[bytes]:
+        return self._streamAsync(command, self._query(command))
+
+    def _query(self, command: ExportCoursesCommand):
+        with UseCaseErrors.toHttp():
+            return self.courseRepository.getMyExportQuery(
+                command.userConnected or {}, command.since, command.until,
+                [CourseStatus(status.value) for status in command.status or []],
+            )
+
+    def _stream(self, command: ExportCoursesCommand, query) -> Iterator[bytes]:
+        if command.format == "csv":
+            yield CourseSerializer.dumpCsv([], header=True)
+        with Database.stream_session((command.userConnected or {}).get("id")) as db:
+            for rows in self.courseRepository.streamExport(query, db):
+                yield self._dump(command, rows)
+
+    async def _streamAsync(self, command: ExportCoursesCommand, query) -> AsyncIterator[bytes]:
+        if command.format == "csv":
+            yield CourseSerializer.dumpCsv([], header=True)
+        async with Database.async_stream_session((command.userConnected or {}).get("id")) as db:
+            async for rows in self.asyncCourseRepository.streamExport(query, db):
+                yield self._dump(command, rows)
+
+    @staticmethod
+    def _dump(command: ExportCoursesCommand, rows: list) -> bytes:
+        if command.format == "csv":
+            return CourseSerializer.dumpCsv(rows)
+        return CourseSerializer.dumpNdjson(rows)
@@ -0,0 +1,23 @@
+from app.command.GetDailyCourseStatsCommand import GetDailyCourseStatsCommand
+from app.out.CourseStatsOut import CourseStatsOut
+from app.repository.AsyncCourseStatsRepository import AsyncCourseStatsRepository
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+
+class GetDailyCourseStatsUseCase:
+    def __init__(self) -> None:
+        self.courseStatsRepository = CourseStatsRepository()
+        self.asyncCourseStatsRepository = AsyncCourseStatsRepository()
+
+    def execute(self, command: GetDailyCourseStatsCommand) -> list[CourseStatsOut]:
+        with UseCaseErrors.toHttp():
+            stats = self.courseStatsRepository.getDailyStats(command.userConnected or {}, command.since, command.until)
+
+        return [CourseStatsOut(**row) for row in stats]
+
+    async def executeAsync(self, command: GetDailyCourseStatsCommand) -> list[CourseStatsOut]:
+        with UseCaseErrors.toHttp():
+            stats = await self.asyncCourseStatsRepository.getDailyStats(command.userConnected or {}, command.since, command.until)
+
+        return [CourseStatsOut(**row) for row in stats]
@@ -0,0 +1,43 @@
+from datetime import datetime, time
+
+from app.command.GetDriverCourseStatsCommand import GetDriverCourseStatsCommand
+from app.out.CourseStatsOut import CourseStatsOut
+from app.out.CourseStatsPageOut import CourseStatsPageOut
+from app.repository.AsyncCourseStatsRepository import AsyncCourseStatsRepository
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from app.service.Pagination import Pagination
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+
+class GetDriverCourseStatsUseCase:
+    def __init__(self) -> None:
+        self.courseStatsRepository = CourseStatsRepository()
+        self.asyncCourseStatsRepository = AsyncCourseStatsRepository()
+
+    def execute(self, command: GetDriverCourseStatsCommand) -> CourseStatsPageOut:
+        with UseCaseErrors.toHttp():
+            stats = self.courseStatsRepository.getDriverStats(
+                command.userConnected or {}, command.since, command.until,
+                command.chauffeur_id, command.limit + 1, command.cursor,
+            )
+
+        return self._toPage(command, stats)
+
+    async def executeAsync(self, command: GetDriverCourseStatsCommand) -> CourseStatsPageOut:
+        with UseCaseErrors.toHttp():
+            stats = await self.asyncCourseStatsRepository.getDriverStats(
+                command.userConnected or {}, command.since, command.until,
+                command.chauffeur_id, command.limit + 1, command.cursor,
+            )
+
+        return self._toPage(command, stats)
+
+    def _toPage(self, command: GetDriverCourseStatsCommand, stats: list[dict]) -> CourseStatsPageOut:
+        # Une ligne de plus que la limite a été demandée pour savoir s'il reste une page
+        next_cursor = None
+        if len(stats) > command.limit:
+            stats = stats[:command.limit]
+            last = stats[-1]
+            next_cursor = Pagination.encodeCursor(datetime.combine(last["day"], time()), last["chauffeur_id"])
+
+        return CourseStatsPageOut(items=[CourseStatsOut(**row) for row in stats], next_cursor=next_cursor)
@@ -1,21 +1,47 @@
-from fastapi import HTTPException
-
 from app.command.GetMyCoursesCommand import GetMyCoursesCommand
 from app.out.CourseOut import CourseOut
+from app.out.CoursePageJson import CoursePageJson
+from app.out.CoursePageOut import CoursePageOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
 from app.repository.CourseRepository import CourseRepository
+from app.service.CourseSerializer import FAST_SERIALIZATION, CourseSerializer
+from app.service.Pagination import Pagination
+from app.usecase.UseCaseErrors import UseCaseErrors
 
 
 class GetMyCoursesUseCase:
-    def __init__(self, command: GetMyCoursesCommand) -> None:
-        self.command = command
+    def __init__(self) -> None:
         self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: GetMyCoursesCommand) -> CoursePageOut | CoursePageJson:
+        with UseCaseErrors.toHttp():
+            entities = self.courseRepository.getMyCourses(
+                command.userConnected or {}, command.limit + 1, command.cursor
+            )
+
+        return self._toPage(command, entities)
+
+    async def executeAsync(self, command: GetMyCoursesCommand) -> CoursePageOut | CoursePageJson:
+        with UseCaseErrors.toHttp():
+            entities = await self.asyncCourseRepository.getMyCourses(
+                command.userConnected or {}, command.limit + 1, command.cursor
+            )
+
+        return self._toPage(command, entities)
+
+    def _toPage(self, command: GetMyCoursesCommand, entities: list) -> CoursePageOut | CoursePageJson:
+        # Une ligne de plus que la limite a été demandée pour savoir s'il reste une page
+        next_cursor = None
+        if len(entities) > command.limit:
+            entities = entities[:command.limit]
+            last = entities[-1]
+            next_cursor = Pagination.encodeCursor(last.updatedAt, last.id)
 
-    def execute(self) -> list[CourseOut]:
-        try:
-            entities = self.courseRepository.getMyCourses(self.command.userConnected or {})
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+        if FAST_SERIALIZATION:
+            return CoursePageJson(content=CourseSerializer.dumpList(entities), next_cursor=next_cursor)
 
-        return [CourseOut.model_validate(entity) for entity in entities]
\ No newline at end of file
+        return CoursePageOut(
+            items=[CourseOut.model_validate(entity) for entity in entities],
+            next_cursor=next_cursor,
+        )
@@ -1,21 +1,77 @@
-from fastapi import HTTPException
-
 from app.command.GetPendingCoursesCommand import GetPendingCoursesCommand
 from app.out.CourseOut import CourseOut
+from app.out.CoursePageJson import CoursePageJson
+from app.out.CoursePageOut import CoursePageOut
+from app.out.NearbyCourseOut import NearbyCourseOut
+from app.repository.AsyncCourseRepository import AsyncCourseRepository
 from app.repository.CourseRepository import CourseRepository
+from app.service.CourseSerializer import FAST_SERIALIZATION, CourseSerializer
+from app.service.Pagination import Pagination
+from app.usecase.UseCaseErrors import UseCaseErrors
 
 
 class GetPendingCoursesUseCase:
-    def __init__(self, command: GetPendingCoursesCommand) -> None:
-        self.command = command
+    def __init__(self) -> None:
         self.courseRepository = CourseRepository()
+        self.asyncCourseRepository = AsyncCourseRepository()
+
+    def execute(self, command: GetPendingCoursesCommand) -> CoursePageOut | CoursePageJson:
+        with UseCaseErrors.toHttp():
+            if self._isNearbySearch(command):
+                return self._toNearbyPage(self.courseRepository.getNearestPendingCourses(
+                    command.userConnected or {}, command.lat, command.lon,
+                    command.radius_km, command.limit,
+                ))
+            entities = self.courseRepository.getPendingCourses(
+                command.userConnected or {}, command.limit + 1, command.cursor
+            )
+
+        return self._toPage(command, entities)
+
+    async def executeAsync(self, command: GetPendingCoursesCommand) -> CoursePageOut | CoursePageJson:
+        with UseCaseErrors.toHttp():
+            if self._isNearbySearch(command):
+                return self._toNearbyPage(await self.asyncCourseRepository.getNearestPendingCourses(
+                    command.userConnected or {}, command.lat, command.lon,
+                    command.radius_km, command.limit,
+                ))
+            entities = await self.asyncCourseRepository.getPendingCourses(
+                command.userConnected or {}, command.limit + 1, command.cursor
+            )
+
+        return self._toPage(command, entities)
+
+    def _toPage(self, command: GetPendingCoursesCommand, entities: list) -> CoursePageOut | CoursePageJson:
+        # Une ligne de plus que la limite a été demandée pour savoir s'il reste une page
+        next_cursor = None
+        if len(entities) > command.limit:
+            entities = entities[:command.limit]
+            last = entities[-1]
+            next_cursor = Pagination.encodeCursor(last.updatedAt, last.id)
+
+        if FAST_SERIALIZATION:
+            return CoursePageJson(content=CourseSerializer.dumpList(entities), next_cursor=next_cursor)
+
+        return CoursePageOut(
+            items=[CourseOut.model_validate(entity) for entity in entities],
+            next_cursor=next_cursor,
+        )
+
+    def _isNearbySearch(self, command: GetPendingCoursesCommand) -> bool:
+        if command.lat is None and command.lon is None:
+            return False
+        if command.lat is None or command.lon is None:
+            raise ValueError("lat et lon doivent être renseignés ensemble")
+        if command.cursor:
+            raise ValueError("Le curseur de pagination n'est pas utilisable avec une recherche par position")
+        return True
 
-    def execute(self) -> list[CourseOut]:
-        try:
-            entities = self.courseRepository.getPendingCourses(self.command.userConnected or {})
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+    def _toNearbyPage(self, nearby: list[tuple]) -> CoursePageOut | CoursePageJson:
+        # Les plus proches d'abord, en une seule page (pas de curseur)
+        if FAST_SERIALIZATION:
+            return CoursePageJson(content=CourseSerializer.dumpNearby(nearby))
 
-        return [CourseOut.model_validate(entity) for entity in entities]
\ No newline at end of file
+        return CoursePageOut(items=[
+            NearbyCourseOut(**CourseOut.model_validate(course).model_dump(), distance_km=distance)
+            for course, distance in nearby
+        ])
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import uuid
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.out.CourseOut import CourseOut
+from app.repository.AsyncIdempotencyRepository import AsyncIdempotencyRepository
+from app.repository.IdempotencyRepository import IdempotencyLeaseLost, IdempotencyRepository, current_idempotency_lease
+from app.usecase.UseCaseErrors import UseCaseErrors
+
+# Durée pendant laquelle une Idempotency-Key rejoue la réponse enregistrée
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+# Bail d'une requête en cours: au-delà (worker arrêté brutalement), un nouvel essai reprend la clé.
+# Doit dépasser la durée maximale d'une requête (GRACEFUL_TIMEOUT_SECONDS compris)
+IDEMPOTENCY_LEASE_SECONDS = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", 60))
+# Intervalle de purge des clés expirées (tâche de fond de l'application)
+IDEMPOTENCY_PURGE_INTERVAL_SECONDS = 600
+
+
+class IdempotentUseCase:
+    """
+    Enveloppe un use case d'écriture renvoyant un CourseOut (création, transitions)
+    pour honorer l'en-tête Idempotency-Key:
+    - sans clé (ou sans utilisateur identifié), le use case s'exécute tel quel,
+    - première requête: la clé est réservée (bail de IDEMPOTENCY_LEASE_SECONDS), le use case s'exécute
+      et CourseRepository enregistre sa réponse dans la transaction de l'écriture
+      (IdempotencyRepository.record): pas d'écriture validée sans réponse à rejouer,
+    - rejeu (même utilisateur, même clé, même requête): la réponse enregistrée est renvoyée
+      sans repasser par CourseRepository; 409 tant que la première requête est en cours,
+    - en cas d'erreur, la clé est libérée et l'erreur propagée (un nouvel essai est possible);
+      après un arrêt brutal, un nouvel essai reprend la clé une fois le bail expiré.
+
+    Instance unique par route: la clé et les arguments du use case (commande en dernier) sont passés à execute().
+    """
+
+    def __init__(self, useCase, scope: str) -> None:
+        self.useCase = useCase
+        self.scope = scope
+        self.idempotencyRepository = IdempotencyRepository()
+        self.asyncIdempotencyRepository = AsyncIdempotencyRepository()
+
+    def execute(self, key: Optional[str], *args) -> CourseOut:
+        user_id = self._userId(args)
+        if not key or not user_id:
+            return self.useCase.execute(*args)
+
+        fingerprint = self._fingerprint(args)
+        token = uuid.uuid4().hex
+        with UseCaseErrors.toHttp():
+            record = self.idempotencyRepository.reserve(
+                user_id, key, fingerprint, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_LEASE_SECONDS, token
+            )
+        if record is not None:
+            return self._replay(record, fingerprint)
+
+        lease = current_idempotency_lease.set((user_id, key, token))
+        try:
+            return self.useCase.execute(*args)
+        except BaseException as e:
+            self.idempotencyRepository.release(user_id, key, token)
+            self._raiseIfLeaseLost(e)
+            raise
+        finally:
+            current_idempotency_lease.reset(lease)
+
+    async def executeAsync(self, key: Optional[str], *args) -> CourseOut:
+        user_id = self._userId(args)
+        if not key or not user_id:
+            return await self.useCase.executeAsync(*args)
+
+        fingerprint = self._fingerprint(args)
+        token = uuid.uuid4().hex
+        with UseCaseErrors.toHttp():
+            record = await self.asyncIdempotencyRepository.reserve(
+                user_id, key, fingerprint, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_LEASE_SECONDS, token
+            )
+        if record is not None:
+            return self._replay(record, fingerprint)
+
+        lease = current_idempotency_lease.set((user_id, key, token))
+        try:
+            return await self.useCase.executeAsync(*args)
+        except BaseException as e:
+            await self.asyncIdempotencyRepository.release(user_id, key, token)
+            self._raiseIfLeaseLost(e)
+            raise
+        finally:
+            current_idempotency_lease.reset(lease)
+
+    @staticmethod
+    def _userId(args: tuple) -> str:
+        return str((args[-1].userConnected or {}).get("id") or "")
+
+    def _fingerprint(self, args: tuple) -> str:
+        # Portée: la route et ses paramètres de chemin (ex: "confirm:<course_id>"), puis le corps de la requête
+        scope = ":".join([self.scope, *(str(arg) for arg in args[:-1])])
+        payload = args[-1].model_dump_json(exclude={"userConnected"})
+        return hashlib.sha256(f"{scope}\n{payload}".encode()).hexdigest()
+
+    def _replay(self, record, fingerprint: str) -> CourseOut:
+        if record.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key déjà utilisée pour une autre requête")
+        if record.response is None:
+            raise HTTPException(status_code=409, detail="Une requête avec cette Idempotency-Key est en cours de traitement")
+        return CourseOut.model_validate_json(record.response)
+
+    @staticmethod
+    def _raiseIfLeaseLost(error: BaseException) -> None:
+        # Bail repris par un nouvel essai pendant l'écriture (annulée): c'est cet essai qui fait foi.
+        # Le use case a converti l'erreur en 500, la cause reste dans __context__
+        if isinstance(error, IdempotencyLeaseLost) or isinstance(error.__context__, IdempotencyLeaseLost):
+            raise HTTPException(status_code=409, detail="Une requête avec cette Idempotency-Key est en cours de traitement")
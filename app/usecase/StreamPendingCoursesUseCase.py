@@ -0,0 +1,80 @@
+import asyncio
+import json
+from typing import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from app.command.GetPendingCoursesCommand import GetPendingCoursesCommand
+from app.out.CoursePageJson import CoursePageJson
+from app.service.CourseEventBus import CourseEventBus
+from app.service.CourseEvents import CourseEvents
+from app.service.Database import Database
+from app.service.Pagination import Pagination
+from app.usecase.GetPendingCoursesUseCase import GetPendingCoursesUseCase
+
+
+class StreamPendingCoursesUseCase:
+    """
+    Flux Server-Sent Events des courses en attente pour les drivers:
+    l'ensemble courant ("snapshot") une fois, puis uniquement les deltas
+    ("created", "confirmed", "cancelled").
+    """
+
+    KEEPALIVE_SECONDS = 15
+
+    def __init__(self) -> None:
+        self.getPendingCoursesUseCase = GetPendingCoursesUseCase()
+
+    async def executeAsync(self, command: GetPendingCoursesCommand) -> AsyncIterator[str]:
+        # S'abonner avant de lire l'état courant: aucun delta ne peut être manqué entre les deux
+        queue = CourseEvents.subscribe()
+        try:
+            snapshot = await self._snapshot(command)
+        except BaseException:
+            CourseEvents.unsubscribe(queue)
+            raise
+
+        return self._stream(command, queue, snapshot)
+
+    async def _snapshot(self, command: GetPendingCoursesCommand) -> list[dict]:
+        # Les vérifications de rôle (HTTPException 400) sont celles de GetPendingCoursesUseCase
+        courses = []
+        cursor = None
+        while True:
+            pageCommand = command.model_copy(update={"limit": Pagination.MAX_LIMIT, "cursor": cursor})
+            if Database.is_async():
+                page = await self.getPendingCoursesUseCase.executeAsync(pageCommand)
+            else:
+                page = await run_in_threadpool(self.getPendingCoursesUseCase.execute, pageCommand)
+
+            # Pages déjà sérialisées (FAST_SERIALIZATION) ou CourseOut: mêmes objets JSON
+            if isinstance(page, CoursePageJson):
+                courses += json.loads(page.content)
+            else:
+                courses += [course.model_dump(mode="json") for course in page.items]
+            if not page.next_cursor:
+                return courses
+            cursor = page.next_cursor
+
+    async def _stream(self, command: GetPendingCoursesCommand, queue: asyncio.Queue, snapshot: list[dict]) -> AsyncIterator[str]:
+        try:
+            yield self._format("snapshot", snapshot)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if event["type"] == CourseEventBus.RESYNC["type"]:
+                    snapshot = await self._snapshot(command)
+                    yield self._format("snapshot", snapshot)
+                    continue
+
+                yield self._format(event["type"], event["course"])
+        finally:
+            CourseEvents.unsubscribe(queue)
+
+    @staticmethod
+    def _format(eventType: str, data) -> str:
+        return f"event: {eventType}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
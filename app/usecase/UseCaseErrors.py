@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi import HTTPException
+
+
+class UseCaseErrors:
+    """
+    Traduction commune des erreurs des dépôts en réponses HTTP, pour execute et executeAsync:
+    - ValueError (règle métier, droits, état de la course): 400 avec le message du dépôt,
+    - toute autre erreur: 500 "Erreur interne du serveur" (cause gardée dans __context__).
+
+    Usage:
+        with UseCaseErrors.toHttp():
+            entity = self.courseRepository.confirmCourse(...)
+    """
+
+    @staticmethod
+    @contextmanager
+    def toHttp() -> Iterator[None]:
+        try:
+            yield
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception:
+            raise HTTPException(status_code=500, detail="Erreur interne du serveur")
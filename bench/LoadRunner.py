@@ -0,0 +1,113 @@
+import http.client
+import json
+import math
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+
+class QueryCounter:
+    """Compte les requêtes SQL exécutées par un ou plusieurs engines SQLAlchemy."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def attach(self, engine) -> None:
+        from sqlalchemy import event
+
+        event.listen(engine, "before_cursor_execute", self._onExecute)
+
+    def _onExecute(self, *args) -> None:
+        with self._lock:
+            self.count += 1
+
+
+class LoadRunner:
+    """
+    Envoie des requêtes HTTP en parallèle (une connexion keep-alive par thread)
+    et agrège débit, percentiles de latence et requêtes SQL par appel.
+    """
+
+    def __init__(self, base_url: str, concurrency: int, queryCounter: Optional[QueryCounter] = None) -> None:
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.concurrency = concurrency
+        self.queryCounter = queryCounter
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method: str, path: str, token: str, body=None) -> tuple[int, float, object]:
+        headers = {"Authorization": f"Bearer {token}"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+
+        start = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (http.client.HTTPException, OSError):
+            self._local.conn = None
+            return 0, time.perf_counter() - start, None
+        elapsed = time.perf_counter() - start
+
+        try:
+            return status, elapsed, json.loads(data) if data else None
+        except ValueError:
+            return status, elapsed, None
+
+    def run(self, name: str, calls: list[Callable[[], tuple[int, float, object]]]) -> tuple[dict, list]:
+        """Exécute une phase (une liste d'appels) et retourne (statistiques, résultats)."""
+        queriesBefore = self.queryCounter.count if self.queryCounter else None
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(lambda call: call(), calls))
+        duration = time.perf_counter() - start
+
+        latencies = sorted(elapsed for _, elapsed, _ in results)
+        errors = sum(1 for status, _, _ in results if not 200 <= status < 300)
+        stats = {
+            "requests": len(results),
+            "errors": errors,
+            "throughput_rps": round(len(results) / duration, 2) if duration else None,
+            "latency_ms": {
+                "mean": round(statistics.fmean(latencies) * 1000, 3),
+                "p50": round(self._percentile(latencies, 50) * 1000, 3),
+                "p90": round(self._percentile(latencies, 90) * 1000, 3),
+                "p99": round(self._percentile(latencies, 99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3),
+            },
+            "queries_per_request": None,
+        }
+        if self.queryCounter is not None and results:
+            stats["queries_per_request"] = round((self.queryCounter.count - queriesBefore) / len(results), 3)
+
+        print(
+            f"{name:<10} {stats['requests']:>6} req  {stats['errors']:>4} err  "
+            f"{stats['throughput_rps']:>9} req/s  p50 {stats['latency_ms']['p50']:>8} ms  "
+            f"p99 {stats['latency_ms']['p99']:>8} ms  sql/req {stats['queries_per_request']}"
+        )
+        return stats, results
+
+    @staticmethod
+    def _percentile(sorted_values: list[float], percent: float) -> float:
+        if not sorted_values:
+            return 0.0
+        # Rang le plus proche (nearest-rank)
+        index = min(len(sorted_values) - 1, max(0, math.ceil(percent / 100 * len(sorted_values)) - 1))
+        return sorted_values[index]
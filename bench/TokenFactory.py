@@ -0,0 +1,38 @@
+import os
+import time
+import uuid
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+
+class TokenFactory:
+    """
+    Paire de clés RSA locale pour le benchmark.
+
+    La clé publique est écrite dans un fichier PEM à passer à l'application via
+    PATH_PUBLIC_KEY; les tokens RS256 signés avec la clé privée portent `id`, `roles`
+    et `exp`, comme ceux émis par les micro-services customer et driver.
+    """
+
+    ALGORITHM = "RS256"
+
+    def __init__(self, directory: str, ttl_seconds: int = 3600) -> None:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_key = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        self.public_key_path = os.path.join(directory, "public.pem")
+        with open(self.public_key_path, "wb") as f:
+            f.write(key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            ))
+        self.ttl_seconds = ttl_seconds
+
+    def mint(self, user_id: uuid.UUID, roles: list[str]) -> str:
+        payload = {"id": str(user_id), "roles": roles, "exp": int(time.time()) + self.ttl_seconds}
+        return jwt.encode(payload, self.private_key, algorithm=self.ALGORITHM)
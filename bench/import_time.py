@@ -0,0 +1,151 @@
+"""
+Test de non-régression du coût d'import de l'application (démarrage à froid d'un worker).
+
+Exécution:
+    python -m bench.import_time --output import-baseline.json
+    python -m bench.import_time --compare import-baseline.json
+    python -m bench.import_time --budget-ms 1500
+    python -m pytest tests/test_import_time.py   (budget IMPORT_TIME_BUDGET_MS, exécuté par la CI)
+
+Le script:
+- importe `app.main` (--module) dans des interpréteurs neufs avec `python -X importtime`, --runs fois,
+  sans PATH_PUBLIC_KEY ni base joignable: l'import ne doit ni lire la clé ni ouvrir de connexion,
+- garde le meilleur temps cumulé de l'import (le bruit de la machine ne fait que l'allonger)
+  et la médiane, et par module la médiane du temps propre,
+- affiche les modules les plus coûteux et le coût regroupé par paquet de premier niveau,
+- échoue (code de sortie 1) si l'import échoue, si un module de --forbid est importé
+  (dépendances chargées à la demande: python-jose, PyYAML, NumPy, pilotes de base),
+  si le meilleur temps dépasse --budget-ms, ou s'il régresse de plus de --tolerance par rapport à --compare.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Dépendances chargées à la demande: leur présence à l'import signale une régression
+DEFAULT_FORBIDDEN = ["jose", "cryptography", "yaml", "numpy", "psycopg2", "asyncpg", "aiosqlite"]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m bench.import_time", description="Coût d'import de l'application")
+    parser.add_argument("--module", default="app.main", help="Module importé")
+    parser.add_argument("--runs", type=int, default=7, help="Imports mesurés (interpréteurs neufs)")
+    parser.add_argument("--top", type=int, default=15, help="Modules les plus coûteux affichés")
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN, help="Paquets qui ne doivent pas être importés")
+    parser.add_argument("--budget-ms", type=float, help="Durée maximale (meilleur des imports, ms)")
+    parser.add_argument("--output", help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--compare", help="Résultats JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Régression tolérée (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """Lignes de `-X importtime`: (module, temps propre µs, temps cumulé µs), dans l'ordre de fin d'import."""
+    rows = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((match[4], int(match[1]), int(match[2])))
+    return rows
+
+
+def measure_once(module: str, env: dict) -> list[tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"Import de {module} impossible:\n" + "\n".join(errors[-20:]))
+    return parse_importtime(result.stderr)
+
+
+def measure(module: str, runs: int, env: dict) -> dict:
+    totals, selfTimes = [], {}
+    for _ in range(runs):
+        rows = measure_once(module, env)
+        totals.append(next(cumulative for name, _, cumulative in rows if name == module))
+        for name, selfUs, _ in rows:
+            selfTimes.setdefault(name, []).append(selfUs)
+
+    modules = {name: statistics.median(values) for name, values in selfTimes.items()}
+    packages = {}
+    for name, selfUs in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + selfUs
+    return {
+        "module": module,
+        "runs": runs,
+        "total_ms": round(min(totals) / 1000, 1),
+        "median_ms": round(statistics.median(totals) / 1000, 1),
+        "modules": len(modules),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda item: -item[1])},
+        "slowest_ms": {name: round(us / 1000, 1) for name, us in sorted(modules.items(), key=lambda item: -item[1])},
+    }
+
+
+def import_env(root: str = None) -> dict:
+    """Environnement des interpréteurs mesurés: base SQLite jamais ouverte, clé publique absente."""
+    workdir = tempfile.mkdtemp(prefix="course-import-")
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'import.sqlite')}")
+    # Clé absente: l'import ne doit pas la lire (chargée au démarrage de l'application)
+    env["PATH_PUBLIC_KEY"] = os.path.join(workdir, "absent.pem")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root or os.getcwd(), env.get("PYTHONPATH")]))
+    return env
+
+
+def forbidden_modules(results: dict, forbid: list[str]) -> list[str]:
+    return sorted(name for name in results["packages_ms"] if name in set(forbid))
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    env = import_env()
+
+    try:
+        results = measure(args.module, args.runs, env)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"import {results['module']}: {results['total_ms']} ms (médiane {results['median_ms']} ms, "
+          f"{results['runs']} imports, {results['modules']} modules)\n")
+    print("Par paquet (temps propre):")
+    for name, ms in list(results["packages_ms"].items())[:args.top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+    print("\nModules les plus coûteux (temps propre):")
+    for name, ms in list(results["slowest_ms"].items())[:args.top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    failures = []
+    forbidden = forbidden_modules(results, args.forbid)
+    if forbidden:
+        failures.append(f"modules chargés à l'import alors qu'ils devraient l'être à la demande: {', '.join(forbidden)}")
+    if args.budget_ms is not None and results["total_ms"] > args.budget_ms:
+        failures.append(f"import en {results['total_ms']} ms, au-delà du budget de {args.budget_ms} ms")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        limit = baseline["total_ms"] * (1 + args.tolerance)
+        print(f"\nRéférence: {baseline['total_ms']} ms (limite {limit:.1f} ms)")
+        if results["total_ms"] > limit:
+            failures.append(f"import en {results['total_ms']} ms, régression de plus de {args.tolerance:.0%} (référence {baseline['total_ms']} ms)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    for failure in failures:
+        print(f"ÉCHEC: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Configuration commune des tests.
+
+Les variables d'environnement sont posées avant tout import de app (elles sont lues à l'import
+des modules): base SQLite dans un répertoire temporaire, clé publique RS256 générée pour
+l'occasion, limitation de débit désactivée.
+"""
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+_TMP_DIR = tempfile.mkdtemp(prefix="manage-course-tests-")
+_PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_PUBLIC_KEY_PATH = os.path.join(_TMP_DIR, "public.pem")
+with open(_PUBLIC_KEY_PATH, "wb") as f:
+    f.write(_PRIVATE_KEY.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'db.sqlite')}"
+os.environ["DATABASE_MODE"] = "sync"
+os.environ["PATH_PUBLIC_KEY"] = _PUBLIC_KEY_PATH
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.pop("READ_DATABASE_URL", None)
+os.environ.pop("OUTBOX_SINK", None)
+
+
+@pytest.fixture
+def anyio_backend():
+    # Tests asynchrones (pytest.mark.anyio, greffon fourni par anyio): boucle asyncio, comme uvicorn
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def tables():
+    """Tables de tous les modèles, créées une fois pour la session de tests."""
+    from app.scripts.create_tables import import_all_models
+    from app.service.Database import Base, Database
+
+    import_all_models()
+    Base.metadata.create_all(bind=Database.get_engine())
+    return Base.metadata
+
+
+@pytest.fixture
+def db(tables):
+    """Session sur une base vidée avant chaque test (index des courses en attente et cache de pages compris)."""
+    from app.service.Database import Database
+    from app.service.PendingCourseIndex import pendingCourseIndex
+    from app.usecase.CachedReadUseCase import responseCache
+
+    with Database.session() as session:
+        for table in reversed(tables.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        pendingCourseIndex.invalidate()
+        responseCache.clear()
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    """Application complète (lifespan compris) servie par TestClient, sur la base vidée."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        # Préchauffage terminé (pool, index des courses en attente): il ne recharge plus l'index
+        # en arrière-plan pendant le test
+        for _ in range(500):
+            if test_client.get("/ready").status_code == 200:
+                break
+            time.sleep(0.01)
+        yield test_client
+
+
+def auth_headers(user: dict, **headers) -> dict:
+    return {"Authorization": f"Bearer {make_token(user['id'], user['roles'])}", **headers}
+
+
+def make_course(**values):
+    """Course valide (non ajoutée à une session); les colonnes données remplacent les valeurs par défaut."""
+    from app.models.Course import Course, CourseStatus
+
+    defaults = {
+        "id": uuid.uuid4(),
+        "client_id": uuid.uuid4(),
+        "point_depart": "Gare de Lyon, Paris",
+        "point_arrivee": "Orly, Paray-Vieille-Poste",
+        "status": CourseStatus.DEMANDEE,
+        "updatedAt": datetime.now(timezone.utc),
+    }
+    return Course(**{**defaults, **values})
+
+
+def make_token(user_id: str, roles: list) -> str:
+    """JWT RS256 signé par la clé de test (même forme que ceux du service d'authentification)."""
+    from jose import jwt
+
+    pem = _PRIVATE_KEY.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    )
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    return jwt.encode({"id": user_id, "roles": roles, "exp": expires}, pem, algorithm="RS256")
+
+
+@pytest.fixture
+def client_user():
+    return {"id": str(uuid.uuid4()), "roles": ["customer"]}
+
+
+@pytest.fixture
+def driver_user():
+    return {"id": str(uuid.uuid4()), "roles": ["driver"]}
@@ -0,0 +1,55 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+import app.service.RateLimiter as rateLimiter
+from conftest import auth_headers
+
+
+def _ready(client: TestClient):
+    for _ in range(500):
+        response = client.get("/ready")
+        if response.status_code == 200:
+            return response
+        time.sleep(0.01)
+    return response
+
+
+def test_factory_builds_independent_apps():
+    first, second = main.create_app(), main.create_app()
+
+    assert first is not second and first is not main.app
+    paths = {route.path for route in first.routes}
+    assert {"/course/create", "/course/my", "/course/pending", "/metrics", "/ready"} <= paths
+
+
+def test_ready_waits_for_startup(db):
+    app = main.create_app()
+
+    # Sans lifespan (aucun préchauffage lancé): pas prêt
+    response = TestClient(app).get("/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["startup"] is False
+
+    with TestClient(app) as client:
+        response = _ready(client)
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "ready", "checks": {"startup": True, "auth": True, "pending_index": True, "database": True},
+    }
+
+
+def test_factory_reads_rate_limit_settings(db, client_user, monkeypatch):
+    # Réglages lus à la création de l'application (conftest désactive la limitation)
+    monkeypatch.setattr(rateLimiter, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setenv("RATE_LIMIT_BUDGETS", "my=0.001/1")
+    app = main.create_app()
+    headers = auth_headers(client_user)
+
+    with TestClient(app) as client:
+        assert client.get("/course/my", headers=headers).status_code == 200
+        assert client.get("/course/my", headers=headers).status_code == 429
+        # L'application du module, créée sans limitation, n'est pas concernée
+        with TestClient(main.app) as other:
+            assert other.get("/course/my", headers=headers).status_code == 200
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import uuid
+
+from conftest import make_token
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DATABASE_MODE est lu à l'import: l'application asyncio tourne dans un interpréteur neuf
+SCRIPT = """
+import json, os
+from fastapi.testclient import TestClient
+from app.scripts.create_tables import import_all_models
+from app.service.Database import Base, Database
+
+import_all_models()
+Base.metadata.create_all(bind=Database.get_engine())
+
+from app.main import app
+
+customer = {"Authorization": "Bearer " + os.environ["CUSTOMER_TOKEN"]}
+driver = {"Authorization": "Bearer " + os.environ["DRIVER_TOKEN"]}
+with TestClient(app) as client:
+    created = client.post("/course/create", json={"point_depart": "Opéra", "point_arrivee": "Orly"}, headers=customer)
+    mine = client.get("/course/my", headers=customer)
+    pending = client.get("/course/pending", headers=driver)
+print(json.dumps({
+    "async": Database.is_async(),
+    "created": [created.status_code, created.json()["id"]],
+    "my": [mine.status_code, [course["id"] for course in mine.json()]],
+    "pending": [pending.status_code, [course["id"] for course in pending.json()]],
+}))
+"""
+
+
+def _runAsyncApp(tmp_path, script: str = SCRIPT, **env) -> dict:
+    customer = make_token(str(uuid.uuid4()), ["customer"])
+    driver = make_token(str(uuid.uuid4()), ["driver"])
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env={
+            **os.environ,
+            "DATABASE_MODE": "async",
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'async.sqlite'}",
+            "CUSTOMER_TOKEN": customer,
+            "DRIVER_TOKEN": driver,
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_async_mode_runs_on_default_sqlite_url(tmp_path):
+    # DATABASE_URL sqlite:/// sans ASYNC_DATABASE_URL: pilote aiosqlite déduit (requirements.txt)
+    result = _runAsyncApp(tmp_path)
+
+    assert result["async"] is True
+    status, courseId = result["created"]
+    assert status == 200
+    assert result["my"] == [200, [courseId]]
+    assert result["pending"] == [200, [courseId]]
+
+
+INDEX_SCRIPT = """
+import asyncio, json, os, time
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from app.scripts.create_tables import import_all_models
+from app.service.Database import Base, Database
+
+import_all_models()
+Base.metadata.create_all(bind=Database.get_engine())
+Base.metadata.create_all(bind=create_engine(os.environ["READ_DATABASE_URL"]))
+
+from app.main import app
+from app.service.PendingCourseIndex import pendingCourseIndex
+
+# Requêtes passées par le pilote synchrone depuis la boucle d'événements (bloquantes)
+blocking = []
+
+def onLoop():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+event.listen(Database.get_engine(), "before_cursor_execute", lambda *args: onLoop() and blocking.append(args[2]))
+
+customer = {"Authorization": "Bearer " + os.environ["CUSTOMER_TOKEN"]}
+driver = {"Authorization": "Bearer " + os.environ["DRIVER_TOKEN"]}
+with TestClient(app) as client:
+    while client.get("/ready").status_code != 200:
+        time.sleep(0.05)
+    created = client.post("/course/create", json={"point_depart": "Opéra", "point_arrivee": "Orly"}, headers=customer).json()
+    # Index périmé: rechargé depuis le primaire à la lecture suivante (servie par le réplica, vide)
+    pendingCourseIndex.invalidate()
+    pending = client.get("/course/pending", headers=driver)
+print(json.dumps({"pending": [course["id"] for course in pending.json()], "created": created["id"], "blocking": blocking}))
+"""
+
+
+def test_async_pending_index_reloads_from_primary_without_blocking_the_loop(tmp_path):
+    result = _runAsyncApp(tmp_path, INDEX_SCRIPT, READ_DATABASE_URL=f"sqlite:///{tmp_path / 'replica.sqlite'}")
+
+    assert result["pending"] == [result["created"]]
+    assert result["blocking"] == []
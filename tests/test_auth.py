@@ -0,0 +1,84 @@
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.service.Auth import Auth
+from app.service.TokenCache import TokenCache
+from conftest import make_token
+
+
+@pytest.mark.anyio
+async def test_get_current_user_verifies_new_tokens_off_the_event_loop(monkeypatch):
+    auth = Auth()
+    verify = auth._verify
+    threads = []
+
+    def spy(token: str) -> dict:
+        threads.append(threading.get_ident())
+        return verify(token)
+
+    monkeypatch.setattr(auth, "_verify", spy)
+    userId = str(uuid.uuid4())
+    token = make_token(userId, ["driver"])
+
+    assert (await auth.getCurrentUser(token))["id"] == userId
+    assert len(threads) == 1 and threads[0] != threading.get_ident()
+
+    # Token en cache: servi sur la boucle, sans nouvelle vérification
+    assert (await auth.getCurrentUser(token))["id"] == userId
+    assert len(threads) == 1
+
+
+def test_token_cache_is_bounded():
+    cache = TokenCache(maxsize=2, ttl=60)
+    exp = time.time() + 60
+    for index in range(3):
+        cache.set(f"token-{index}", {"id": str(index), "exp": exp})
+
+    # Le moins récemment utilisé est évincé
+    assert cache.get("token-0") is None
+    assert cache.get("token-2")["id"] == "2"
+    assert cache.stats()["size"] == 2
+
+
+def test_token_cache_entry_expires_at_token_exp():
+    cache = TokenCache(maxsize=10, ttl=300)
+    cache.set("token", {"id": "u", "exp": time.time() + 0.05})
+    assert cache.get("token") is not None
+
+    time.sleep(0.06)
+    # Encore dans le ttl du cache, mais le token a expiré: entrée rejetée et retirée
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_expired_token_is_not_cached():
+    cache = TokenCache(maxsize=10, ttl=300)
+    cache.set("token", {"id": "u", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_expired_cache_entry_is_verified_again(monkeypatch):
+    auth = Auth()
+    verify = auth._verify
+    calls = []
+
+    def spy(token: str) -> dict:
+        calls.append(token)
+        return verify(token)
+
+    monkeypatch.setattr(auth, "_verify", spy)
+    token = make_token(str(uuid.uuid4()), ["driver"])
+    auth.decodeToken(token)
+    auth.decodeToken(token)
+    assert len(calls) == 1
+
+    # Au-delà de l'exp du token (5 minutes), l'entrée n'est plus servie: le token est revérifié
+    later = time.monotonic() + 3600
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    auth.decodeToken(token)
+    assert len(calls) == 2
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+
+from bench.__main__ import compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ["create", "confirm", "start", "end", "my", "pending"]
+
+
+def _stats(throughput: float, p99: float, queries: float) -> dict:
+    return {"throughput_rps": throughput, "latency_ms": {"p99": p99}, "queries_per_request": queries}
+
+
+def _results(**endpoints) -> dict:
+    return {"meta": {"database": "sqlite", "mode": "sync", "requests": 5, "concurrency": 2}, "endpoints": endpoints}
+
+
+def test_benchmark_runs_the_whole_lifecycle(tmp_path):
+    output = tmp_path / "results.json"
+    # Environnement de l'application préparé par le benchmark lui-même (clés, SQLite temporaire)
+    result = subprocess.run(
+        [sys.executable, "-m", "bench", "--requests", "5", "--concurrency", "2", "--users", "2", "--output", str(output)],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    endpoints = json.loads(output.read_text())["endpoints"]
+    assert list(endpoints) == PHASES
+    for name, stats in endpoints.items():
+        assert (stats["requests"], stats["errors"]) == (5, 0), name
+        assert stats["throughput_rps"] > 0
+    # Les écritures passent par la base, /course/pending est servi par l'index en mémoire
+    assert endpoints["create"]["queries_per_request"] >= 1
+    assert endpoints["pending"]["queries_per_request"] == 0
+
+    # Même résultats en référence: aucune régression
+    rerun = subprocess.run(
+        [sys.executable, "-m", "bench", "--requests", "5", "--concurrency", "2", "--users", "2",
+         "--compare", str(output), "--tolerance", "100"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert rerun.returncode == 0, rerun.stdout + rerun.stderr
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = _results(create=_stats(100, 10, 2), my=_stats(200, 5, 3))
+    current = _results(create=_stats(85, 11, 2), my=_stats(150, 8, 4))
+
+    assert compare(current, baseline, tolerance=0.2) == ["my.throughput_rps", "my.p99_ms", "my.queries_per_request"]
+    assert compare(current, baseline, tolerance=1.0) == []
+
+
+def test_compare_ignores_endpoints_missing_from_baseline():
+    assert compare(_results(export=_stats(1, 1000, 50)), _results(), tolerance=0.2) == []
@@ -0,0 +1,63 @@
+import uuid
+
+from app.models.Course import CourseStatus
+from conftest import auth_headers, make_course
+
+
+def test_bulk_confirm_reports_each_course(client, db, driver_user):
+    pending = make_course()
+    confirmed = make_course(status=CourseStatus.VALIDEE, chauffeur_id=uuid.uuid4())
+    db.add_all([pending, confirmed])
+    db.commit()
+    unknown = uuid.uuid4()
+
+    response = client.post(
+        "/course/bulk/confirm",
+        json={"course_ids": [str(confirmed.id), str(pending.id), str(unknown)]},
+        headers=auth_headers(driver_user),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 2)
+    # Un résultat par identifiant, dans l'ordre de la requête
+    assert [item["index"] for item in body["results"]] == [0, 1, 2]
+    assert [item["course_id"] for item in body["results"]] == [str(confirmed.id), str(pending.id), str(unknown)]
+    assert body["results"][0]["error"] == "Seules les courses demandées peuvent être confirmées"
+    assert body["results"][1]["error"] is None
+    assert body["results"][1]["course"]["status"] == "Validée"
+    assert body["results"][1]["course"]["chauffeur_id"] == driver_user["id"]
+    assert body["results"][2]["error"] == "Course non trouvée"
+
+
+def test_bulk_cancel_reports_each_course(client, db, client_user):
+    mine = make_course(client_id=uuid.UUID(client_user["id"]))
+    other = make_course()
+    db.add_all([mine, other])
+    db.commit()
+
+    response = client.post(
+        "/course/bulk/cancel",
+        json={"course_ids": [str(mine.id), str(other.id)]},
+        headers=auth_headers(client_user),
+    )
+
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert body["results"][0]["course"]["status"] == "Annulée"
+    assert body["results"][1]["error"] == "Vous ne pouvez annuler que vos propres courses"
+
+
+def test_bulk_transition_rejects_duplicate_ids(client, db, driver_user, client_user):
+    course = make_course(client_id=uuid.UUID(client_user["id"]))
+    db.add(course)
+    db.commit()
+    ids = [str(course.id), str(course.id)]
+
+    confirm = client.post("/course/bulk/confirm", json={"course_ids": ids}, headers=auth_headers(driver_user))
+    cancel = client.post("/course/bulk/cancel", json={"course_ids": ids}, headers=auth_headers(client_user))
+
+    assert confirm.status_code == 422
+    assert cancel.status_code == 422
+    db.expire_all()
+    assert db.get(type(course), course.id).status == CourseStatus.DEMANDEE
@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models.Course import CourseStatus
+from conftest import auth_headers, make_course
+
+
+def _claim(client, driver: dict, **body):
+    return client.post("/course/claim-next", json=body, headers=auth_headers(driver))
+
+
+def test_claim_next_without_pending_course_is_404(client, db, driver_user):
+    db.add(make_course(status=CourseStatus.VALIDEE, chauffeur_id=uuid.uuid4()))
+    db.commit()
+
+    response = _claim(client, driver_user)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Aucune course en attente"
+
+
+def test_claims_in_a_row_get_different_courses_oldest_first(client, db, driver_user):
+    now = datetime.now(timezone.utc)
+    oldest, newest = make_course(updatedAt=now - timedelta(minutes=5)), make_course(updatedAt=now)
+    db.add_all([newest, oldest])
+    db.commit()
+
+    first = _claim(client, driver_user).json()
+    second = _claim(client, {"id": str(uuid.uuid4()), "roles": ["driver"]}).json()
+
+    assert [first["id"], second["id"]] == [str(oldest.id), str(newest.id)]
+    assert first["status"] == second["status"] == "Validée"
+    assert first["chauffeur_id"] == driver_user["id"]
+    assert _claim(client, driver_user).status_code == 404
+
+
+def test_claim_newest_first(client, db, driver_user):
+    now = datetime.now(timezone.utc)
+    oldest, newest = make_course(updatedAt=now - timedelta(minutes=5)), make_course(updatedAt=now)
+    db.add_all([oldest, newest])
+    db.commit()
+
+    assert _claim(client, driver_user, order="newest").json()["id"] == str(newest.id)
+
+
+def test_claim_next_requires_driver(client, db, client_user):
+    db.add(make_course())
+    db.commit()
+
+    response = _claim(client, client_user)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Seuls les drivers peuvent confirmer une course"
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models.Course import Course, CourseStatus
+from app.models.CourseArchive import CourseArchive
+from app.scripts import archive_courses
+from conftest import auth_headers, make_course
+
+NOW = datetime.now(timezone.utc)
+
+
+def _ids(db, model) -> set[uuid.UUID]:
+    db.expire_all()
+    return set(db.scalars(select(model.id)))
+
+
+def test_archive_moves_only_old_terminal_courses(db):
+    old = NOW - timedelta(days=60)
+    ended = make_course(status=CourseStatus.TERMINEE, chauffeur_id=uuid.uuid4(), tarif=Decimal("23.40"), updatedAt=old)
+    cancelled = make_course(status=CourseStatus.ANNULEE, updatedAt=old + timedelta(minutes=1))
+    # Course ancienne toujours en attente, course terminée récente: restent dans la table chaude
+    waiting = make_course(status=CourseStatus.DEMANDEE, updatedAt=old)
+    recent = make_course(status=CourseStatus.TERMINEE, updatedAt=NOW - timedelta(days=1))
+    db.add_all([ended, cancelled, waiting, recent])
+    db.commit()
+    expected = {column: getattr(ended, column) for column in ("client_id", "chauffeur_id", "point_depart", "status", "tarif")}
+
+    # Lots de 1: chaque course archivée dans sa propre transaction
+    assert archive_courses.main(["--older-than-days", "30", "--batch-size", "1"]) == 0
+
+    assert _ids(db, Course) == {waiting.id, recent.id}
+    assert _ids(db, CourseArchive) == {ended.id, cancelled.id}
+    archived = db.scalars(select(CourseArchive).where(CourseArchive.id == ended.id)).one()
+    assert {column: getattr(archived, column) for column in expected} == expected
+    assert archived.archivedAt is not None
+
+    # Relance: plus rien à archiver, pas de doublon
+    assert archive_courses.main(["--older-than-days", "30"]) == 0
+    assert _ids(db, CourseArchive) == {ended.id, cancelled.id}
+
+
+def test_my_courses_pages_through_live_and_archived_courses(client, db, client_user):
+    client_id = uuid.UUID(client_user["id"])
+    # Historique entrelacé: les courses archivées et restées chaudes alternent dans l'ordre updatedAt
+    courses = [
+        make_course(client_id=client_id, status=CourseStatus.TERMINEE, updatedAt=NOW - timedelta(days=100 - 10 * i))
+        for i in range(5)
+    ]
+    courses.append(make_course(client_id=client_id, status=CourseStatus.DEMANDEE, updatedAt=NOW))
+    # Course archivée d'un autre client: absente de la page
+    courses.append(make_course(status=CourseStatus.TERMINEE, updatedAt=NOW - timedelta(days=95)))
+    db.add_all(courses)
+    db.commit()
+    archive_courses.main(["--older-than-days", "75"])
+    assert len(_ids(db, CourseArchive)) == 4
+
+    headers = auth_headers(client_user)
+    pages = []
+    cursor = None
+    while True:
+        response = client.get("/course/my", params={"limit": 2, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        pages.append([course["id"] for course in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    expected = [str(course.id) for course in sorted(courses[:6], key=lambda course: course.updatedAt, reverse=True)]
+    assert [course_id for page in pages for course_id in page] == expected
+    assert all(len(page) <= 2 for page in pages)
@@ -0,0 +1,122 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.Course import CourseStatus
+from app.out.CourseOut import CourseOut
+from app.out.NearbyCourseOut import NearbyCourseOut
+from app.repository.CourseRepository import CourseRepository
+from app.service.CourseSerializer import CourseSerializer
+from conftest import make_course
+
+
+def _row(**values) -> tuple:
+    """Tuple dans l'ordre de COURSE_OUT_COLUMNS, tel que renvoyé par les requêtes de liste."""
+    row = {
+        "id": uuid.uuid4(),
+        "client_id": uuid.uuid4(),
+        "chauffeur_id": None,
+        "point_depart": "Gare de Lyon, Paris",
+        "point_arrivee": "Orly, Paray-Vieille-Poste",
+        "depart_lat": None,
+        "depart_lon": None,
+        "arrivee_lat": None,
+        "arrivee_lon": None,
+        "date_heure_depart": None,
+        "date_heure_arrivee": None,
+        "status": CourseStatus.DEMANDEE,
+        "tarif": None,
+        "updatedAt": datetime(2025, 3, 1, 8, 30, tzinfo=timezone.utc),
+        **values,
+    }
+    return tuple(row.values())
+
+
+ROWS = [
+    # Champs optionnels absents
+    _row(),
+    # Flottants très petits / très grands (1e-05, 1e+16 au format de json.dumps)
+    _row(depart_lat=1e-05, depart_lon=-2.5e-07, arrivee_lat=1e16, arrivee_lon=48.8566, tarif=Decimal("0.01")),
+    _row(tarif=Decimal("12345678.90"), depart_lat=0.1 + 0.2, arrivee_lon=-0.0),
+    # Texte non ASCII, guillemets, barre oblique inverse, caractères de contrôle
+    _row(
+        point_depart="Gare de l'Est → Orly ✈ «Terminal 4» 🚕",
+        point_arrivee='Zürich "HB" \\ Ærø\t\n\x01 ',
+        status=CourseStatus.TERMINEE,
+        chauffeur_id=uuid.uuid4(),
+    ),
+    # Dates avec microsecondes, sans fuseau (SQLite) ou avec un décalage non UTC
+    _row(
+        date_heure_depart=datetime(2025, 3, 1, 8, 0, 0, 123456),
+        date_heure_arrivee=datetime(2025, 3, 1, 9, 0, tzinfo=timezone(timedelta(hours=2))),
+        updatedAt=datetime(2025, 3, 1, 7, 0, 0, 1, tzinfo=timezone.utc),
+    ),
+]
+
+
+def _jsonResponseBody(items: list) -> bytes:
+    # Chemin FastAPI sans sérialisation directe: jsonable_encoder puis JSONResponse
+    return JSONResponse(jsonable_encoder(items)).body
+
+
+def _courseOut(row: tuple) -> CourseOut:
+    return CourseOut(**dict(zip(CourseOut.model_fields, row)))
+
+
+def test_dump_list_matches_course_out_response():
+    expected = _jsonResponseBody([_courseOut(row) for row in ROWS])
+
+    assert CourseSerializer.dumpList(ROWS) == expected
+    assert CourseSerializer.dumpList([_courseOut(row) for row in ROWS]) == expected
+    assert b"1e-05" in expected and b"1e+16" in expected
+    assert "🚕".encode() in expected
+
+
+def test_dump_nearby_matches_nearby_course_out_response():
+    pairs = [(row, distance) for row, distance in zip(ROWS, (0.0, 1e-05, 3.14159, 1e16, 12.0))]
+    expected = _jsonResponseBody([
+        NearbyCourseOut(**_courseOut(row).model_dump(), distance_km=distance) for row, distance in pairs
+    ])
+
+    assert CourseSerializer.dumpNearby(pairs) == expected
+
+
+def test_dump_ndjson_lines_match_list_items():
+    lines = CourseSerializer.dumpNdjson(ROWS).split(b"\n")
+
+    assert lines[-1] == b""
+    assert b"[" + b",".join(lines[:-1]) + b"]" == CourseSerializer.dumpList(ROWS)
+
+
+def test_rows_from_database_match_course_out_response(db, driver_user):
+    chauffeur_id = uuid.UUID(driver_user["id"])
+    db.add_all([
+        make_course(chauffeur_id=chauffeur_id, status=CourseStatus.VALIDEE, depart_lat=1e-05, depart_lon=2.35),
+        make_course(
+            chauffeur_id=chauffeur_id, status=CourseStatus.TERMINEE, tarif=Decimal("18.40"),
+            point_depart="Châtelet–Les Halles", date_heure_depart=datetime.now(timezone.utc),
+            date_heure_arrivee=datetime.now(timezone.utc),
+        ),
+    ])
+    db.commit()
+
+    rows = CourseRepository().getMyCourses(driver_user, db=db)
+
+    assert len(rows) == 2
+    assert CourseSerializer.dumpList(rows) == _jsonResponseBody([CourseOut.model_validate(row) for row in rows])
+
+
+def test_nan_is_rejected_like_json_response():
+    with pytest.raises(ValueError):
+        JSONResponse(jsonable_encoder([_courseOut(_row(depart_lat=float("nan")))]))
+    with pytest.raises(ValueError):
+        CourseSerializer.dumpList([_row(depart_lat=float("nan"))])
+
+
+def test_output_is_valid_json():
+    assert [item["point_depart"] for item in json.loads(CourseSerializer.dumpList(ROWS))] == [row[3] for row in ROWS]
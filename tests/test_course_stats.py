@@ -0,0 +1,105 @@
+import os
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, delete, event, select
+from sqlalchemy.orm import Session
+
+from app.models.Course import Course, CourseStatus
+from app.models.CourseDailyStats import CourseDailyStats
+from app.repository.CourseStatsRepository import CourseStatsRepository
+from conftest import make_course
+
+ADMIN = {"id": str(uuid.uuid4()), "roles": ["admin"]}
+
+
+def _ended(day: date, chauffeur_id=None, status=CourseStatus.TERMINEE, tarif="12.50", minutes=20):
+    arrival = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=12)
+    return make_course(
+        chauffeur_id=chauffeur_id,
+        status=status,
+        tarif=tarif if status == CourseStatus.TERMINEE else None,
+        date_heure_depart=arrival - timedelta(minutes=minutes) if status == CourseStatus.TERMINEE else None,
+        date_heure_arrivee=arrival if status == CourseStatus.TERMINEE else None,
+        updatedAt=arrival,
+    )
+
+
+def test_recorded_stats_match_rebuild(db):
+    repository = CourseStatsRepository()
+    today = datetime.now(timezone.utc).date()
+    driver = uuid.uuid4()
+    courses = [
+        _ended(today, driver),
+        _ended(today, driver, tarif="7.50", minutes=10),
+        _ended(today, status=CourseStatus.ANNULEE),
+        _ended(today - timedelta(days=1), driver),
+    ]
+    db.add_all(courses)
+    repository.record(db, courses)
+    db.commit()
+    recorded = repository.getDailyStats(ADMIN, db=db)
+
+    repository.rebuild(db)
+    db.commit()
+    rebuilt = repository.getDailyStats(ADMIN, db=db)
+
+    # Durées recalculées par SQLite via julianday(): égales à la microseconde près
+    for stats in recorded:
+        stats["average_duration_seconds"] = pytest.approx(stats["average_duration_seconds"], abs=1e-3)
+    assert rebuilt == recorded
+    assert rebuilt[-1]["counts"] == {"Terminée": 2, "Annulée": 1}
+    assert rebuilt[-1]["revenue"] == 20.0
+    assert rebuilt[-1]["average_duration_seconds"] == pytest.approx(900.0, abs=1e-3)
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL non défini")
+def test_rebuild_does_not_double_count_concurrent_end():
+    """
+    Une fin de course validée pendant le recalcul (entre le DELETE et l'INSERT ... SELECT) n'est
+    comptée qu'une fois. Jour et chauffeurs propres au test: les autres agrégats ne sont pas touchés.
+    """
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    tables = [Course.__table__, CourseDailyStats.__table__]
+    CourseDailyStats.metadata.create_all(engine, tables=tables)
+    repository = CourseStatsRepository()
+    day = date(2001, 1, 1) + timedelta(days=uuid.uuid4().int % 3000)
+    first, second = _ended(day, uuid.uuid4()), _ended(day, uuid.uuid4())
+
+    def end(course):
+        with Session(engine, expire_on_commit=False) as session:
+            session.add(course)
+            session.flush()
+            repository.record(session, [course])
+            session.commit()
+
+    end(first)
+    concurrent = threading.Thread(target=end, args=(second,))
+
+    def before_rebuild_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO course_daily_stats") and "SELECT" in statement and not concurrent.is_alive():
+            concurrent.start()
+            # Sans verrou, la fin concurrente est validée avant l'INSERT ... SELECT
+            concurrent.join(timeout=1)
+
+    event.listen(engine, "before_cursor_execute", before_rebuild_insert)
+    try:
+        with Session(engine) as session:
+            repository.rebuild(session, day, day + timedelta(days=1))
+            session.commit()
+        concurrent.join()
+
+        with Session(engine) as session:
+            counts = dict(session.execute(
+                select(CourseDailyStats.chauffeur_id, CourseDailyStats.course_count).where(CourseDailyStats.day == day)
+            ).all())
+        assert counts == {first.chauffeur_id: 1, second.chauffeur_id: 1}
+    finally:
+        event.remove(engine, "before_cursor_execute", before_rebuild_insert)
+        with Session(engine) as session:
+            session.execute(delete(CourseDailyStats).where(CourseDailyStats.day == day))
+            session.execute(delete(Course).where(Course.id.in_([first.id, second.id])))
+            session.commit()
+        engine.dispose()
@@ -0,0 +1,160 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.Course import CourseStatus
+from app.repository.CourseRepository import CourseRepository
+from app.service.Database import Database
+from app.service.FareEngine import FareEngine
+from conftest import auth_headers, make_course
+
+BODY = {"point_depart": "Gare du Nord", "point_arrivee": "Roissy"}
+
+
+def _add(db, **values):
+    course = make_course(**values)
+    db.add(course)
+    db.commit()
+    return course
+
+
+def test_course_lifecycle_over_http(client, client_user, driver_user):
+    created = client.post("/course/create", json=BODY, headers=auth_headers(client_user)).json()
+    path = f"/course/{created['id']}"
+
+    confirmed = client.post(f"{path}/confirm", json={}, headers=auth_headers(driver_user))
+    assert confirmed.status_code == 200
+    assert confirmed.json()["status"] == "Validée"
+    assert confirmed.json()["chauffeur_id"] == driver_user["id"]
+
+    started = client.post(f"{path}/start", json={}, headers=auth_headers(driver_user))
+    assert started.status_code == 200
+    assert started.json()["status"] == "En cours"
+
+    ended = client.post(f"{path}/end", json={}, headers=auth_headers(driver_user))
+    assert ended.status_code == 200
+    assert ended.json()["status"] == "Terminée"
+    assert ended.json()["tarif"] is not None
+
+    # Une course terminée ne revient pas en arrière
+    again = client.post(f"{path}/confirm", json={}, headers=auth_headers(driver_user))
+    assert again.status_code == 400
+    assert again.json()["detail"] == "Seules les courses demandées peuvent être confirmées"
+
+
+def test_end_course_sets_fare_in_the_transition_update(db, driver_user):
+    departure = datetime.utcnow() - timedelta(minutes=12)
+    course = _add(
+        db,
+        status=CourseStatus.EN_COURS,
+        chauffeur_id=uuid.UUID(driver_user["id"]),
+        date_heure_depart=departure,
+        depart_lat=48.8809, depart_lon=2.3553,
+        arrivee_lat=49.0097, arrivee_lon=2.5479,
+    )
+    updates = []
+
+    def onExecute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE COURSE "):
+            updates.append(statement)
+
+    engine = Database.get_engine()
+    event.listen(engine, "before_cursor_execute", onExecute)
+    try:
+        ended = CourseRepository().endCourse(course.id, driver_user, db=db)
+    finally:
+        event.remove(engine, "before_cursor_execute", onExecute)
+
+    assert len(updates) == 1 and "tarif" in updates[0]
+    assert ended.status == CourseStatus.TERMINEE
+    # Même tarif que le calcul à partir de la course terminée (départ, arrivée, distance)
+    assert float(ended.tarif) == pytest.approx(FareEngine.default().priceCourse(ended), abs=0.01)
+
+
+def test_end_course_without_departure_is_rejected(db, driver_user):
+    course = _add(db, status=CourseStatus.EN_COURS, chauffeur_id=uuid.UUID(driver_user["id"]))
+
+    with pytest.raises(ValueError, match="La course n'a pas de date de départ"):
+        CourseRepository().endCourse(course.id, driver_user, db=db)
+
+    db.expire_all()
+    assert CourseRepository().getCourseById(course.id, db=db).status == CourseStatus.EN_COURS
+
+
+@pytest.mark.parametrize("action, status, message", [
+    ("confirmCourse", CourseStatus.VALIDEE, "Seules les courses demandées peuvent être confirmées"),
+    ("cancelCourse", CourseStatus.EN_COURS, "Seules les courses demandées peuvent être annulées"),
+    ("startCourse", CourseStatus.DEMANDEE, "Seules les courses validées peuvent être démarrées"),
+    ("endCourse", CourseStatus.VALIDEE, "Seules les courses en cours peuvent être terminées"),
+])
+def test_transition_from_wrong_status_is_rejected(db, client_user, driver_user, action, status, message):
+    user = client_user if action == "cancelCourse" else driver_user
+    owner = uuid.UUID(user["id"])
+    course = _add(db, status=status, client_id=owner, chauffeur_id=owner)
+
+    with pytest.raises(ValueError, match=message):
+        getattr(CourseRepository(), action)(course.id, user, db=db)
+
+
+@pytest.mark.parametrize("action, status, message", [
+    ("cancelCourse", CourseStatus.DEMANDEE, "Vous ne pouvez annuler que vos propres courses"),
+    ("startCourse", CourseStatus.VALIDEE, "Vous ne pouvez démarrer que les courses qui vous sont assignées"),
+    ("endCourse", CourseStatus.EN_COURS, "Vous ne pouvez terminer que les courses qui vous sont assignées"),
+])
+def test_transition_by_another_user_is_rejected(db, action, status, message):
+    roles = ["customer"] if action == "cancelCourse" else ["driver"]
+    stranger = {"id": str(uuid.uuid4()), "roles": roles}
+    course = _add(db, status=status, chauffeur_id=uuid.uuid4(), date_heure_depart=datetime.utcnow())
+
+    with pytest.raises(ValueError, match=message):
+        getattr(CourseRepository(), action)(course.id, stranger, db=db)
+
+
+@pytest.mark.parametrize("action, roles, message", [
+    ("confirmCourse", ["customer"], "Seuls les drivers peuvent confirmer une course"),
+    ("startCourse", ["customer"], "Seuls les drivers peuvent démarrer une course"),
+    ("endCourse", ["customer"], "Seuls les drivers peuvent terminer une course"),
+    ("cancelCourse", ["driver"], "Seuls les customers peuvent annuler une course"),
+])
+def test_transition_requires_role(db, action, roles, message):
+    course = _add(db)
+
+    with pytest.raises(ValueError, match=message):
+        getattr(CourseRepository(), action)(course.id, {"id": str(uuid.uuid4()), "roles": roles}, db=db)
+
+
+def test_transition_on_unknown_course_is_rejected(client, driver_user):
+    response = client.post(f"/course/{uuid.uuid4()}/confirm", json={}, headers=auth_headers(driver_user))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Course non trouvée"
+
+
+def test_concurrent_confirms_only_one_succeeds(db):
+    course = _add(db)
+    drivers = [{"id": str(uuid.uuid4()), "roles": ["driver"]} for _ in range(2)]
+    barrier = threading.Barrier(len(drivers))
+    results = {}
+
+    def confirm(driver):
+        barrier.wait()
+        try:
+            results[driver["id"]] = CourseRepository().confirmCourse(course.id, driver).chauffeur_id
+        except ValueError as e:
+            results[driver["id"]] = str(e)
+
+    threads = [threading.Thread(target=confirm, args=(driver,)) for driver in drivers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [driver for driver in drivers if results[driver["id"]] == uuid.UUID(driver["id"])]
+    losers = [result for result in results.values() if isinstance(result, str)]
+    assert len(winners) == 1
+    assert losers == ["Seules les courses demandées peuvent être confirmées"]
+    db.expire_all()
+    assert CourseRepository().getCourseById(course.id, db=db).chauffeur_id == uuid.UUID(winners[0]["id"])
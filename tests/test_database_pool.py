@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+import app.service.Database as database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PG_URL = "postgresql://app@db/courses"
+
+
+def test_pool_options_from_environment():
+    # Variables DB_POOL_* lues à l'import du module: interpréteur neuf
+    script = (
+        "import json; from app.service.Database import _engine_options;"
+        f"options = _engine_options({PG_URL!r}, 'primary');"
+        "print(json.dumps({k: v for k, v in options.items() if k != 'poolclass'}))"
+    )
+    env = {
+        **os.environ,
+        "DB_POOL_SIZE": "7", "DB_MAX_OVERFLOW": "3", "DB_POOL_TIMEOUT": "2.5",
+        "DB_POOL_RECYCLE": "600", "DB_POOL_PRE_PING": "false",
+    }
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == {
+        "pool_pre_ping": False, "pool_size": 7, "max_overflow": 3, "pool_timeout": 2.5, "pool_recycle": 600,
+    }
+
+
+def test_pool_options_defaults():
+    options = database._engine_options(PG_URL, "primary")
+
+    assert issubclass(options["poolclass"], QueuePool)
+    assert (options["pool_size"], options["max_overflow"]) == (database.DB_POOL_SIZE, database.DB_MAX_OVERFLOW)
+    assert options["pool_timeout"] == database.DB_POOL_TIMEOUT
+    assert options["pool_pre_ping"] is database.DB_POOL_PRE_PING
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:"])
+def test_in_memory_sqlite_keeps_sqlalchemy_pool(url):
+    assert database._engine_options(url, "primary") == {"pool_pre_ping": database.DB_POOL_PRE_PING}
+
+
+def test_pgbouncer_disables_pool_and_asyncpg_statement_cache(monkeypatch):
+    monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+
+    sync = database._engine_options(PG_URL, "primary")
+    asyncOptions = database._engine_options("postgresql+asyncpg://app@db/courses", "primary", is_async=True)
+
+    assert issubclass(sync["poolclass"], NullPool) and "pool_size" not in sync
+    assert "connect_args" not in sync
+    assert asyncOptions["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+
+def test_pool_timeout_is_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(database, "DB_POOL_TIMEOUT", 0.05)
+    url = f"sqlite:///{tmp_path / 'pool.sqlite'}"
+    engine = create_engine(url, **database._engine_options(url, "test-pool"))
+    before = database.DB_POOL_TIMEOUTS._values.get(("test-pool",), 0)
+
+    try:
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+    finally:
+        engine.dispose()
+
+    assert database.DB_POOL_TIMEOUTS._values[("test-pool",)] == before + 1
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app.repository.CourseRepository as courseRepository
+from app.models.Course import CourseStatus
+from app.models.CourseArchive import CourseArchive
+from conftest import auth_headers, make_course
+
+BASE = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _archived(**values) -> CourseArchive:
+    course = make_course(**values)
+    columns = {column.name: getattr(course, column.name) for column in CourseArchive.__table__.columns if column.name != "archivedAt"}
+    return CourseArchive(**columns, archivedAt=BASE)
+
+
+@pytest.fixture
+def history(db, client_user):
+    """Historique du client: courses vivantes et archivées entrelacées, plus la course d'un autre client."""
+    client_id = uuid.UUID(client_user["id"])
+    courses = [
+        make_course(client_id=client_id, updatedAt=BASE + timedelta(hours=5)),
+        _archived(client_id=client_id, status=CourseStatus.TERMINEE, updatedAt=BASE + timedelta(hours=4)),
+        make_course(client_id=client_id, status=CourseStatus.ANNULEE, updatedAt=BASE + timedelta(hours=3)),
+        _archived(client_id=client_id, status=CourseStatus.ANNULEE, updatedAt=BASE + timedelta(hours=2)),
+        _archived(client_id=client_id, status=CourseStatus.TERMINEE, updatedAt=BASE + timedelta(hours=1)),
+    ]
+    db.add_all([*courses, make_course(updatedAt=BASE), _archived(status=CourseStatus.TERMINEE, updatedAt=BASE)])
+    db.commit()
+    return [str(course.id) for course in courses]
+
+
+def _export(client, user: dict, **params):
+    response = client.get("/course/export", params=params, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_export_merges_live_and_archived_courses(client, history, client_user, monkeypatch):
+    # Blocs de 2 lignes: plusieurs allers-retours du curseur, un seul flux
+    monkeypatch.setattr(courseRepository, "EXPORT_CHUNK_SIZE", 2)
+
+    response = _export(client, client_user)
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"] == 'attachment; filename="courses.ndjson"'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [course["id"] for course in lines] == history
+
+
+def test_export_filters_on_status_and_dates(client, history, client_user):
+    ended = _export(client, client_user, status="Terminée")
+    window = _export(
+        client, client_user,
+        since=(BASE + timedelta(hours=2)).isoformat(), until=(BASE + timedelta(hours=5)).isoformat(),
+    )
+
+    assert [json.loads(line)["id"] for line in ended.text.splitlines()] == [history[1], history[4]]
+    # since inclus, until exclu
+    assert [json.loads(line)["id"] for line in window.text.splitlines()] == history[1:4]
+
+
+def test_export_csv_has_header_and_same_rows(client, history, client_user):
+    response = _export(client, client_user, format="csv")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == history
+    assert rows[1]["status"] == "Terminée"
+
+
+def test_export_rejects_empty_window(client, client_user):
+    response = client.get(
+        "/course/export", params={"since": BASE.isoformat(), "until": BASE.isoformat()}, headers=auth_headers(client_user),
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "La date de début doit précéder la date de fin"
@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.command.CreateCourseCommand import CreateCourseCommand
+from app.models.Course import Course
+from app.models.IdempotencyKey import IdempotencyKey
+from app.repository.CourseRepository import CourseRepository
+from app.repository.IdempotencyRepository import IdempotencyLeaseLost, IdempotencyRepository, current_idempotency_lease
+from conftest import auth_headers
+
+BODY = {"point_depart": "Gare du Nord", "point_arrivee": "Roissy CDG"}
+
+
+def _courseCount(db) -> int:
+    db.expire_all()
+    return db.scalar(select(func.count()).select_from(Course))
+
+
+def _keyRow(db, user: dict, key: str) -> IdempotencyKey:
+    db.expire_all()
+    return db.get(IdempotencyKey, (user["id"], key))
+
+
+def test_replay_returns_stored_response_without_new_write(client, db, client_user):
+    headers = auth_headers(client_user, **{"Idempotency-Key": "create-1"})
+
+    first = client.post("/course/create", json=BODY, headers=headers)
+    replay = client.post("/course/create", json=BODY, headers=headers)
+
+    assert first.status_code == 200
+    assert replay.status_code == 200
+    assert replay.content == first.content
+    assert _courseCount(db) == 1
+    # Réponse enregistrée avec l'écriture, bail rendu
+    row = _keyRow(db, client_user, "create-1")
+    assert row.response is not None and row.leaseToken is None and row.leaseExpiresAt is None
+
+
+def test_other_request_with_same_key_is_rejected(client, client_user):
+    headers = auth_headers(client_user, **{"Idempotency-Key": "create-2"})
+
+    client.post("/course/create", json=BODY, headers=headers)
+    other = client.post("/course/create", json={**BODY, "point_arrivee": "Orly"}, headers=headers)
+
+    assert other.status_code == 422
+
+
+def _reserveInProgress(user: dict, key: str, leaseSeconds: float) -> None:
+    # Réservation d'une première requête toujours en cours (ou interrompue sans rien écrire)
+    command = CreateCourseCommand(**BODY, userConnected=user)
+    from app.main import createCourseUseCase
+
+    fingerprint = createCourseUseCase._fingerprint((command,))
+    assert IdempotencyRepository().reserve(user["id"], key, fingerprint, 3600, leaseSeconds, uuid.uuid4().hex) is None
+
+
+def test_request_in_progress_gets_409(client, db, client_user):
+    _reserveInProgress(client_user, "create-3", leaseSeconds=60)
+
+    retry = client.post("/course/create", json=BODY, headers=auth_headers(client_user, **{"Idempotency-Key": "create-3"}))
+
+    assert retry.status_code == 409
+    assert _courseCount(db) == 0
+
+
+def test_retry_takes_over_after_lease_expiry(client, db, client_user):
+    # Worker arrêté brutalement après la réservation: rien n'a été écrit, le bail expire
+    _reserveInProgress(client_user, "create-4", leaseSeconds=60)
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == "create-4")
+        .values(leaseExpiresAt=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    db.commit()
+    headers = auth_headers(client_user, **{"Idempotency-Key": "create-4"})
+
+    retry = client.post("/course/create", json=BODY, headers=headers)
+    replay = client.post("/course/create", json=BODY, headers=headers)
+
+    assert retry.status_code == 200
+    assert replay.content == retry.content
+    assert _courseCount(db) == 1
+
+
+def test_failed_request_releases_key(client, db, driver_user):
+    headers = auth_headers(driver_user, **{"Idempotency-Key": "confirm-1"})
+
+    missing = client.post(f"/course/{uuid.uuid4()}/confirm", json={}, headers=headers)
+
+    assert missing.status_code == 400
+    assert _keyRow(db, driver_user, "confirm-1") is None
+
+
+def test_write_is_rolled_back_when_lease_was_taken_over(db, client_user):
+    # Bail repris par un nouvel essai pendant l'écriture: l'écriture n'est pas validée
+    _reserveInProgress(client_user, "create-5", leaseSeconds=60)
+    lease = current_idempotency_lease.set((client_user["id"], "create-5", "jeton-perime"))
+    try:
+        with pytest.raises(IdempotencyLeaseLost):
+            CourseRepository().createCourse(CreateCourseCommand(**BODY, userConnected=client_user))
+    finally:
+        current_idempotency_lease.reset(lease)
+
+    assert _courseCount(db) == 0
+    assert _keyRow(db, client_user, "create-5").response is None
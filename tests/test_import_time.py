@@ -0,0 +1,19 @@
+import os
+
+from bench.import_time import DEFAULT_FORBIDDEN, forbidden_modules, import_env, measure
+
+# Budget du démarrage à froid d'un worker (meilleur de IMPORT_TIME_RUNS imports de app.main, ms)
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500))
+IMPORT_TIME_RUNS = int(os.getenv("IMPORT_TIME_RUNS", 3))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_app_import_within_budget_without_lazy_dependencies():
+    results = measure("app.main", IMPORT_TIME_RUNS, import_env(ROOT))
+
+    assert forbidden_modules(results, DEFAULT_FORBIDDEN) == []
+    assert results["total_ms"] <= IMPORT_TIME_BUDGET_MS, (
+        f"import de app.main en {results['total_ms']} ms (budget {IMPORT_TIME_BUDGET_MS} ms), "
+        f"modules les plus coûteux: {list(results['slowest_ms'].items())[:5]}"
+    )
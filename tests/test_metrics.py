@@ -0,0 +1,49 @@
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.service.Database import SQL_FAILED_STATEMENTS, QueryStats, current_query_stats
+from conftest import auth_headers
+
+
+def _sample(body: str, name: str, **labels) -> float:
+    """Valeur d'un échantillon du texte Prometheus (0 s'il est absent)."""
+    selector = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}(?:\{{{re.escape(selector)}\}})? (\S+)$", body, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_endpoint_reports_requests_and_sql(client, client_user):
+    client.get("/course/my", headers=auth_headers(client_user))
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert _sample(body, "http_request_duration_seconds_count", method="GET", route="/course/my", status="200") >= 1
+    # Requêtes SQL étiquetées par la route FastAPI qui les a lancées
+    assert _sample(body, "http_request_sql_statements_count", route="/course/my") >= 1
+    assert _sample(body, "sql_statement_duration_seconds_count", route="/course/my") >= 1
+    assert _sample(body, "jwt_cache", stat="misses") >= 1
+    assert "# TYPE db_pool_connections gauge" in body
+
+
+def test_failed_statement_is_counted_and_unstacked(db):
+    stats = QueryStats()
+    before = SQL_FAILED_STATEMENTS._values.get(("unmatched",), 0)
+    token = current_query_stats.set(stats)
+    try:
+        with pytest.raises(OperationalError):
+            db.execute(text("SELECT * FROM table_absente"))
+        db.rollback()
+        db.execute(text("SELECT 1"))
+    finally:
+        current_query_stats.reset(token)
+
+    assert SQL_FAILED_STATEMENTS._values[("unmatched",)] == before + 1
+    assert stats.count == 2
+    # Plus aucun départ en attente sur la connexion
+    assert db.connection().info["query_start_time"] == []
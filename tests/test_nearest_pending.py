@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+
+from app.models.Course import CourseStatus
+from app.repository.CourseRepository import CourseRepository
+from app.service.PendingCourseIndex import pendingCourseIndex
+from conftest import auth_headers, make_course
+
+# Position du driver, au coin de quatre cases de la grille (GRID_CELL_DEGREES = 0.01)
+LAT, LON = 48.86005, 2.35005
+
+
+@pytest.fixture
+def courses(db):
+    """Courses en attente autour du driver, plus des courses qui ne doivent jamais sortir."""
+    placed = {
+        # Case voisine en diagonale (4885, 234), à une quinzaine de mètres
+        "boundary": make_course(depart_lat=48.85995, depart_lon=2.34995),
+        "near": make_course(depart_lat=48.8610, depart_lon=2.3500),
+        "mid": make_course(depart_lat=48.8700, depart_lon=2.3500),
+        "far": make_course(depart_lat=48.9000, depart_lon=2.3500),
+    }
+    ignored = [
+        make_course(),
+        make_course(depart_lat=LAT, depart_lon=LON, status=CourseStatus.VALIDEE, chauffeur_id=uuid.uuid4()),
+    ]
+    db.add_all([*placed.values(), *ignored])
+    db.commit()
+    # Écritures directes en base, hors événements: l'index est rechargé à la lecture suivante
+    pendingCourseIndex.invalidate()
+    return {name: course.id for name, course in placed.items()}
+
+
+@pytest.fixture(params=["index", "database"])
+def nearest(request, db, driver_user, monkeypatch):
+    """getNearestPendingCourses servi par la grille de l'index en mémoire, ou par la requête SQL."""
+    monkeypatch.setattr(pendingCourseIndex, "started", request.param == "index")
+
+    def search(radius_km: float, limit: int = 10) -> list[tuple]:
+        return CourseRepository().getNearestPendingCourses(driver_user, LAT, LON, radius_km, limit, db=db)
+
+    return search
+
+
+def test_nearest_are_sorted_by_distance(nearest, courses):
+    found = nearest(radius_km=2.0)
+
+    assert [course.id for course, _ in found] == [courses["boundary"], courses["near"], courses["mid"]]
+    distances = [distance for _, distance in found]
+    assert distances == sorted(distances)
+    assert distances[0] < 0.02
+
+
+def test_nearest_stops_at_radius(nearest, courses):
+    assert [course.id for course, _ in nearest(radius_km=1.0)] == [courses["boundary"], courses["near"]]
+    assert [course.id for course, _ in nearest(radius_km=0.05)] == [courses["boundary"]]
+
+
+def test_nearest_keeps_the_closest_within_limit(nearest, courses):
+    assert [course.id for course, _ in nearest(radius_km=10.0, limit=2)] == [courses["boundary"], courses["near"]]
+
+
+@pytest.mark.parametrize("lat, lon", [(48.86001, 2.34999), (48.85999, 2.35001)])
+def test_nearest_finds_neighbours_across_cell_edges(nearest, db, lat, lon):
+    # Course juste de l'autre côté d'une limite de case (ligne ou colonne) par rapport au driver
+    course = make_course(depart_lat=lat, depart_lon=lon)
+    db.add(course)
+    db.commit()
+
+    assert [found.id for found, _ in nearest(radius_km=0.01)] == [course.id]
+
+
+def test_pending_by_position_over_http(client, courses, driver_user):
+    response = client.get(
+        "/course/pending", params={"lat": LAT, "lon": LON, "radius_km": 1.5}, headers=auth_headers(driver_user),
+    )
+
+    assert response.status_code == 200
+    assert [course["id"] for course in response.json()] == [str(courses["boundary"]), str(courses["near"]), str(courses["mid"])]
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.command.CreateCourseCommand import CreateCourseCommand
+from app.models.CourseOutboxEvent import CourseOutboxEvent
+from app.repository.CourseRepository import CourseRepository
+from app.service.OutboxDispatcher import OutboxDispatcher
+from app.service.OutboxSinks import MemorySink
+
+repository = CourseRepository()
+
+
+@pytest.fixture(autouse=True)
+def outbox(monkeypatch):
+    # OUTBOX_ENABLED est lu à l'import (OUTBOX_SINK vidé par conftest)
+    monkeypatch.setattr("app.repository.OutboxRepository.OUTBOX_ENABLED", True)
+
+
+class FailingSink(MemorySink):
+    """MemorySink indisponible pour les `failures` premiers envois."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def send(self, events: list[dict]) -> None:
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("webhook indisponible")
+        super().send(events)
+
+
+def _create(user: dict):
+    return repository.createCourse(CreateCourseCommand(point_depart="Gare de Lyon", point_arrivee="Orly", userConnected=user))
+
+
+def _pending(db) -> list[CourseOutboxEvent]:
+    db.expire_all()
+    return list(db.scalars(select(CourseOutboxEvent).order_by(CourseOutboxEvent.id)))
+
+
+def _makeDue(db) -> None:
+    # Délai de reprise écoulé
+    db.execute(update(CourseOutboxEvent).values(nextAttemptAt=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    db.commit()
+
+
+def _delay(event: CourseOutboxEvent, failedAt: datetime) -> float:
+    nextAttemptAt = event.nextAttemptAt
+    if nextAttemptAt.tzinfo is None:
+        # SQLite relit les dates sans fuseau (écrites en UTC)
+        nextAttemptAt = nextAttemptAt.replace(tzinfo=timezone.utc)
+    return (nextAttemptAt - failedAt).total_seconds()
+
+
+def test_dispatcher_publishes_events_in_order_per_course(db, client_user, driver_user):
+    first = _create(client_user)
+    second = _create(client_user)
+    repository.confirmCourse(first.id, driver_user)
+    repository.cancelCourse(second.id, client_user)
+    repository.startCourse(first.id, driver_user)
+    sink = MemorySink()
+    dispatcher = OutboxDispatcher(sink, batchSize=100)
+
+    batches = []
+    while sent := dispatcher.dispatchOnce():
+        batches.append(sink.events[-sent:])
+
+    # Un seul événement par course et par lot: la tête de file de chaque course
+    assert [[(event["course_id"], event["type"]) for event in batch] for batch in batches] == [
+        [(str(first.id), "created"), (str(second.id), "created")],
+        [(str(first.id), "confirmed"), (str(second.id), "cancelled")],
+        [(str(first.id), "started")],
+    ]
+    assert sink.events[-1]["course"]["status"] == "En cours"
+    assert _pending(db) == []
+
+
+def test_failed_batch_is_retried_with_backoff(db, client_user, driver_user):
+    course = _create(client_user)
+    repository.confirmCourse(course.id, driver_user)
+    sink = FailingSink(failures=3)
+    dispatcher = OutboxDispatcher(sink, batchSize=100, retryBase=1.0, retryMax=3.0)
+
+    # Délai exponentiel plafonné: 1 s, 2 s, puis 3 s (au lieu de 4)
+    for attempts, delay in ((1, 1.0), (2, 2.0), (3, 3.0)):
+        failedAt = datetime.now(timezone.utc)
+        assert dispatcher.dispatchOnce() == 0
+        created, confirmed = _pending(db)
+        assert (created.type, created.attempts, created.lastError) == ("created", attempts, "webhook indisponible")
+        assert _delay(created, failedAt) == pytest.approx(delay, abs=0.5)
+        # L'événement suivant de la course attend la livraison du premier
+        assert confirmed.attempts == 0
+
+        # Pas de nouvel envoi avant l'échéance
+        calls = sink.calls
+        assert dispatcher.dispatchOnce() == 0
+        assert sink.calls == calls
+        _makeDue(db)
+
+    assert dispatcher.dispatchOnce() == 1
+    assert dispatcher.dispatchOnce() == 1
+    assert [event["type"] for event in sink.events] == ["created", "confirmed"]
+    assert _pending(db) == []
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.service.PendingCourseIndex import pendingCourseIndex
+from conftest import auth_headers, make_course
+
+BODY = {"point_depart": "République", "point_arrivee": "Denfert"}
+
+
+def _scan(client, path: str, headers: dict, limit: int, during=None) -> list[str]:
+    """Parcourt toutes les pages (X-Next-Cursor); during(page) est appelé après chaque page."""
+    ids, params, page = [], {"limit": limit}, 0
+    while True:
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        ids.extend(course["id"] for course in response.json())
+        page += 1
+        if during:
+            during(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+        params = {"limit": limit, "cursor": cursor}
+
+
+def _seed(db, count: int, **values) -> list:
+    # Dates dans le passé, par paires identiques: le départage se fait sur l'id
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    courses = [make_course(updatedAt=base + timedelta(seconds=index // 2), **values) for index in range(count)]
+    db.add_all(courses)
+    db.commit()
+    return sorted(courses, key=lambda course: (course.updatedAt, course.id), reverse=True)
+
+
+def test_my_courses_scan_has_no_duplicates_or_gaps_with_inserts(client, db, client_user):
+    headers = auth_headers(client_user)
+    seeded = _seed(db, 11, client_id=uuid.UUID(client_user["id"]))
+
+    # Créations pendant le parcours: plus récentes que le curseur, elles ne décalent pas les pages suivantes
+    ids = _scan(client, "/course/my", headers, limit=3, during=lambda page: client.post("/course/create", json=BODY, headers=headers))
+
+    assert ids == [str(course.id) for course in seeded]
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_pending_scan_has_no_duplicates_or_gaps_with_inserts(client, db, client_user, driver_user, monkeypatch, indexed):
+    monkeypatch.setattr(pendingCourseIndex, "started", indexed)
+    seeded = _seed(db, 9)
+    # Écritures directes en base, hors événements: l'index préchauffé au démarrage est rechargé
+    pendingCourseIndex.invalidate()
+    customer = auth_headers(client_user)
+
+    ids = _scan(
+        client, "/course/pending", auth_headers(driver_user), limit=4,
+        during=lambda page: client.post("/course/create", json=BODY, headers=customer),
+    )
+
+    assert ids == [str(course.id) for course in seeded]
+
+
+def test_invalid_cursor_is_rejected(client, client_user):
+    response = client.get("/course/my", params={"cursor": "pas-un-curseur"}, headers=auth_headers(client_user))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Curseur de pagination invalide"
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+from app.out.CourseOut import CourseOut
+from app.service.CourseEvents import CourseEvents
+from app.service.Pagination import Pagination
+from app.service.PendingCourseIndex import PendingCourseIndex, pendingCourseIndex
+from conftest import auth_headers, make_course
+
+BASE = datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _course(minutes: int, **values) -> CourseOut:
+    return CourseOut.model_validate(make_course(updatedAt=BASE + timedelta(minutes=minutes), **values))
+
+
+def _event(eventType: str, course: CourseOut) -> dict:
+    # Même forme que CourseEvents.emit (JSON, tel que reçu par LISTEN)
+    return {"type": eventType, "course": course.model_dump(mode="json")}
+
+
+def _ids(courses) -> list:
+    return [course.id for course in courses]
+
+
+def test_page_follows_keyset_order():
+    courses = [_course(minutes) for minutes in (3, 1, 2, 2)]
+    index = PendingCourseIndex()
+    index.rebuild(lambda: courses)
+    ordered = sorted(courses, key=lambda course: (course.updatedAt, course.id), reverse=True)
+
+    first = index.page(2, None)
+    cursor = Pagination.encodeCursor(first[-1].updatedAt, first[-1].id)
+
+    assert _ids(first) == _ids(ordered[:2])
+    assert _ids(index.page(2, cursor)) == _ids(ordered[2:])
+    assert _ids(index.page(None, None)) == _ids(ordered)
+
+
+def test_events_maintain_the_index_incrementally():
+    kept, confirmed, cancelled = _course(1), _course(2), _course(3)
+    index = PendingCourseIndex()
+    index.rebuild(lambda: [kept, confirmed, cancelled])
+
+    created = _course(4, depart_lat=48.86, depart_lon=2.35)
+    index.apply(_event(CourseEvents.CREATED, created))
+    index.apply(_event(CourseEvents.CONFIRMED, confirmed))
+    index.apply(_event(CourseEvents.CANCELLED, cancelled))
+
+    assert _ids(index.page(None, None)) == [created.id, kept.id]
+    assert _ids(course for course, _ in index.nearest(48.86, 2.35, 1.0, 10)) == [created.id]
+    # Même contenu, même version: l'ETag ne dépend pas de l'historique des événements
+    rebuilt = PendingCourseIndex()
+    rebuilt.rebuild(lambda: [created, kept])
+    assert index.version() == rebuilt.version()
+
+    index.apply(_event(CourseEvents.CONFIRMED, created))
+    assert _ids(index.page(None, None)) == [kept.id]
+    assert index.nearest(48.86, 2.35, 1.0, 10) == []
+
+
+def test_events_received_during_rebuild_are_replayed():
+    loaded, confirmedWhileLoading = _course(1), _course(2)
+    createdWhileLoading = _course(3)
+    index = PendingCourseIndex()
+
+    def loader():
+        # Lecture de la base déjà faite: ces événements arrivent avant la fin du chargement
+        index.apply(_event(CourseEvents.CREATED, createdWhileLoading))
+        index.apply(_event(CourseEvents.CONFIRMED, confirmedWhileLoading))
+        return [loaded, confirmedWhileLoading]
+
+    index.rebuild(loader)
+
+    assert _ids(index.page(None, None)) == [createdWhileLoading.id, loaded.id]
+    assert index.isLoaded() and not index.isStale()
+
+
+def test_ensure_fresh_reloads_only_when_stale():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [_course(1)]
+
+    index = PendingCourseIndex(maxAge=60.0)
+    index.ensureFresh(loader)
+    index.ensureFresh(loader)
+    assert len(loads) == 1
+
+    # resync (ex: reconnexion LISTEN): rechargé à la lecture suivante
+    index.apply({"type": "resync"})
+    assert index.isStale()
+    index.ensureFresh(loader)
+    assert len(loads) == 2
+
+
+def test_pending_route_follows_transitions(client, client_user, driver_user):
+    customer, driver = auth_headers(client_user), auth_headers(driver_user)
+    first = client.post("/course/create", json={"point_depart": "Alésia", "point_arrivee": "Orly"}, headers=customer).json()
+    second = client.post("/course/create", json={"point_depart": "Alésia", "point_arrivee": "Roissy"}, headers=customer).json()
+
+    assert pendingCourseIndex.started
+    assert [course["id"] for course in client.get("/course/pending", headers=driver).json()] == [second["id"], first["id"]]
+
+    client.post(f"/course/{first['id']}/confirm", json={}, headers=driver)
+    client.post(f"/course/{second['id']}/cancel", json={}, headers=customer)
+    assert client.get("/course/pending", headers=driver).json() == []
+    assert len(pendingCourseIndex) == 0
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+import uuid
+
+import pytest
+
+from app.command.CreateCourseCommand import CreateCourseCommand
+from app.command.GetPendingCoursesCommand import GetPendingCoursesCommand
+from app.repository.CourseRepository import CourseRepository
+from app.service.CourseEventBus import CourseEventBus
+from app.service.CourseEvents import CourseEvents
+from app.usecase.StreamPendingCoursesUseCase import StreamPendingCoursesUseCase
+from conftest import make_course
+
+pytestmark = pytest.mark.anyio
+
+repository = CourseRepository()
+
+
+def _create(user: dict, depart: str = "Gare Montparnasse"):
+    # Écriture SQLite: l'événement est publié dans le bus local après le commit (after_commit)
+    return repository.createCourse(CreateCourseCommand(point_depart=depart, point_arrivee="La Défense", userConnected=user))
+
+
+async def _next(stream) -> tuple[str, object]:
+    message = await asyncio.wait_for(anext(stream), timeout=5)
+    event, data = message.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+async def _open(driver: dict):
+    return await StreamPendingCoursesUseCase().executeAsync(GetPendingCoursesCommand(userConnected=driver))
+
+
+async def test_bus_replaces_backlog_of_slow_subscriber_with_resync():
+    bus = CourseEventBus(queue_size=2)
+    received = []
+    bus.addListener(received.append)
+    queue = bus.subscribe()
+    events = [{"type": CourseEvents.CREATED, "course": {"id": str(i)}} for i in range(3)]
+
+    # publish() depuis un autre thread (thread LISTEN, threadpool)
+    publisher = threading.Thread(target=lambda: [bus.publish(event) for event in events])
+    publisher.start()
+    publisher.join()
+    await asyncio.sleep(0.05)
+
+    assert received == events
+    assert queue.qsize() == 1
+    assert queue.get_nowait() == CourseEventBus.RESYNC
+
+    bus.unsubscribe(queue)
+    bus.publish(events[0])
+    await asyncio.sleep(0.05)
+    assert queue.empty()
+
+
+async def test_stream_sends_snapshot_then_deltas(db, client_user, driver_user):
+    existing = await asyncio.to_thread(_create, client_user)
+    subscribers = CourseEvents.bus.subscriberCount()
+    stream = await _open(driver_user)
+    try:
+        event, snapshot = await _next(stream)
+        assert event == "snapshot"
+        assert [course["id"] for course in snapshot] == [str(existing.id)]
+
+        created = await asyncio.to_thread(_create, client_user, "Gare d'Austerlitz")
+        event, course = await _next(stream)
+        assert (event, course["id"], course["point_depart"]) == ("created", str(created.id), "Gare d'Austerlitz")
+
+        await asyncio.to_thread(repository.confirmCourse, existing.id, driver_user)
+        event, course = await _next(stream)
+        assert (event, course["id"], course["status"], course["chauffeur_id"]) == (
+            "confirmed", str(existing.id), "Validée", driver_user["id"],
+        )
+
+        await asyncio.to_thread(repository.cancelCourse, created.id, client_user)
+        event, course = await _next(stream)
+        assert (event, course["id"], course["status"]) == ("cancelled", str(created.id), "Annulée")
+    finally:
+        await stream.aclose()
+
+    assert CourseEvents.bus.subscriberCount() == subscribers
+
+
+async def test_stream_resyncs_when_subscriber_falls_behind(db, client_user, driver_user, monkeypatch):
+    monkeypatch.setattr(CourseEvents.bus, "queue_size", 2)
+    stream = await _open(driver_user)
+    try:
+        assert await _next(stream) == ("snapshot", [])
+
+        # Abonné qui ne lit pas: 3 événements pour une file de 2, remplacés par RESYNC
+        created = [await asyncio.to_thread(_create, client_user, f"Départ {i}") for i in range(3)]
+        event, snapshot = await _next(stream)
+
+        assert event == "snapshot"
+        assert {course["id"] for course in snapshot} == {str(course.id) for course in created}
+    finally:
+        await stream.aclose()
+
+
+async def test_stream_resyncs_after_listener_reconnect(db, driver_user):
+    stream = await _open(driver_user)
+    try:
+        assert await _next(stream) == ("snapshot", [])
+
+        # Course écrite pendant une coupure de LISTEN: aucun événement reçu
+        missed = make_course(id=uuid.uuid4())
+        db.add(missed)
+        db.commit()
+        # Publié par CourseEvents._listen une fois la connexion LISTEN rétablie
+        CourseEvents.bus.publish(CourseEventBus.RESYNC)
+
+        event, snapshot = await _next(stream)
+        assert event == "snapshot"
+        assert [course["id"] for course in snapshot] == [str(missed.id)]
+    finally:
+        await stream.aclose()
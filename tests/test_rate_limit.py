@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.RateLimitMiddleware import RateLimitMiddleware
+from app.service.Auth import Auth
+from app.service.RateLimitStores import RATE_LIMIT_LOCK_TIMEOUTS, MemoryBucketStore, SharedBucketStore
+from app.service.RateLimiter import RateLimiter, RateLimitRule
+from conftest import auth_headers
+
+
+def _client(store=None, burst: float = 2.0, auth=None) -> TestClient:
+    """Application minimale derrière RateLimitMiddleware (conftest désactive la limitation de l'application)."""
+    app = FastAPI()
+
+    @app.get("/course/my")
+    def my():
+        return []
+
+    # Rechargement négligeable: le seau ne se remplit pas pendant le test
+    limiter = RateLimiter([RateLimitRule("my", "GET", "/course/my", 0.001, burst)], store or MemoryBucketStore())
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, auth=auth or Auth())
+    return TestClient(app)
+
+
+def _user() -> dict:
+    return {"id": str(uuid.uuid4()), "roles": ["customer"]}
+
+
+def test_over_budget_is_429_with_retry_after():
+    client = _client()
+    headers = auth_headers(_user())
+
+    assert [client.get("/course/my", headers=headers).status_code for _ in range(2)] == [200, 200]
+    refused = client.get("/course/my", headers=headers)
+
+    assert refused.status_code == 429
+    assert refused.json() == {"detail": "Trop de requêtes, réessayez plus tard"}
+    assert int(refused.headers["retry-after"]) >= 1
+
+
+def test_budget_is_per_user_then_per_ip():
+    client = _client()
+    first, second = auth_headers(_user()), auth_headers(_user())
+
+    for _ in range(2):
+        client.get("/course/my", headers=first)
+    assert client.get("/course/my", headers=first).status_code == 429
+    # Un autre utilisateur, ou une requête sans token (comptée par IP), a son propre seau
+    assert client.get("/course/my", headers=second).status_code == 200
+    assert client.get("/course/my").status_code == 200
+    # Token invalide: compté par IP, avec les requêtes anonymes
+    assert client.get("/course/my", headers={"Authorization": "Bearer invalide"}).status_code == 200
+    assert client.get("/course/my").status_code == 429
+
+
+def test_new_token_is_verified_off_the_event_loop(monkeypatch):
+    auth = Auth()
+    verify = auth._verify
+    onLoop = []
+
+    def spy(token: str) -> dict:
+        try:
+            asyncio.get_running_loop()
+            onLoop.append(True)
+        except RuntimeError:
+            onLoop.append(False)
+        return verify(token)
+
+    monkeypatch.setattr(auth, "_verify", spy)
+    client = _client(auth=auth)
+    headers = auth_headers(_user())
+
+    assert client.get("/course/my", headers=headers).status_code == 200
+    assert client.get("/course/my", headers=headers).status_code == 200
+    # Vérifié une fois, dans le threadpool; la requête suivante est servie par le cache
+    assert onLoop == [False]
+
+
+def test_shared_buckets_are_seen_by_forked_workers():
+    store = SharedBucketStore(slots=1024)
+
+    def exhaust():
+        for _ in range(2):
+            assert store.take("my:user:a", 0.001, 2.0) == 0.0
+
+    # Jetons consommés par un autre worker (fork après la création de la table, comme app.server)
+    worker = multiprocessing.get_context("fork").Process(target=exhaust)
+    worker.start()
+    worker.join()
+
+    assert worker.exitcode == 0
+    assert store.take("my:user:a", 0.001, 2.0) > 0
+    assert store.take("my:user:b", 0.001, 2.0) == 0.0
+
+
+def test_shared_lock_timeout_is_counted():
+    store = SharedBucketStore(slots=16)
+    before = RATE_LIMIT_LOCK_TIMEOUTS._values.get((), 0)
+    # Verrou gardé par un worker arrêté en pleine mise à jour
+    store._lock.acquire()
+    try:
+        assert store.take("my:user:a", 0.001, 1.0) == 0.0
+    finally:
+        store._lock.release()
+
+    assert RATE_LIMIT_LOCK_TIMEOUTS._values[()] == before + 1
@@ -0,0 +1,72 @@
+import multiprocessing
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.service.Database as database
+from app.service.ReadYourWrites import ReadYourWrites
+from conftest import auth_headers, make_course
+
+BODY = {"point_depart": "Gare de l'Est", "point_arrivee": "Bercy"}
+
+
+@pytest.fixture
+def replica(tables, tmp_path, monkeypatch):
+    """Second fichier SQLite branché comme réplica (READ_DATABASE_URL), sans réplication: son retard est total."""
+    url = f"sqlite:///{tmp_path / 'replica.sqlite'}"
+    replica_engine = create_engine(url, future=True)
+    tables.create_all(bind=replica_engine)
+    factory = sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False, info={"replica": True})
+    database.Database.get_engine()
+    monkeypatch.setattr(database, "READ_DATABASE_URLS", [url])
+    monkeypatch.setattr(database, "_ReadSessionFactories", [factory])
+    yield factory
+    replica_engine.dispose()
+
+
+def _myCourseIds(client, user: dict) -> list[str]:
+    response = client.get("/course/my", headers=auth_headers(user))
+    assert response.status_code == 200
+    return [course["id"] for course in response.json()]
+
+
+def test_reads_go_to_replica_until_user_writes(client, db, replica, client_user, monkeypatch):
+    monkeypatch.setattr(database.readYourWrites, "window", 0.5)
+    client_id = uuid.UUID(client_user["id"])
+    onPrimary = make_course(client_id=client_id)
+    db.add(onPrimary)
+    db.commit()
+    onReplica = make_course(client_id=client_id)
+    with replica() as session:
+        session.add(onReplica)
+        session.commit()
+
+    assert _myCourseIds(client, client_user) == [str(onReplica.id)]
+
+    # Après une écriture, ses lectures restent sur le primaire pendant la fenêtre
+    created = client.post("/course/create", json=BODY, headers=auth_headers(client_user)).json()
+    assert set(_myCourseIds(client, client_user)) == {str(onPrimary.id), created["id"]}
+    # Les autres utilisateurs lisent toujours le réplica
+    other = {"id": str(uuid.uuid4()), "roles": ["customer"]}
+    assert _myCourseIds(client, other) == []
+
+    time.sleep(0.6)
+    assert _myCourseIds(client, client_user) == [str(onReplica.id)]
+
+
+def test_write_marker_is_shared_with_forked_workers():
+    readYourWrites = ReadYourWrites(window=5.0, slots=1024)
+    writer, reader = "user-a", "user-b"
+    assert readYourWrites._slot(writer) != readYourWrites._slot(reader)
+
+    # Écriture servie par un autre worker (fork après la création de la table, comme app.server)
+    worker = multiprocessing.get_context("fork").Process(target=readYourWrites.recordWrite, args=(writer,))
+    worker.start()
+    worker.join()
+
+    assert worker.exitcode == 0
+    assert readYourWrites.isSticky(writer)
+    assert not readYourWrites.isSticky(reader)
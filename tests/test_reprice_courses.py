@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.models.Course import CourseStatus
+from app.scripts import reprice_courses
+from app.service.FareEngine import FareEngine
+from conftest import auth_headers, make_course
+
+
+def test_apply_changes_my_courses_etag(client, db, client_user):
+    arrival = datetime.now(timezone.utc) - timedelta(hours=1)
+    course = make_course(
+        client_id=uuid.UUID(client_user["id"]),
+        chauffeur_id=uuid.uuid4(),
+        status=CourseStatus.TERMINEE,
+        date_heure_depart=arrival - timedelta(minutes=30),
+        date_heure_arrivee=arrival,
+        tarif=Decimal("1.00"),
+        updatedAt=arrival,
+    )
+    db.add(course)
+    db.commit()
+    headers = auth_headers(client_user)
+
+    before = client.get("/course/my", headers=headers)
+    assert before.json()[0]["tarif"] == 1.0
+
+    assert reprice_courses.main(["--apply"]) == 0
+
+    after = client.get("/course/my", headers={**headers, "If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    expected = FareEngine.default().price(course.date_heure_depart, course.date_heure_arrivee)
+    assert after.json()[0]["tarif"] == expected
+    # updatedAt gardé (pagination, partitions, agrégats)
+    assert after.json()[0]["updatedAt"] == before.json()[0]["updatedAt"]
+
+
+def test_dry_run_keeps_etag(client, db, client_user):
+    arrival = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.add(make_course(
+        client_id=uuid.UUID(client_user["id"]),
+        status=CourseStatus.TERMINEE,
+        date_heure_depart=arrival - timedelta(minutes=30),
+        date_heure_arrivee=arrival,
+        tarif=Decimal("1.00"),
+        updatedAt=arrival,
+    ))
+    db.commit()
+    headers = auth_headers(client_user)
+    before = client.get("/course/my", headers=headers)
+
+    assert reprice_courses.main([]) == 0
+
+    after = client.get("/course/my", headers={**headers, "If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 304
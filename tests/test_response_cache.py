@@ -0,0 +1,74 @@
+import time
+
+from app.service.TokenCache import TokenCache
+from app.service.TtlLruCache import TtlLruCache
+from app.usecase.CachedReadUseCase import responseCache
+from conftest import auth_headers
+
+BODY = {"point_depart": "Bastille", "point_arrivee": "Nation"}
+
+
+def test_unchanged_page_is_304_until_a_write(client, client_user):
+    headers = auth_headers(client_user)
+    client.post("/course/create", json=BODY, headers=headers)
+    first = client.get("/course/my", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+
+    notModified = client.get("/course/my", headers={**headers, "If-None-Match": etag})
+    assert notModified.status_code == 304
+    assert notModified.headers["ETag"] == etag
+    assert notModified.content == b""
+
+    # Une écriture change la version: nouvel ETag, la page est relue
+    client.post("/course/create", json=BODY, headers=headers)
+    changed = client.get("/course/my", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_unchanged_page_is_served_from_cache(client, client_user):
+    headers = auth_headers(client_user)
+    client.post("/course/create", json=BODY, headers=headers)
+    client.get("/course/my", headers=headers)
+    hits = responseCache.hits
+
+    assert client.get("/course/my", headers=headers).status_code == 200
+    assert responseCache.hits == hits + 1
+
+
+def test_ttl_lru_cache_evicts_least_recently_read():
+    cache = TtlLruCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_ttl_lru_cache_entry_expires():
+    cache = TtlLruCache(maxsize=10, ttl=0.05)
+    cache.set("short", 1, ttl=0.01)
+    cache.set("long", 2, ttl=60)
+
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    time.sleep(0.04)
+    # ttl de set() plafonné par celui du cache
+    assert cache.get("long") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_is_a_ttl_lru_cache():
+    cache = TokenCache(maxsize=10, ttl=60)
+    payload = {"id": "u", "exp": time.time() + 60}
+    cache.set("token", payload)
+
+    assert isinstance(cache, TtlLruCache)
+    assert cache.get("token") == payload
+    assert cache.get("token") is not cache.get("token")
@@ -0,0 +1,50 @@
+import os
+import signal
+import time
+from types import SimpleNamespace
+
+from app.server import Server
+
+
+def _server(monkeypatch, exits: list) -> tuple[Server, list]:
+    """Maître d'un worker, sans fork ni socket: os.wait renvoie les arrêts donnés puis plus aucun enfant."""
+    config = SimpleNamespace(bind_socket=lambda: "sock", host="127.0.0.1", port=0)
+    server = Server(config, workers=1)
+    spawned = []
+
+    def spawn(sock):
+        spawned.append(sock)
+        server.children[1000 + len(spawned)] = time.monotonic()
+
+    def wait():
+        if not exits:
+            raise ChildProcessError
+        return exits.pop(0)
+
+    monkeypatch.setattr(server, "_spawn", spawn)
+    monkeypatch.setattr(os, "wait", wait)
+    monkeypatch.setattr(signal, "signal", lambda signum, handler: None)
+    return server, spawned
+
+
+def test_crashing_worker_is_respawned_after_backoff(monkeypatch):
+    server, spawned = _server(monkeypatch, [(1001, 256)])
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    assert server.run() == 0
+    assert sleeps == [1.0]
+    assert spawned == ["sock", "sock"]
+
+
+def test_no_respawn_when_shutdown_starts_during_backoff(monkeypatch):
+    server, spawned = _server(monkeypatch, [(1001, 256)])
+
+    def sleep(seconds):
+        # SIGTERM reçu pendant l'attente avant relance
+        server.stopping = True
+
+    monkeypatch.setattr(time, "sleep", sleep)
+
+    assert server.run() == 0
+    assert spawned == ["sock"]
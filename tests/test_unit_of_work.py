@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.models.Course import Course
+from app.repository.CourseRepository import CourseRepository
+from app.service.Database import Database, current_unit_of_work
+from conftest import auth_headers, make_course
+
+BODY = {"point_depart": "Châtelet", "point_arrivee": "Orly"}
+
+
+def test_request_takes_one_pool_connection(client, client_user):
+    engine = Database.get_engine()
+    checkouts, checkins = [], []
+
+    def onCheckout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.append(connection_record)
+
+    def onCheckin(dbapi_connection, connection_record):
+        checkins.append(connection_record)
+
+    event.listen(engine, "checkout", onCheckout)
+    event.listen(engine, "checkin", onCheckin)
+    try:
+        # Idempotency-Key: réservation, écriture et réponse enregistrée, trois commits sur la même connexion
+        response = client.post(
+            "/course/create", json=BODY, headers=auth_headers(client_user, **{"Idempotency-Key": str(uuid.uuid4())}),
+        )
+    finally:
+        event.remove(engine, "checkout", onCheckout)
+        event.remove(engine, "checkin", onCheckin)
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+    # Connexion rendue au pool en fin de requête
+    assert checkins == checkouts
+
+
+def test_repository_calls_share_the_unit_of_work_session(db, client_user):
+    course = make_course(client_id=uuid.UUID(client_user["id"]))
+    db.add(course)
+    db.commit()
+    repository = CourseRepository()
+    checkedOut = Database.get_engine().pool.checkedout()
+    sessions = []
+
+    @Database.with_session
+    def capture(db=None):
+        sessions.append(db)
+        return db
+
+    with Database.unit_of_work_scope() as uow:
+        first, second = capture(), capture()
+        assert repository.getCourseById(course.id).id == course.id
+        assert current_unit_of_work.get() is uow
+        assert len(uow.connections) == 1
+
+    assert first is second
+    assert current_unit_of_work.get() is None
+    # Fin de l'unité de travail: sessions fermées, connexion rendue
+    assert uow.sessions == {} and uow.connections == []
+    assert Database.get_engine().pool.checkedout() == checkedOut
+
+
+def test_failed_call_rolls_back_without_closing_the_session(db):
+    @Database.with_session
+    def fail(db=None):
+        db.add(make_course(point_depart=None))
+        db.flush()
+
+    @Database.with_session
+    def count(db=None):
+        return db.query(Course).count()
+
+    with Database.unit_of_work_scope() as uow:
+        with pytest.raises(IntegrityError):
+            fail()
+        # Session annulée, pas fermée: les appels suivants de la requête repartent d'un état propre
+        assert count() == 0
+        assert len(uow.sessions) == 1